@@ -36,26 +36,72 @@ it's not perfectly clear so I recommend also check out this `understaning json s
 Note that there are some differences compared to JSON schema standard:
 
  * ``dependency`` for objects are not implemented yet. Future implementation will not change speed.
- * ``patternProperty`` for objects are not implemented yet. Future implementation can little bit
-   slow down validation of object properties. Of course only for those who uses ``properties``.
- * ``definitions`` for sharing JSON schema are not implemented yet. Future implementation will
-   not change speed.
+ * ``$ref`` can point only inside of the definition (for example ``#/definitions/node``).
+   Every referenced definition is compiled only once as separate function, so also recursive
+   definitions are supported.
  * Regular expressions are full what Python provides, not only what JSON schema allows. It's easier
    to allow everything and also it's faster to compile without limits. So keep in mind that when
    you will use more advanced regular expression, it may not work with other library.
  * JSON schema says you can use keyword ``default`` for providing default values. This implementation
    uses that and always returns transformed input data.
 
-Support only for Python 3.3 and higher.
+Support only for Python 3.7 and higher.
 """
 
-from .exceptions import JsonSchemaException
+import builtins
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import glob
+import itertools
+import json
+import marshal
+import os
+import time
+
+from .cache import DiskCache, ValidatorCache, default_cache, fingerprint
+from .columnar import ColumnValidator
+from .cooperative import AsyncValidator
+from .exceptions import JsonSchemaDefinitionException, JsonSchemaException
 from .generator import CodeGenerator
+from .interpreter import PROMOTE_AFTER, Interpreter, tiered_validator
+from .lazy import lazy_validator
+from .ndjson import validate_ndjson
+from .optimizer import get_passes
+from .parallel import ParallelValidator
+from .profile import RuleStats, profile_stats
+from .version import VERSION
+
+__all__ = (
+    'AsyncValidator',
+    'ColumnValidator',
+    'DiskCache',
+    'JsonSchemaDefinitionException',
+    'JsonSchemaException',
+    'ParallelValidator',
+    'RuleStats',
+    'ValidatorCache',
+    'compile',
+    'compile_async',
+    'compile_batch',
+    'compile_columns',
+    'compile_directory',
+    'compile_many',
+    'compile_to_code',
+    'fingerprint',
+    'validate_ndjson',
+)
 
-__all__ = ('JsonSchemaException', 'compile')
+
+CompileReport = namedtuple('CompileReport', ('validators', 'seconds'))
+CompileReport.__doc__ = """
+Result of :any:`compile_many`. Contains dictionary of ``validators`` and
+dictionary of ``seconds`` spent by generating code of each validator. Both are
+keyed by names of definitions. Validators taken from cache have zero seconds.
+"""
 
 
-def compile(definition):
+def compile(definition, cache=True, cache_dir=None, mode='exception', optimize=False, lazy=False, tiered=False, profile=False):
     """
     Generates validation function for validating JSON schema by ``definition``. Example:
 
@@ -80,9 +126,347 @@ def compile(definition):
         data = validate({})
         assert data == {'a': 42}
 
-    Exception :any:`JsonSchemaException` is thrown when validation fails.
+    Compiled validators are cached by fingerprint of ``definition`` (see
+    :any:`fingerprint`), so compiling the same definition again is cheap. By
+    default shared cache of 128 validators is used. Pass your own
+    :any:`ValidatorCache` to have different limits or ``cache=False`` to
+    disable caching at all:
+
+    .. code-block:: python
+
+        validate = fastjsonschema.compile(definition, cache=ValidatorCache(maxsize=1000))
+
+    Generated code can be also stored on the disk in ``cache_dir`` (see
+    :any:`DiskCache`), so another process does not have to generate it again.
+
+    Exception :any:`JsonSchemaException` is thrown when validation fails and
+    :any:`JsonSchemaDefinitionException` when ``definition`` can't be compiled.
+    Exception contains also ``path`` to the invalid value, failed ``rule``, the
+    ``value`` itself and its ``definition``:
+
+    .. code-block:: python
+
+        validate = fastjsonschema.compile({'items': {'type': 'string'}})
+        try:
+            validate(['a', 1])
+        except fastjsonschema.JsonSchemaException as exc:
+            assert exc.path == ('data', 1)
+            assert exc.rule == 'type'
+            assert exc.message == 'data[1] must be string'
+
+    When you need to know only whether data are valid, use ``mode='bool'``.
+    Validation function then returns ``True`` or ``False`` and it's much faster
+    for invalid data because no exception nor message is created. Note that
+    defaults are still set.
+
+    .. code-block:: python
+
+        is_valid = fastjsonschema.compile({'type': 'string'}, mode='bool')
+        assert is_valid('hello') is True
+        assert is_valid(42) is False
+
+    With ``mode='errors'`` validation does not stop at first error. Validation
+    function returns list of all errors found in one pass over data (empty when
+    data are valid). It can be limited by ``max_errors`` and ``max_errors_per_path``
+    parameters of validation function:
+
+    .. code-block:: python
+
+        validate = fastjsonschema.compile({'items': {'type': 'string'}}, mode='errors')
+        errors = validate([1, 'a', 2], max_errors=10)
+        assert [e.message for e in errors] == ['data[0] must be string', 'data[2] must be string']
+
+    Generated code can be optimized by ``optimize=True`` or list of names of
+    optimization passes, see :any:`fastjsonschema.optimizer`.
+
+    With ``lazy=True`` code is generated only when validation function is
+    called for the first time (see :any:`lazy_validator`), so definitions which
+    are never used cost nothing. Note that also :any:`JsonSchemaDefinitionException`
+    is raised by that first call then.
+
+    With ``tiered=True`` validation function interprets ``definition`` (see
+    :any:`Interpreter`) for the first 100 calls (or number of calls passed as
+    ``tiered``) and then generates code (see :any:`tiered_validator`). Definitions
+    used only few times are not compiled at all. It supports only modes
+    ``exception`` and ``bool`` and interpreter does not use ``optimize``.
+
+    .. code-block:: python
+
+        validate = fastjsonschema.compile(definition, tiered=10)
+        validate(data)  # Interpreted.
+        assert not validate.compiled
+
+    With ``profile=True`` generated code counts calls, failures and time of
+    every keyword and validation function has method ``stats`` returning them
+    (see :any:`fastjsonschema.profile`). Validators of the same definition
+    share counters unless ``cache=False`` is used.
+
+    .. code-block:: python
+
+        validate = fastjsonschema.compile(definition, profile=True)
+        validate(data)
+        hot_rules = validate.stats()
+        failing_rules = validate.stats(sort='failures')
+    """
+    options = {'mode': mode}
+    passes = get_passes(optimize)
+    if passes:
+        options['optimize'] = passes
+    if profile:
+        if lazy or tiered:
+            raise JsonSchemaDefinitionException('Profiling is not supported by lazy nor tiered validators')
+        options['profile'] = True
+        validator = _get_validator(definition, cache, cache_dir, **options)
+        validator.stats = functools.partial(profile_stats, validator)
+        return validator
+    if tiered:
+        interpreter = Interpreter(definition, mode)
+        validators = default_cache if cache is True else cache
+        if validators and _cache_key(definition, options) in validators:
+            # Already compiled, interpreter would be only slower.
+            return _get_validator(definition, cache, cache_dir, **options)
+        promote_after = PROMOTE_AFTER if tiered is True else tiered
+        return tiered_validator(interpreter, lambda: _get_validator(definition, cache, cache_dir, **options), promote_after)
+    if lazy:
+        return lazy_validator(lambda: _get_validator(definition, cache, cache_dir, **options))
+    return _get_validator(definition, cache, cache_dir, **options)
+
+
+def compile_batch(definition, cache=True, cache_dir=None):
+    """
+    Generates function for validating many values at once by ``definition``.
+    Loop over values is part of generated code, so it's faster than calling
+    validation function from :any:`compile` for every value. Example:
+
+    .. code-block:: python
+
+        validate_many = fastjsonschema.compile_batch({'type': 'string'})
+        valid, invalid, errors = validate_many(['a', 1, 'b', None], max_errors=1)
+        assert valid == ['a', 'b']
+        assert list(invalid) == [1, 3]
+        assert [(index, e.message) for index, e in errors] == [(1, 'data must be string')]
+
+    Function returns list of valid (and transformed) values, ``array`` of indexes
+    of invalid values and list of ``(index, exception)`` tuples. Number of
+    returned exceptions can be limited by ``max_errors``.
+
+    Parameters ``cache`` and ``cache_dir`` work the same way as for :any:`compile`.
     """
-    code_generator = CodeGenerator(definition)
-    local_state = {}
-    exec(code_generator.func_code, code_generator.global_state, local_state)
-    return local_state['func']
+    return _get_validator(definition, cache, cache_dir, batch=True)
+
+
+def compile_columns(definition, cache=True, cache_dir=None):
+    """
+    Generates validator of records of object ``definition`` stored by columns
+    (dictionary of lists or NumPy structured array). Every property is
+    validated for the whole column at once. Example:
+
+    .. code-block:: python
+
+        validate_columns = fastjsonschema.compile_columns({'properties': {'a': {'type': 'number'}}})
+        invalid, errors = validate_columns({'a': [1, 'x', 3]})
+        assert list(invalid) == [1]
+
+    Returns :any:`ColumnValidator`. Parameters ``cache`` and ``cache_dir`` work
+    the same way as for :any:`compile`.
+    """
+    return ColumnValidator(definition, lambda column_definition: _get_validator(
+        column_definition, cache, cache_dir, batch=True,
+    ))
+
+
+def compile_async(definition, yield_every=1000, cache=True, cache_dir=None):
+    """
+    Generates validator which does not block event loop for long time when
+    validating huge data. It gives control back to event loop every
+    ``yield_every`` validated items of arrays or objects. Example:
+
+    .. code-block:: python
+
+        validator = fastjsonschema.compile_async({'type': 'array', 'items': {'type': 'number'}})
+        data = await validator.validate_async(list(range(1000000)))
+
+    Returns :any:`AsyncValidator`. Parameters ``cache`` and ``cache_dir`` work
+    the same way as for :any:`compile`.
+    """
+    func = _get_validator(definition, cache, cache_dir, cooperative=True)
+    return AsyncValidator(func, yield_every)
+
+
+def compile_many(definitions, processes=None, cache=True, cache_dir=None, mode='exception', optimize=False):
+    """
+    Generates validation functions for all ``definitions`` (dictionary of names
+    and JSON schema definitions) at once in pool of ``processes`` worker
+    processes (all CPUs by default). Useful for services which have to compile
+    a lot of definitions when they start. Example:
+
+    .. code-block:: python
+
+        report = fastjsonschema.compile_many({'name': {'type': 'string'}, 'age': {'type': 'integer'}})
+        report.validators['name']('hello')
+        slowest = max(report.seconds, key=report.seconds.get)
+
+    Returns :any:`CompileReport`. Workers only generate the code, it's executed
+    in the calling process. Validators are the same as returned by :any:`compile`
+    with the same parameters and they are stored in the same ``cache``, so
+    later call of :any:`compile` does not generate them again.
+    """
+    options = {'mode': mode}
+    passes = get_passes(optimize)
+    if passes:
+        options['optimize'] = passes
+    if cache is True:
+        cache = default_cache
+
+    validators = {}
+    seconds = {}
+    keys = {}
+    pending = []
+    for name, definition in definitions.items():
+        if cache:
+            keys[name] = _cache_key(definition, options)
+            if keys[name] in cache:
+                validators[name] = cache.get(keys[name], lambda: _compile(definition, cache_dir, options))
+                seconds[name] = 0.0
+                continue
+        pending.append(name)
+
+    pending_definitions = [definitions[name] for name in pending]
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(pending) <= 1:
+        results = [_generate_code(definition, cache_dir, options) for definition in pending_definitions]
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, len(pending))) as executor:
+            results = list(executor.map(
+                _generate_code,
+                pending_definitions,
+                itertools.repeat(cache_dir),
+                itertools.repeat(options),
+            ))
+
+    for name, (code, serializable_state, duration) in zip(pending, results):
+        validator = _exec(marshal.loads(code), CodeGenerator.restore_global_state(serializable_state), 'func')
+        if cache:
+            validator = cache.get(keys[name], lambda: validator)
+        validators[name] = validator
+        seconds[name] = duration
+    return CompileReport(validators, seconds)
+
+
+def compile_directory(directory, pattern='*.json', **kwargs):
+    """
+    Loads all JSON schema files matching ``pattern`` in ``directory`` and
+    compiles them by :any:`compile_many` with ``kwargs``. Definitions are named
+    by file names without extension:
+
+    .. code-block:: python
+
+        report = fastjsonschema.compile_directory('schemas', processes=8)
+        report.validators['address'](data)
+    """
+    definitions = {}
+    for path in sorted(glob.glob(os.path.join(directory, pattern))):
+        with open(path, encoding='utf-8') as schema_file:
+            definitions[os.path.splitext(os.path.basename(path))[0]] = json.load(schema_file)
+    return compile_many(definitions, **kwargs)
+
+
+def compile_to_code(definitions):
+    """
+    Generates source code of Python module with validation functions. Keys of
+    ``definitions`` are names of functions, values are JSON schema definitions.
+    Example:
+
+    .. code-block:: python
+
+        import fastjsonschema
+
+        code = fastjsonschema.compile_to_code({'validate_name': {'type': 'string'}})
+        with open('validators.py', 'w') as f:
+            f.write(code)
+
+        from validators import validate_name
+        validate_name('hello')
+
+    Module contains also precompiled regular expressions, so importing it does
+    not generate any code. It depends only on :any:`JsonSchemaException`.
+    Arrays of numbers are validated only as lists there, not as NumPy arrays
+    (see :any:`fastjsonschema.vector`).
+
+    The same can be done from command line:
+
+    .. code-block:: bash
+
+        $ python -m fastjsonschema compile name.json address.json -o validators.py
+    """
+    code_generators = []
+    for name, definition in definitions.items():
+        if not name.isidentifier():
+            raise ValueError('Name of validation function {!r} is not valid identifier'.format(name))
+        # Vectorized arrays would need fastjsonschema.vector (and NumPy).
+        code_generators.append(CodeGenerator(definition, name=name, vectorize=False))
+
+    parts = [
+        '"""\nGenerated by fastjsonschema {}. Do not edit.\n"""\n\n'
+        'import re\n\n'
+        'from fastjsonschema.exceptions import JsonSchemaException'.format(VERSION),
+    ]
+    global_state_code = '\n'.join(filter(None, (g.global_state_code for g in code_generators)))
+    if global_state_code:
+        parts.append(global_state_code)
+    parts.extend(g.func_code for g in code_generators)
+    return '\n\n\n'.join(parts) + '\n'
+
+
+def _get_validator(definition, cache, cache_dir, **options):
+    if cache is True:
+        cache = default_cache
+    if not cache:
+        return _compile(definition, cache_dir, options)
+    return cache.get(_cache_key(definition, options), lambda: _compile(definition, cache_dir, options))
+
+
+def _cache_key(definition, options):
+    return (fingerprint(definition),) + tuple(sorted(options.items()))
+
+
+def _compile(definition, cache_dir, options):
+    name = 'func_many' if options.get('batch') else 'func'
+
+    if cache_dir is None:
+        code_generator = CodeGenerator(definition, **options)
+        return _exec(code_generator.func_code, code_generator.global_state, name)
+
+    disk_cache = DiskCache(cache_dir)
+    cached = disk_cache.load(definition, **options)
+    if cached:
+        code, serializable_state = cached
+        return _exec(code, CodeGenerator.restore_global_state(serializable_state), name)
+
+    code_generator = CodeGenerator(definition, **options)
+    code = builtins.compile(code_generator.func_code, '<fastjsonschema>', 'exec')
+    disk_cache.store(definition, code, code_generator.serializable_state, **options)
+    return _exec(code, code_generator.global_state, name)
+
+
+def _generate_code(definition, cache_dir, options):
+    # Runs in worker process of compile_many, so it returns only things which
+    # can be pickled. Code object itself can't be, but it can be marshalled.
+    start = time.perf_counter()
+    disk_cache = DiskCache(cache_dir) if cache_dir is not None else None
+    cached = disk_cache.load(definition, **options) if disk_cache else None
+    if cached:
+        code, serializable_state = cached
+    else:
+        code_generator = CodeGenerator(definition, **options)
+        code = builtins.compile(code_generator.func_code, '<fastjsonschema>', 'exec')
+        serializable_state = code_generator.serializable_state
+        if disk_cache:
+            disk_cache.store(definition, code, serializable_state, **options)
+    return marshal.dumps(code), serializable_state, time.perf_counter() - start
+
+
+def _exec(code, global_state, name):
+    # Generated functions have to see each other, so there is only global state.
+    exec(code, global_state)
+    return global_state[name]
@@ -0,0 +1,82 @@
+"""
+Command line interface of fastjsonschema.
+
+.. code-block:: bash
+
+    $ python -m fastjsonschema compile name.json address.json -o validators.py
+    $ python -m fastjsonschema validate schema.json data.ndjson --jobs 8
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from . import compile_to_code
+from .ndjson import validate_ndjson
+
+
+def function_name(path):
+    """
+    Returns name of validation function for schema stored in ``path``.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return 'validate_' + re.sub(r'\W', '_', stem)
+
+
+def command_compile(args):
+    definitions = {}
+    for path in args.schemas:
+        with open(path) as schema_file:
+            definitions[function_name(path)] = json.load(schema_file)
+    code = compile_to_code(definitions)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(code)
+    else:
+        sys.stdout.write(code)
+
+
+def command_validate(args):
+    with open(args.schema) as schema_file:
+        definition = json.load(schema_file)
+    report = validate_ndjson(definition, args.data, jobs=args.jobs, max_errors=args.max_errors)
+
+    for line_number, message in report.errors:
+        sys.stdout.write('{}:{}: {}\n'.format(args.data, line_number, message))
+    seconds = report.seconds or float('nan')
+    sys.stderr.write('{} records, {} invalid in {:.3f} s ({:.0f} records/s, {:.2f} MB/s)\n'.format(
+        report.records,
+        report.invalid,
+        report.seconds,
+        report.records / seconds,
+        report.size / seconds / 1e6,
+    ))
+    return 1 if report.invalid else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m fastjsonschema')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    parser_compile = subparsers.add_parser('compile', help='generate Python module with validation functions')
+    parser_compile.add_argument('schemas', nargs='+', metavar='schema', help='JSON file with schema definition')
+    parser_compile.add_argument('-o', '--output', help='path of generated module (standard output by default)')
+    parser_compile.set_defaults(func=command_compile)
+
+    parser_validate = subparsers.add_parser('validate', help='validate newline-delimited JSON file')
+    parser_validate.add_argument('schema', help='JSON file with schema definition')
+    parser_validate.add_argument('data', help='file with one JSON document per line')
+    parser_validate.add_argument('-j', '--jobs', type=int, help='number of processes (all CPUs by default)')
+    parser_validate.add_argument('--max-errors', type=int, help='maximum number of reported invalid lines')
+    parser_validate.set_defaults(func=command_validate)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
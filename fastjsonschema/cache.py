@@ -0,0 +1,230 @@
+"""
+Compilation of definition is expensive (it generates and executes Python code)
+while validation is cheap. Services which compiles definitions on the fly (for
+example from configuration) would spend most of the time by generating the same
+code again and again. That's why :any:`compile` keeps compiled validators in
+bounded LRU cache keyed by fingerprint of definition.
+
+Processes which are restarted often can also keep generated code on the disk
+(see :any:`DiskCache`), so only the first process has to generate it.
+"""
+
+from collections import OrderedDict, namedtuple
+import hashlib
+import json
+import marshal
+import os
+import sys
+import tempfile
+import threading
+
+from .version import VERSION
+
+
+CacheInfo = namedtuple('CacheInfo', ('hits', 'misses', 'maxsize', 'currsize'))
+
+
+def fingerprint(definition):
+    """
+    Returns fingerprint of ``definition``. It does not depend on order of keys in
+    dictionaries, so two equal definitions always have the same fingerprint.
+
+    .. code-block:: python
+
+        fingerprint({'type': 'string', 'maxLength': 5}) == fingerprint({'maxLength': 5, 'type': 'string'})
+    """
+    serialized = json.dumps(definition, sort_keys=True, separators=(',', ':'), default=repr)
+    return hashlib.sha1(serialized.encode('utf-8')).hexdigest()
+
+
+class _Flight:
+    """
+    Compilation in progress. Other threads asking for the same key wait for it
+    instead of compiling it again.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class ValidatorCache:
+    """
+    Thread-safe LRU cache of compiled validators. When ``maxsize`` is reached,
+    least recently used validator is thrown away. Use ``maxsize=None`` for
+    unbounded cache.
+
+    Compilation of one key is done only once even when more threads ask for it
+    at the same time; others wait for the result.
+
+    .. code-block:: python
+
+        cache = ValidatorCache(maxsize=32)
+        validate = fastjsonschema.compile(definition, cache=cache)
+        cache.info()  # CacheInfo(hits=0, misses=1, maxsize=32, currsize=1)
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._validators = OrderedDict()
+        self._flights = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, factory):
+        """
+        Returns validator stored under ``key``. When there is no such validator,
+        it's created by calling ``factory`` and stored.
+        """
+        with self._lock:
+            if key in self._validators:
+                self._validators.move_to_end(key)
+                self._hits += 1
+                return self._validators[key]
+            flight = self._flights.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._flights[key] = _Flight()
+                self._misses += 1
+            else:
+                self._hits += 1
+
+        if not owner:
+            flight.event.wait()
+            if flight.exception is not None:
+                raise flight.exception
+            return flight.result
+
+        try:
+            flight.result = factory()
+        except BaseException as exc:
+            flight.exception = exc
+            raise
+        else:
+            self._store(key, flight.result)
+            return flight.result
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._validators
+
+    def _store(self, key, validator):
+        with self._lock:
+            if self.maxsize is not None and self.maxsize <= 0:
+                return
+            self._validators[key] = validator
+            if self.maxsize is not None:
+                while len(self._validators) > self.maxsize:
+                    self._validators.popitem(last=False)
+
+    def info(self):
+        """
+        Returns statistics of cache as named tuple ``CacheInfo(hits, misses, maxsize, currsize)``.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._validators))
+
+    def clear(self):
+        """
+        Throws away all cached validators and resets statistics.
+        """
+        with self._lock:
+            self._validators.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+default_cache = ValidatorCache()
+
+
+class DiskCache:
+    """
+    Persistent cache of generated code stored in ``directory``. Each entry
+    contains marshalled code object and serializable part of global state
+    (see :any:`CodeGenerator.serializable_state`) and is stored under
+    fingerprint of definition, version of this library and version of Python.
+    Entries created by different version are simply not used.
+
+    Entries are written into temporary file which is atomically renamed, so
+    more processes can share the same directory. Broken entries are ignored.
+
+    .. code-block:: python
+
+        validate = fastjsonschema.compile(definition, cache_dir='/var/cache/fastjsonschema')
+    """
+
+    SUFFIX = '.fjs'
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, definition, **options):
+        """
+        Returns path of file for ``definition`` compiled with ``options``.
+        """
+        name = '{}{}-{}-{}{}'.format(
+            fingerprint(definition),
+            ''.join(
+                '-{}={}'.format(key, '+'.join(value) if isinstance(value, tuple) else value)
+                for key, value in sorted(options.items())
+            ),
+            VERSION,
+            sys.implementation.cache_tag,
+            self.SUFFIX,
+        )
+        return os.path.join(self.directory, name)
+
+    def load(self, definition, **options):
+        """
+        Returns tuple ``(code, serializable_state)`` for ``definition`` or ``None``
+        when there is no usable entry.
+        """
+        try:
+            with open(self.path(definition, **options), 'rb') as cache_file:
+                version, code, serializable_state = marshal.load(cache_file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != VERSION:
+            return None
+        return code, serializable_state
+
+    def store(self, definition, code, serializable_state, **options):
+        """
+        Stores ``code`` with ``serializable_state`` for ``definition``. Failure of
+        writing is ignored, cache is just not used then.
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'wb') as cache_file:
+                marshal.dump((VERSION, code, serializable_state), cache_file)
+            os.replace(tmp_path, self.path(definition, **options))
+        except (OSError, ValueError):
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """
+        Removes all entries from the directory.
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(self.SUFFIX):
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except OSError:
+                    pass
@@ -0,0 +1,37 @@
+from .exceptions import JsonSchemaException
+
+
+class ErrorCollector(list):
+    """
+    List of all errors found by validation function generated with
+    ``mode='errors'``. Number of errors can be limited by ``max_errors``
+    (validation is stopped when it's reached) and ``max_errors_per_path``
+    (more errors of the same value are ignored).
+    """
+
+    class Full(Exception):
+        """
+        Raised when ``max_errors`` is reached to stop validation.
+        """
+
+    def __init__(self, max_errors=None, max_errors_per_path=None):
+        super().__init__()
+        self.max_errors = max_errors
+        self.max_errors_per_path = max_errors_per_path
+        self._errors_per_path = {}
+
+    def add(self, value, path, definition, rule, rule_message):
+        """
+        Adds error of ``value`` on ``path``. Arguments are the same as of
+        :any:`JsonSchemaException`.
+        """
+        if self.max_errors_per_path is not None:
+            count = self._errors_per_path.get(path, 0)
+            if count >= self.max_errors_per_path:
+                return
+            self._errors_per_path[path] = count + 1
+        if self.max_errors is not None and len(self) >= self.max_errors:
+            raise self.Full()
+        self.append(JsonSchemaException(None, value, path, definition, rule, rule_message))
+        if self.max_errors is not None and len(self) >= self.max_errors:
+            raise self.Full()
@@ -0,0 +1,150 @@
+"""
+Validation of records stored by columns, for example ``{'a': [1, 2], 'b': ['x', 'y']}``
+instead of ``[{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'y'}]``, or NumPy structured
+arrays. Definition of each property is compiled by :any:`compile_batch` and
+it validates the whole column at once, so records do not have to be created.
+"""
+
+from array import array
+from collections import OrderedDict
+
+from .exceptions import JsonSchemaException
+from .optimizer import json_pointer
+from .vector import get_vector_arguments, is_vectorizable, vector_candidates, vector_types
+
+
+# Keywords of object definition checked column by column.
+COLUMN_KEYWORDS = frozenset(('type', 'properties', 'required', 'additionalProperties'))
+
+# Keywords which does not validate anything.
+IGNORED_KEYWORDS = frozenset(('definitions', 'title', 'description', '$schema', 'id', 'default'))
+
+
+class ColumnValidator:
+    """
+    Validates columns of records by object ``definition``. Use :any:`compile_columns`
+    to create it. Columns are passed as dictionary of name and sequence of
+    values (list, ``array.array``, NumPy array, ...) or as NumPy structured
+    array. All columns have to be of the same length. Example:
+
+    .. code-block:: python
+
+        validate_columns = fastjsonschema.compile_columns({
+            'type': 'object',
+            'properties': {'a': {'type': 'number'}},
+            'required': ['a'],
+        })
+        invalid, errors = validate_columns({'a': [1, 'x', 3]}, max_errors=10)
+        assert list(invalid) == [1]
+        assert [(index, e.message) for index, e in errors] == [(1, 'data.a must be number')]
+
+    Returns ``array`` of indexes of invalid rows and list of ``(index, exception)``
+    tuples ordered by rows. Number of returned exceptions can be limited by
+    ``max_errors``. Keywords other than ``properties``, ``required`` and
+    ``additionalProperties`` (when there is no ``patternProperties``) are
+    checked on records created from columns.
+    Defaults are not set, data are not changed at all.
+    """
+
+    def __init__(self, definition, compile_batch):
+        self._definition = definition
+        self._properties = OrderedDict()
+        self._additional_properties = True
+        self._additional_validator = None
+        self._required = []
+        self._rows_validator = None
+        self._by_columns = False
+
+        types = definition.get('type', 'object')
+        if '$ref' in definition or 'object' not in (types if isinstance(types, list) else [types]):
+            self._rows_validator = compile_batch(definition)
+            return
+
+        self._by_columns = True
+        # Definitions of properties are referenced, so they can refer to the rest of definition.
+        for name, prop_definition in definition.get('properties', {}).items():
+            self._properties[name] = (
+                compile_batch(self._refer(('properties', name))),
+                prop_definition,
+            )
+        self._required = definition.get('required', [])
+
+        rows_definition = OrderedDict(
+            (key, value) for key, value in definition.items() if key not in COLUMN_KEYWORDS
+        )
+        if 'patternProperties' in definition:
+            # Which columns are additional depends on patterns, so it's checked
+            # on records. Properties are there only to be known.
+            rows_definition['properties'] = {name: {} for name in self._properties}
+            rows_definition['additionalProperties'] = definition.get('additionalProperties', True)
+        else:
+            self._additional_properties = definition.get('additionalProperties', True)
+            if isinstance(self._additional_properties, dict):
+                self._additional_validator = compile_batch(self._refer(('additionalProperties',)))
+        if not rows_definition.keys() <= IGNORED_KEYWORDS:
+            self._rows_validator = compile_batch(rows_definition)
+
+    def _refer(self, pointer):
+        return OrderedDict(self._definition, **{'$ref': json_pointer(pointer)})
+
+    def __call__(self, columns, max_errors=None):
+        if getattr(getattr(columns, 'dtype', None), 'names', None):
+            columns = OrderedDict((name, columns[name]) for name in columns.dtype.names)
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError('All columns have to be of the same length')
+        rows = lengths.pop() if lengths else 0
+
+        invalid = set()
+        errors = []
+        if self._by_columns and rows:
+            if any(name not in columns for name in self._required):
+                rule_message = 'must contain {} properties'.format(self._required)
+                self._add_to_all(rows, 'required', rule_message, max_errors, invalid, errors)
+            if self._additional_properties is False and any(name not in self._properties for name in columns):
+                rule_message = 'must contain only spcified properties'
+                self._add_to_all(rows, 'additionalProperties', rule_message, max_errors, invalid, errors)
+            for name, column in columns.items():
+                if name in self._properties:
+                    validator, prop_definition = self._properties[name]
+                elif self._additional_validator:
+                    validator, prop_definition = self._additional_validator, self._additional_properties
+                else:
+                    continue
+                self._validate_column(validator, prop_definition, name, column, max_errors, invalid, errors)
+
+        if self._rows_validator:
+            records = [dict(zip(columns, values)) for values in zip(*columns.values())]
+            _, rows_invalid, rows_errors = self._rows_validator(records, max_errors)
+            invalid.update(rows_invalid)
+            errors.extend(rows_errors)
+
+        # Sort is stable, so errors of one row stay in order of columns.
+        errors.sort(key=lambda error: error[0])
+        if max_errors is not None:
+            del errors[max_errors:]
+        return array('L', sorted(invalid)), errors
+
+    def _add_to_all(self, rows, rule, rule_message, max_errors, invalid, errors):
+        invalid.update(range(rows))
+        for index in range(rows if max_errors is None else min(rows, max_errors)):
+            errors.append((index, JsonSchemaException(None, None, ('data',), self._definition, rule, rule_message)))
+
+    def _validate_column(self, validator, definition, name, column, max_errors, invalid, errors):
+        indexes = None
+        if isinstance(column, vector_types):
+            if is_vectorizable(definition):
+                candidates = list(vector_candidates(column, *get_vector_arguments(definition)))
+                indexes = [index for index, _ in candidates]
+                column = [value for _, value in candidates]
+            else:
+                column = column.tolist()
+        _, column_invalid, column_errors = validator(column, max_errors)
+        if indexes is not None:
+            column_invalid = [indexes[index] for index in column_invalid]
+            column_errors = [(indexes[index], exc) for index, exc in column_errors]
+        invalid.update(column_invalid)
+        for index, exc in column_errors:
+            # Message is created only when it's read, so it will contain the new path.
+            exc.path = ('data', name) + tuple(exc.path[1:])
+            errors.append((index, exc))
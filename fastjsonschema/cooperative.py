@@ -0,0 +1,51 @@
+"""
+Validation of huge data can take long time and block event loop. Validation
+functions generated in cooperative mode are generators yielding after every
+item of arrays and objects. :any:`AsyncValidator` drives them and gives
+control back to event loop every ``yield_every`` items.
+"""
+
+import asyncio
+from collections import deque
+import itertools
+
+
+class AsyncValidator:
+    """
+    Wrapper of validation function generated in cooperative mode. Use
+    :any:`compile_async` to create it.
+
+    .. code-block:: python
+
+        validator = fastjsonschema.compile_async(definition, yield_every=1000)
+        data = await validator.validate_async(data)
+
+    It can be also called synchronously without any yielding.
+    """
+
+    def __init__(self, func, yield_every=1000):
+        self.func = func
+        self.yield_every = yield_every
+
+    def __call__(self, data):
+        result = deque()
+        deque(self._run(data, result), maxlen=0)
+        return result[0]
+
+    async def validate_async(self, data):
+        """
+        Validates ``data`` and returns them (transformed by defaults). Control
+        is given back to event loop every ``yield_every`` validated items.
+        Exception :any:`JsonSchemaException` is thrown when validation fails.
+        """
+        result = deque()
+        generator = self._run(data, result)
+        while True:
+            # Consumes generator in C without overhead per step.
+            deque(itertools.islice(generator, self.yield_every), maxlen=0)
+            if result:
+                return result[0]
+            await asyncio.sleep(0)
+
+    def _run(self, data, result):
+        result.append((yield from self.func(data)))
@@ -2,8 +2,53 @@
 class JsonSchemaException(ValueError):
     """
     Exception raised by validation function. Contains ``message`` with
-    information what is wrong.
+    information what is wrong. When it's raised by validation function, it
+    contains also:
+
+     * ``value`` which is not valid,
+     * ``path`` to that value as tuple, for example ``('data', 'items', 2)``,
+     * ``definition`` (part of JSON schema) which failed,
+     * ``rule`` which failed, for example ``maxLength``,
+     * ``rule_message`` saying what is wrong, for example ``must be string``.
+
+    Message is created only when it's read, so raising exception is cheap.
     """
 
-    def __init__(self, message):
-        self.message = message
+    def __init__(self, message=None, value=None, path=None, definition=None, rule=None, rule_message=None):
+        super().__init__(message)
+        self._message = message
+        self.value = value
+        self.path = path
+        self.definition = definition
+        self.rule = rule
+        self.rule_message = rule_message
+
+    @property
+    def message(self):
+        if self._message is None:
+            self._message = '{} {}'.format(format_path(self.path or ('data',)), self.rule_message)
+        return self._message
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self.message)
+
+
+class JsonSchemaDefinitionException(JsonSchemaException):
+    """
+    Exception raised by generator of validation function when ``definition``
+    itself is not valid or uses something which is not supported.
+    """
+
+
+def format_path(path):
+    """
+    Returns path as used in messages, for example ``data.items[2]`` for
+    ``('data', 'items', 2)``.
+    """
+    return path[0] + ''.join(
+        '[{}]'.format(part) if isinstance(part, int) else '.{}'.format(part)
+        for part in path[1:]
+    )
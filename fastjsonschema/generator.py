@@ -5,19 +5,197 @@
 #  \/   \/           If you look at it, you might die.
 #
 
-from collections import OrderedDict
+from array import array
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 import re
+from time import perf_counter
+from urllib.parse import unquote
 
-from .exceptions import JsonSchemaException
+from .collector import ErrorCollector
+from .exceptions import JsonSchemaDefinitionException, JsonSchemaException
 from .indent import indent
+from .optimizer import get_passes, json_pointer, optimize as optimize_definition
+from .patterns import combine_patterns, intern_regexp, literal_prefix, lower_pattern
+from .vector import get_vector_arguments, is_vectorizable, vector_candidates, vector_types
 
 
+# Containers in constants nested deeper are created by separate lines of code.
+CONSTANT_MAX_DEPTH = 20
+
 def enforce_list(variable):
     if isinstance(variable, list):
         return variable
     return [variable]
 
 
+def canonical(value):
+    """
+    Returns hashable form of ``value``. Lists are turned into tuples and
+    dictionaries into frozensets of items, so equal values have equal
+    canonical forms. The same function is generated into code as
+    ``{name}_canonical`` (see :any:`generate_canonical_function`).
+    """
+    if isinstance(value, list):
+        return tuple(canonical(item) for item in value)
+    if isinstance(value, dict):
+        return frozenset((key, canonical(item)) for key, item in value.items())
+    return value
+
+
+def constant_code(value):
+    """
+    Returns code creating ``value``. Unlike ``repr`` items of frozensets are
+    sorted, so the code does not depend on hash randomization.
+    """
+    if isinstance(value, frozenset):
+        return 'frozenset([{}])'.format(', '.join(sorted(constant_code(item) for item in value)))
+    if isinstance(value, tuple):
+        return '({})'.format(''.join(constant_code(item) + ', ' for item in value).rstrip(' '))
+    if isinstance(value, list):
+        return '[{}]'.format(', '.join(constant_code(item) for item in value))
+    if isinstance(value, dict):
+        return '{{{}}}'.format(', '.join(
+            '{}: {}'.format(constant_code(key), constant_code(item))
+            for key, item in value.items()
+        ))
+    return repr(value)
+
+
+def constants_code(constants):
+    """
+    Returns lines of code creating ``constants`` (dictionary name -> value).
+    Dictionary or list which is already part of another constant is not
+    created again but referred to, for example
+    ``func_definition_1 = func_definition_0['properties']['a']``, so every
+    part of definition is in code only once and shared objects stay shared.
+    Containers nested deeper than :any:`CONSTANT_MAX_DEPTH` are created by
+    separate lines, because Python can't parse too deeply nested literals.
+    """
+    lines = []
+    # Id of dictionary or list -> name of variable with it, or id of
+    # container with it and subscript.
+    names = {}
+    parents = {}
+    for name, value in constants.items():
+        pending = deque([(name, value, None)])
+        while pending:
+            variable, value, target = pending.popleft()
+            if not isinstance(value, (dict, list)):
+                lines.append('{} = {}'.format(variable, constant_code(value)))
+                continue
+            if id(value) in names or id(value) in parents:
+                if target:
+                    lines.append('{} = {}'.format(target, _reference_code(id(value), names, parents)))
+                else:
+                    lines.append('{} = {}'.format(variable, _reference_code(id(value), names, parents)))
+                    names[id(value)] = variable
+                continue
+            new_parents = {}
+            parts = []
+            lines.append('{} = {}'.format(variable, _container_code(value, 0, new_parents, names, parents, parts)))
+            if target:
+                lines.append('{} = {}'.format(target, variable))
+            # Containers of the line can be referred to only by next lines.
+            names[id(value)] = variable
+            parents.update(new_parents)
+            for part, parent_id, subscript in parts:
+                part_variable = '{}_part_{}'.format(name, len(lines) + len(pending))
+                pending.append((part_variable, part, _reference_code(parent_id, names, parents) + subscript))
+    return lines
+
+
+def _reference_code(value_id, names, parents):
+    subscripts = []
+    while value_id not in names:
+        value_id, subscript = parents[value_id]
+        subscripts.append(subscript)
+    return names[value_id] + ''.join(reversed(subscripts))
+
+
+def _container_code(value, depth, new_parents, names, parents, parts):
+    if isinstance(value, list):
+        items = [('[{}]'.format(index), item) for index, item in enumerate(value)]
+    else:
+        items = [('[{}]'.format(constant_code(key)), item) for key, item in value.items()]
+    items_code = []
+    for subscript, item in items:
+        if not isinstance(item, (dict, list)):
+            items_code.append(constant_code(item))
+        elif id(item) in names or id(item) in parents:
+            items_code.append(_reference_code(id(item), names, parents))
+        elif id(item) in new_parents or depth >= CONSTANT_MAX_DEPTH:
+            # Set by separate line, it's used already in this line or it's
+            # nested too deeply.
+            parts.append((item, id(value), subscript))
+            items_code.append('None')
+        else:
+            new_parents[id(item)] = (id(value), subscript)
+            items_code.append(_container_code(item, depth + 1, new_parents, names, parents, parts))
+    if isinstance(value, list):
+        return '[{}]'.format(', '.join(items_code))
+    return '{{{}}}'.format(', '.join(
+        '{}: {}'.format(constant_code(key), item_code) for key, item_code in zip(value, items_code)
+    ))
+
+
+def marshallable(value, memo=None):
+    """
+    Returns ``value`` with subclasses of containers (like ``OrderedDict`` of
+    definitions loaded with ``object_pairs_hook`` or created by optimizer)
+    turned into plain ones, because ``marshal`` supports only exact types.
+    Containers are converted only once for the same ``memo``, so objects
+    shared by more constants stay shared and are stored only once.
+    """
+    if not isinstance(value, (dict, list, tuple, frozenset)):
+        return value
+    if memo is None:
+        memo = {}
+    result = memo.get(id(value))
+    if result is not None:
+        return result
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            result[key] = marshallable(item, memo)
+    else:
+        result = []
+        for item in value:
+            result.append(marshallable(item, memo))
+        if isinstance(value, tuple):
+            result = tuple(result)
+        elif isinstance(value, frozenset):
+            result = frozenset(result)
+    memo[id(value)] = result
+    return result
+
+
+def uri_pointer(uri):
+    """
+    Returns JSON pointer of local ``uri`` as tuple, for example ``('properties', 'a/b')``
+    for ``#/properties/a~1b``.
+    """
+    return tuple(part.replace('~1', '/').replace('~0', '~') for part in unquote(uri[1:]).split('/')[1:])
+
+
+def resolve_ref(root_definition, uri):
+    """
+    Returns part of ``root_definition`` referenced by ``uri``.
+    """
+    if not uri.startswith('#'):
+        raise JsonSchemaDefinitionException('Only local references are supported, got {}'.format(uri))
+    definition = root_definition
+    for part in uri_pointer(uri):
+        try:
+            if isinstance(definition, list):
+                definition = definition[int(part)]
+            else:
+                definition = definition[part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise JsonSchemaDefinitionException('Unresolvable reference {}'.format(uri))
+    return definition
+
+
 class CodeGenerator:
     """
     This class is not supposed to be used directly. Anything
@@ -29,6 +207,30 @@ class CodeGenerator:
     .. code-block:: python
 
         CodeGenerator(json_schema_definition).func_code
+
+    Generated function is called ``func`` by default. Different ``name`` can be
+    used when more functions are put into one module. With ``batch`` there is
+    also function ``func_many`` validating many values in one loop.
+
+    With ``cooperative`` generated functions are generators which yield after
+    every item of validated arrays and objects and return validated data at
+    the end, so validation of huge data can be interleaved with other work.
+
+    Generated function raises :any:`JsonSchemaException` when validation fails
+    (``mode='exception'``). With ``mode='bool'`` it returns ``False`` instead
+    without creating any exception or message and ``True`` for valid data.
+    With ``mode='errors'`` it validates everything and returns list of all
+    errors (see :any:`ErrorCollector`).
+
+    Definition is transformed by passes of optimizer in ``optimize`` before
+    code is generated (see :any:`fastjsonschema.optimizer`).
+
+    With ``profile`` every keyword block counts its calls, failures and time
+    spent in it (see :any:`profile_block` and :any:`fastjsonschema.profile`).
+    Without it generated code does not contain anything of that.
+
+    With ``vectorize=False`` arrays of numbers are checked only as lists, see
+    :any:`is_vectorizable`.
     """
 
     INDENT = 4  # spaces
@@ -43,38 +245,119 @@ class CodeGenerator:
         'object': 'dict',
     }
 
-    def __init__(self, definition):
+    # Exact Python type of value -> JSON types accepting it.
+    PYTHON_TYPE_TO_JSON_TYPES = (
+        ('type(None)', {'null'}),
+        ('bool', {'boolean'}),
+        ('int', {'integer', 'number'}),
+        ('float', {'number'}),
+        ('str', {'string'}),
+        ('list', {'array'}),
+        ('dict', {'object'}),
+    )
+
+    # Keywords in order they are validated and names of methods handling them
+    # (with prefix ``generate_`` here and ``validate_`` in :any:`Interpreter`).
+    KEYWORDS = (
+        ('type', 'type'),
+        ('enum', 'enum'),
+        ('allOf', 'all_of'),
+        ('anyOf', 'any_of'),
+        ('oneOf', 'one_of'),
+        ('not', 'not'),
+        ('minLength', 'min_length'),
+        ('maxLength', 'max_length'),
+        ('pattern', 'pattern'),
+        ('minimum', 'minimum'),
+        ('maximum', 'maximum'),
+        ('multipleOf', 'multiple_of'),
+        ('minItems', 'min_items'),
+        ('maxItems', 'max_items'),
+        ('uniqueItems', 'unique_items'),
+        ('items', 'items'),
+        ('minProperties', 'min_properties'),
+        ('maxProperties', 'max_properties'),
+        ('required', 'required'),
+        ('properties', 'properties'),
+        ('patternProperties', 'pattern_properties'),
+        ('additionalProperties', 'additional_properties'),
+    )
+
+    # Keywords which can be evaluated only for values of some JSON types,
+    # for others len(), comparison or pattern match raises. Otherwise keywords
+    # are not limited to their types, the same as in all modes.
+    KEYWORD_TYPES = {
+        'minLength': ('string', 'array', 'object'),
+        'maxLength': ('string', 'array', 'object'),
+        'pattern': ('string',),
+        'minimum': ('number',),
+        'maximum': ('number',),
+        'multipleOf': ('number',),
+        'minItems': ('string', 'array', 'object'),
+        'maxItems': ('string', 'array', 'object'),
+        'uniqueItems': ('string', 'array', 'object'),
+        'items': ('string', 'array', 'object'),
+        'minProperties': ('string', 'array', 'object'),
+        'maxProperties': ('string', 'array', 'object'),
+        'required': ('string', 'array', 'object'),
+    }
+
+    # Python allows at most 100 levels of indentation and 20 statically
+    # nested blocks (loops, try, with). Deeper code is in another function.
+    MAX_INDENT = 40
+    MAX_BLOCKS = 15
+
+    # Calling few branches one by one is faster than lookup into dispatch table.
+    DISPATCH_MIN_BRANCHES = 3
+
+    # How many keys matched by patternProperties are remembered.
+    PATTERN_MEMO_SIZE = 10000
+
+    def __init__(self, definition, name='func', batch=False, cooperative=False, mode='exception', optimize=False, profile=False, vectorize=True):
+        if mode not in ('exception', 'bool', 'errors'):
+            raise JsonSchemaDefinitionException('Unknown mode {}'.format(mode))
+        self._name = name
+        self._batch = batch
+        self._cooperative = cooperative
+        self._mode = mode
+        self._optimize = get_passes(optimize)
+        self._profile = profile
+        self._vectorize = vectorize
+        definition = optimize_definition(definition, self._optimize)
+        self._root_definition = definition
         self._code = []
         self._compile_regexps = {}
+        self._regexps_names = {}
+        self._constants = OrderedDict()
+        self._constants_names = {}
+
+        # Key of needed function (URI of referenced definition or number of
+        # branch with mode) -> its name; name -> its definition, mode and
+        # JSON pointer of the definition as tuple.
+        self._validation_functions_names = {}
+        self._needed_validation_functions = OrderedDict()
+        self._dispatch_tables = []
+        self._canonical_function = False
+        self._unique_function = False
+        # Patterns of patternProperties -> name of function matching them.
+        self._pattern_functions = OrderedDict()
+        self._vector = False
+        # JSON pointer of keyword block and keyword -> index in profile lists.
+        self._profile_slots = {}
 
         self._variables = set()
         self._indent = 0
+        # Indentation levels of lines opening blocks which are still open.
+        self._block_indents = []
         self._variable = None
-        self._variable_name = None
+        self._variable_path = None
+        self._keyword = None
         self._definition = None
+        self._schema_path = None
 
-        self._json_keywords_to_function = OrderedDict((
-            ('type', self.generate_type),
-            ('enum', self.generate_enum),
-            ('allOf', self.generate_all_of),
-            ('anyOf', self.generate_any_of),
-            ('oneOf', self.generate_one_of),
-            ('not', self.generate_not),
-            ('minLength', self.generate_min_length),
-            ('maxLength', self.generate_max_length),
-            ('pattern', self.generate_pattern),
-            ('minimum', self.generate_minimum),
-            ('maximum', self.generate_maximum),
-            ('multipleOf', self.generate_multiple_of),
-            ('minItems', self.generate_min_items),
-            ('maxItems', self.generate_max_items),
-            ('uniqueItems', self.generate_unique_items),
-            ('items', self.generate_items),
-            ('minProperties', self.generate_min_properties),
-            ('maxProperties', self.generate_max_properties),
-            ('required', self.generate_required),
-            ('properties', self.generate_properties),
-        ))
+        self._json_keywords_to_function = OrderedDict(
+            (keyword, getattr(self, 'generate_' + name)) for keyword, name in self.KEYWORDS
+        )
 
         self.generate_func_code(definition)
 
@@ -94,17 +377,67 @@ class CodeGenerator:
         """
         return dict(
             self._compile_regexps,
+            **self._constants,
             re=re,
+            array=array,
+            vector_types=vector_types,
+            vector_candidates=vector_candidates,
+            perf_counter=perf_counter,
+            ErrorCollector=ErrorCollector,
+            JsonSchemaException=JsonSchemaException,
+        )
+
+    @property
+    def serializable_state(self):
+        """
+        Returns part of ``global_state`` which can be stored (it contains only
+        basic types supported by ``marshal``) and later turned back into global
+        state by :any:`restore_global_state`.
+        """
+        memo = {}
+        return {
+            'regexps': {name: regexp.pattern for name, regexp in self._compile_regexps.items()},
+            'constants': {name: marshallable(value, memo) for name, value in self._constants.items()},
+        }
+
+    @property
+    def global_state_code(self):
+        """
+        Returns code creating variables of ``serializable_state`` as module-level
+        globals. Together with ``func_code`` it makes module which does not need
+        to generate anything during import.
+        """
+        return '\n'.join(
+            (['from fastjsonschema.vector import vector_candidates, vector_types'] if self._vector else [])
+            + (['from time import perf_counter'] if self._profile else [])
+            + ['{} = re.compile({!r})'.format(name, regexp.pattern) for name, regexp in self._compile_regexps.items()]
+            + constants_code(self._constants)
+        )
+
+    @staticmethod
+    def restore_global_state(serializable_state):
+        """
+        Returns global variables for generating function from ``func_code`` which
+        are created from ``serializable_state``.
+        """
+        return dict(
+            {name: intern_regexp(pattern) for name, pattern in serializable_state['regexps'].items()},
+            **serializable_state['constants'],
+            re=re,
+            array=array,
+            vector_types=vector_types,
+            vector_candidates=vector_candidates,
+            perf_counter=perf_counter,
+            ErrorCollector=ErrorCollector,
             JsonSchemaException=JsonSchemaException,
         )
 
     @indent
     def l(self, line, *args, **kwds):
         """
-        Short-cut of line. Used for inserting line. It's formated with parameters
-        ``variable``, ``variable_name`` (as ``name`` for short-cut), all keys from
-        current JSON schema ``definition`` and also passed arguments in ``args``
-        and named ``kwds``.
+        Short-cut of line. Used for inserting line. It's formated with parameter
+        ``variable``, all keys from current JSON schema ``definition`` and also
+        passed arguments in ``args`` and named ``kwds``.
 
         .. code-block:: python
 
@@ -119,16 +452,15 @@ class CodeGenerator:
         """
         spaces = ' ' * self.INDENT * self._indent
 
-        name = self._variable_name
-        if name and '{' in name:
-            name = '"+"{}".format(**locals())+"'.format(self._variable_name)
-
         context = dict(
             self._definition or {},
             variable=self._variable,
-            name=name,
             **kwds
         )
+        while self._block_indents and self._block_indents[-1] >= self._indent:
+            self._block_indents.pop()
+        if line.startswith(('for ', 'try:', 'while ', 'with ')):
+            self._block_indents.append(self._indent)
         self._code.append(spaces + line.format(*args, **context))
 
     def create_variable_with_length(self):
@@ -148,25 +480,397 @@ class CodeGenerator:
     def generate_func_code(self, definition):
         """
         Creates base code of validation function and calls helper
-        for creating code by definition.
+        for creating code by definition. Then creates functions for
+        all referenced definitions (those can reference another ones).
         """
-        with self.l('def func(data):'):
+        if self._mode == 'errors':
+            with self.l('def {}(data, max_errors=None, max_errors_per_path=None):', self._name):
+                self.generate_func_prologue()
+                self.l('errors = ErrorCollector(max_errors, max_errors_per_path)')
+                with self.l('try:'):
+                    code_length = len(self._code)
+                    self.generate_func_code_block(definition, 'data', ('"data"',), ())
+                    if len(self._code) == code_length:
+                        self.l('pass')
+                with self.l('except ErrorCollector.Full:'):
+                    self.l('pass')
+                self.l('return errors')
+        else:
+            with self.l('def {}(data):', self._name):
+                self.generate_func_prologue()
+                self.generate_func_code_block(definition, 'data', ('"data"',), ())
+                self.generate_func_epilogue()
+
+        if self._batch:
+            self.generate_batch_func_code(definition)
+
+        while self._needed_validation_functions:
+            name, (definition, mode, schema_path) = self._needed_validation_functions.popitem(last=False)
+            self.generate_validation_function(name, definition, mode, schema_path)
+
+        if self._canonical_function:
+            self.generate_canonical_function()
+        if self._unique_function:
+            self.generate_unique_function()
+        for patterns, name in self._pattern_functions.items():
+            self.generate_pattern_function(name, patterns)
+
+        # Tables refer to functions, so they have to be after all of them.
+        if self._dispatch_tables:
+            self.l('')
+            self.l('')
+            for line in self._dispatch_tables:
+                self.l('{}', line)
+
+    def generate_batch_func_code(self, definition):
+        """
+        Creates function validating many values. Validation rules are inlined
+        into the loop, so there is no function call per value. Indexes of invalid
+        values are collected in compact ``array``.
+        """
+        self._variables = set()
+        self.l('')
+        self.l('')
+        with self.l('def {}_many(items, max_errors=None):', self._name):
             self.l('NoneType = type(None)')
-            self.generate_func_code_block(definition, 'data', 'data')
+            self.l('valid = []')
+            self.l("invalid = array('L')")
+            self.l('errors = []')
+            with self.l('for index, data in enumerate(items):'):
+                with self.l('try:'):
+                    code_length = len(self._code)
+                    self.generate_func_code_block(definition, 'data', ('"data"',), ())
+                    if len(self._code) == code_length:
+                        self.l('pass')
+                with self.l('except JsonSchemaException as exc:'):
+                    self.l('invalid.append(index)')
+                    with self.l('if max_errors is None or len(errors) < max_errors:'):
+                        self.l('errors.append((index, exc))')
+                with self.l('else:'):
+                    self.l('valid.append(data)')
+            self.l('return valid, invalid, errors')
+
+    def generate_validation_function(self, name, definition, mode, schema_path):
+        """
+        Creates function validating ``definition`` (referenced one or branch of
+        ``anyOf`` for example) in given ``mode``. It gets path of validated
+        variable as second parameter, so errors are the same as if the
+        definition would be inlined.
+        """
+        self._variables = set()
+        self._mode = mode
+        self.l('')
+        self.l('')
+        with self.l('def {}(data, path=("data",){}):', name, ', errors=None' if mode == 'errors' else ''):
+            self.generate_func_prologue()
+            self.generate_func_code_block(definition, 'data', ('path',), schema_path)
+            self.generate_func_epilogue()
+
+    def generate_canonical_function(self):
+        """
+        Creates function returning hashable form of value, the same as
+        :any:`canonical`. Generated code does not depend on this library.
+        """
+        self.l('')
+        self.l('')
+        with self.l('def {}_canonical(value):', self._name):
+            with self.l('if isinstance(value, list):'):
+                self.l('return tuple({}_canonical(item) for item in value)', self._name)
+            with self.l('if isinstance(value, dict):'):
+                self.l('return frozenset((key, {}_canonical(item)) for key, item in value.items())', self._name)
+            self.l('return value')
+
+    def generate_unique_function(self):
+        """
+        Creates function checking that all items of list are unique by JSON,
+        where ``1`` and ``True`` are different values. Hashable items are
+        checked by ``set`` directly. Only when it finds duplicate (which can be
+        ``1`` and ``True``) or items are not hashable, items are turned into
+        hashable keys with booleans replaced by objects which are not equal to
+        anything else.
+        """
+        self.l('')
+        self.l('')
+        self.l('{}_bool_keys = (object(), object())', self._name)
+        self.l('')
+        self.l('')
+        with self.l('def {}_unique_key(value):', self._name):
+            with self.l('if value is True or value is False:'):
+                self.l('return {}_bool_keys[value]', self._name)
+            with self.l('if isinstance(value, list):'):
+                self.l('return tuple(map({}_unique_key, value))', self._name)
+            with self.l('if isinstance(value, dict):'):
+                self.l('return frozenset(zip(value, map({}_unique_key, value.values())))', self._name)
+            self.l('return value')
+        self.l('')
+        self.l('')
+        with self.l('def {}_unique(value):', self._name):
+            with self.l('try:'):
+                with self.l('if len(set(value)) == len(value):'):
+                    self.l('return True')
+            with self.l('except TypeError:'):
+                self.l('pass')
+            self.l('return len(set(map({}_unique_key, value))) == len(value)', self._name)
+
+    def generate_func_prologue(self):
+        """
+        Creates code needed at the beginning of every validation function.
+        """
+        self.l('NoneType = type(None)')
+        if self._cooperative:
+            # Function has to be generator even when there is nothing to yield.
+            self.l('yield from ()')
+
+    def generate_func_epilogue(self):
+        """
+        Creates code returning result of successful validation.
+        """
+        if self._mode == 'bool':
+            self.l('return True')
+        else:
             self.l('return data')
 
-    def generate_func_code_block(self, definition, variable, variable_name):
+    def exc(self, msg, *args, rule=None):
+        """
+        Creates code for failed validation of ``rule`` (currently generated
+        keyword by default). Message ``msg`` is formatted with ``args`` and
+        keys from current JSON schema ``definition`` already here, validation
+        function only passes it to :any:`JsonSchemaException` together with
+        value, its path and definition.
+
+        .. code-block:: python
+
+            with self.l('if {variable} not in {enum}:'):
+                self.exc('must be one of {enum}')
+        """
+        if self._profile:
+            self.l('{}_profile_failures[{}] += 1', self._name, self.get_profile_slot())
+        if self._mode == 'bool':
+            self.l('return False')
+            return
+        exc_args = '{variable}, {}, {}, {!r}, {!r}'
+        exc_args_values = (
+            self.path_code(),
+            self.get_constant_name(self._definition, 'definition'),
+            rule or self._keyword,
+            msg.format(*args, **self._definition),
+        )
+        if self._mode == 'errors':
+            self.l('errors.add(' + exc_args + ')', *exc_args_values)
+        else:
+            self.l('raise JsonSchemaException(None, ' + exc_args + ')', *exc_args_values)
+
+    def path_code(self):
+        """
+        Returns code of tuple with path to current variable. Indexes and keys
+        inside of loops are known only during validation, so path is kept as
+        tuple of pieces of code. Functions of referenced definitions get path
+        as parameter ``path``.
+        """
+        if self._variable_path[0] == 'path':
+            if len(self._variable_path) == 1:
+                return 'path'
+            return 'path + ({},)'.format(', '.join(self._variable_path[1:]))
+        return '({},)'.format(', '.join(self._variable_path))
+
+    def get_constant_name(self, value, kind, key=None):
         """
-        Creates validation rules for current definition.
+        Returns name of global variable with ``value`` (it has to be supported
+        by ``marshal``). The same object (or value with the same ``key``) is
+        stored only once.
         """
-        backup = self._definition, self._variable, self._variable_name
-        self._definition, self._variable, self._variable_name = definition, variable, variable_name
+        key = id(value) if key is None else key
+        name = self._constants_names.get(key)
+        if name is None:
+            name = '{}_{}_{}'.format(self._name, kind, len(self._constants))
+            self._constants_names[key] = name
+            self._constants[name] = value
+        return name
+
+    def generate_loop_step(self):
+        """
+        Creates code at the beginning of every loop over validated data. In
+        cooperative mode it gives chance to run something else.
+        """
+        if self._cooperative:
+            self.l('yield')
+
+    def generate_func_code_block(self, definition, variable, variable_path, schema_path):
+        """
+        Creates validation rules for current definition. Path of variable is
+        tuple of pieces of code, see :any:`path_code`. Path of definition in
+        the root definition (JSON pointer as tuple) is ``schema_path``.
+        """
+        backup = self._definition, self._variable, self._variable_path, self._keyword, self._schema_path
+        self._definition, self._variable, self._variable_path = definition, variable, variable_path
+        self._schema_path = schema_path
+
+        if '$ref' in definition:
+            # All other properties in a "$ref" object must be ignored.
+            self._keyword = '$ref'
+            with self.profile_block():
+                self.generate_ref()
+        elif (self._indent > self.MAX_INDENT or len(self._block_indents) > self.MAX_BLOCKS) and definition:
+            # Python can't compile too deeply nested code, so the rest is in
+            # another function.
+            self.generate_call(self.get_nested_function_name(definition))
+        elif self._mode == 'errors' and 'type' in definition:
+            # Validation continues after error, but other rules can't be
+            # checked when value is not of expected type.
+            self._keyword = 'type'
+            with self.profile_block(timed=False):
+                self.generate_type()
+            variables = set(self._variables)
+            with self.l('else:'):
+                code_length = len(self._code)
+                for key, func in self._json_keywords_to_function.items():
+                    if key != 'type' and key in definition:
+                        self._keyword = key
+                        with self.profile_block(), self.type_guard():
+                            func()
+                if len(self._code) == code_length:
+                    self.l('pass')
+            # Variables created in the block do not have to exist after it.
+            self._variables = variables
+        else:
+            for key, func in self._json_keywords_to_function.items():
+                if key in definition:
+                    self._keyword = key
+                    with self.profile_block(), self.type_guard():
+                        func()
+
+        self._definition, self._variable, self._variable_path, self._keyword, self._schema_path = backup
+
+    @contextmanager
+    def profile_block(self, timed=True):
+        """
+        With ``profile`` it adds code counting calls of keyword block generated
+        inside and time spent in it (only when validation does not fail there,
+        failures are counted by :any:`exc`). Counters are in global lists
+        ``{name}_profile_calls``, ``{name}_profile_failures`` and
+        ``{name}_profile_seconds`` indexed by slot of keyword.
+        """
+        if not self._profile:
+            yield
+            return
+        code_length = len(self._code)
+        yield
+        if len(self._code) == code_length:
+            return
+        slot = self.get_profile_slot()
+        spaces = ' ' * self.INDENT * self._indent
+        lines = ['{}_profile_calls[{}] += 1'.format(self._name, slot)]
+        if timed:
+            lines.append('profile_start_{} = perf_counter()'.format(slot))
+            self.l('{}_profile_seconds[{}] += perf_counter() - profile_start_{}', self._name, slot, slot)
+        self._code[code_length:code_length] = [spaces + line for line in lines]
+
+    def get_profile_slot(self):
+        """
+        Returns index of current keyword in lists of profile counters. Keyword
+        generated more times (for example in batch function) has one slot.
+        """
+        key = (self._schema_path, self._keyword)
+        slot = self._profile_slots.get(key)
+        if slot is None:
+            if not self._profile_slots:
+                for kind, value in (('rules', []), ('calls', []), ('failures', []), ('seconds', [])):
+                    self._constants['{}_profile_{}'.format(self._name, kind)] = value
+            slot = self._profile_slots[key] = len(self._profile_slots)
+            self._constants['{}_profile_rules'.format(self._name)].append((json_pointer(self._schema_path), self._keyword))
+            self._constants['{}_profile_calls'.format(self._name)].append(0)
+            self._constants['{}_profile_failures'.format(self._name)].append(0)
+            self._constants['{}_profile_seconds'.format(self._name)].append(0.0)
+        return slot
+
+    def resolve_ref(self, uri):
+        """
+        Returns definition referenced by ``uri``. Only references inside of
+        the definition itself are supported (``#`` for whole definition or
+        JSON pointer like ``#/definitions/node``).
+        """
+        return resolve_ref(self._root_definition, uri)
+
+    def get_validation_function_name(self, uri, mode=None):
+        """
+        Returns name of function validating definition referenced by ``uri``
+        in ``mode`` (mode of current function by default). Function is created
+        later unless it already exists.
+        """
+        mode = mode or self._mode
+        key = (uri, mode)
+        if key not in self._validation_functions_names:
+            name = '{}_{}'.format(self._name, re.sub(r'\W', '_', uri[1:]).strip('_') or 'root')
+            self._add_validation_function(key, name, self.resolve_ref(uri), mode, uri_pointer(uri))
+        return self._validation_functions_names[key]
+
+    def get_branch_function_name(self, definition, index):
+        """
+        Returns name of function returning whether value is valid by ``definition``
+        which is ``index``-th branch of current ``anyOf``, ``oneOf`` or ``not``.
+        Function is created later.
+        """
+        key = ('branch', len(self._validation_functions_names))
+        name = '{}_branch_{}'.format(self._name, key[1])
+        if self._keyword == 'not':
+            schema_path = self._schema_path + ('not',)
+        else:
+            schema_path = self._schema_path + (self._keyword, str(index))
+        self._add_validation_function(key, name, definition, 'bool', schema_path)
+        return self._validation_functions_names[key]
+
+    def get_nested_function_name(self, definition):
+        """
+        Returns name of function validating ``definition`` which is nested too
+        deeply to be generated inline. Function is created later.
+        """
+        key = ('nested', id(definition), self._mode)
+        if key not in self._validation_functions_names:
+            name = '{}_nested_{}'.format(self._name, len(self._validation_functions_names))
+            self._add_validation_function(key, name, definition, self._mode, self._schema_path)
+        return self._validation_functions_names[key]
+
+    def _add_validation_function(self, key, name, definition, mode, schema_path):
+        if mode != 'exception':
+            name = '{}_{}'.format(name, mode)
+        while name in self._needed_validation_functions or name in self._validation_functions_names.values():
+            name += '_'
+        self._validation_functions_names[key] = name
+        self._needed_validation_functions[name] = (definition, mode, schema_path)
+
+    def generate_ref(self):
+        """
+        Validation by referenced definition. Referenced definition is generated
+        only once as separate function which is called from every place where
+        it's referenced, so it can be also recursive.
+
+        .. code-block:: python
 
-        for key, func in self._json_keywords_to_function.items():
-            if key in definition:
-                func()
+            {
+                'definitions': {
+                    'node': {
+                        'type': 'object',
+                        'properties': {
+                            'children': {'type': 'array', 'items': {'$ref': '#/definitions/node'}},
+                        },
+                    },
+                },
+                '$ref': '#/definitions/node',
+            }
+        """
+        self.generate_call(self.get_validation_function_name(self._definition['$ref']))
 
-        self._definition, self._variable, self._variable_name = backup
+    def generate_call(self, name):
+        """
+        Creates call of generated function ``name`` validating current variable.
+        """
+        if self._mode == 'bool':
+            with self.l('if not {}:', self.get_branch_call(name)):
+                self.l('return False')
+        elif self._mode == 'errors':
+            self.l('{}({variable}, {}, errors)', name, self.path_code())
+        else:
+            self.l('{}{}({variable}, {})', 'yield from ' if self._cooperative else '', name, self.path_code())
 
     def generate_type(self):
         """
@@ -180,16 +884,51 @@ class CodeGenerator:
         types = enforce_list(self._definition['type'])
         python_types = ', '.join(self.JSON_TYPE_TO_PYTHON_TYPE.get(t) for t in types)
 
+        if 'array' in types and self.is_vectorizable(self._definition.get('items')):
+            python_types += ', *vector_types'
+
         extra = ''
         if ('number' in types or 'integer' in types) and 'boolean' not in types:
             extra = ' or isinstance({variable}, bool)'.format(variable=self._variable)
 
         with self.l('if not isinstance({variable}, ({})){}:', python_types, extra):
-            self.l('raise JsonSchemaException("{name} must be {}")', ' or '.join(types))
+            self.exc('must be {}', ' or '.join(types))
 
     def generate_enum(self):
-        with self.l('if {variable} not in {enum}:'):
-            self.l('raise JsonSchemaException("{name} must be one of {enum}")')
+        """
+        Values of enum are stored in global ``frozenset``, so the check takes
+        the same time for any number of values. Lists and dictionaries are not
+        hashable, so when enum contains them, value is checked in canonical
+        form (see :any:`canonical`). Enum with one value is just comparison.
+
+        .. code-block:: python
+
+            {'enum': ['CZK', 'EUR', 'USD']}
+        """
+        enum = self._definition['enum']
+        if len(enum) == 1:
+            value = enum[0]
+            if value is None or isinstance(value, (str, int)):
+                value_code = repr(value)
+            else:
+                value_code = self.get_constant_name(value, 'enum')
+            with self.l('if {variable} != {}:', value_code):
+                self.exc('must be one of {enum}')
+        elif any(isinstance(value, (list, dict)) for value in enum):
+            self._canonical_function = True
+            enum_name = self.get_constant_name(frozenset(canonical(value) for value in enum), 'enum', ('enum', id(enum)))
+            with self.l('if {}_canonical({variable}) not in {}:', self._name, enum_name):
+                self.exc('must be one of {enum}')
+        else:
+            enum_name = self.get_constant_name(frozenset(enum), 'enum', ('enum', id(enum)))
+            types = enforce_list(self._definition.get('type', ['array', 'object']))
+            if 'array' in types or 'object' in types:
+                # Lists and dictionaries can't be in set of hashable values.
+                with self.l('if isinstance({variable}, (list, dict)) or {variable} not in {}:', enum_name):
+                    self.exc('must be one of {enum}')
+            else:
+                with self.l('if {variable} not in {}:', enum_name):
+                    self.exc('must be one of {enum}')
 
     def generate_all_of(self):
         """
@@ -207,8 +946,13 @@ class CodeGenerator:
 
         Valid values for this definition are 5, 6, 7, ... but not 4 or 'abc' for example.
         """
-        for definition_item in self._definition['allOf']:
-            self.generate_func_code_block(definition_item, self._variable, self._variable_name)
+        for index, definition_item in enumerate(self._definition['allOf']):
+            self.generate_func_code_block(
+                definition_item,
+                self._variable,
+                self._variable_path,
+                self._schema_path + ('allOf', str(index)),
+            )
 
     def generate_any_of(self):
         """
@@ -226,16 +970,18 @@ class CodeGenerator:
 
         Valid values for this definition are 3, 4, 5, 10, 11, ... but not 8 for example.
         """
-        self.l('{variable}_any_of_count = 0')
-        for definition_item in self._definition['anyOf']:
-            with self.l('if not {variable}_any_of_count:'):
-                with self.l('try:'):
-                    self.generate_func_code_block(definition_item, self._variable, self._variable_name)
-                    self.l('{variable}_any_of_count += 1')
-                self.l('except JsonSchemaException: pass')
+        dispatch = self.get_branch_dispatch(self._definition['anyOf'])
+        if dispatch:
+            with self.l('for {variable}_branch in {}:', dispatch):
+                with self.l('if {}:', self.get_branch_call('{}_branch'.format(self._variable))):
+                    self.l('break')
+            with self.l('else:'):
+                self.exc('must be valid by one of anyOf definition')
+            return
 
-        with self.l('if not {variable}_any_of_count:'):
-            self.l('raise JsonSchemaException("{name} must be valid by one of anyOf definition")')
+        branches = self.get_branch_calls(self._definition['anyOf'])
+        with self.l('if not ({}):', ' or '.join(branches)):
+            self.exc('must be valid by one of anyOf definition')
 
     def generate_one_of(self):
         """
@@ -254,14 +1000,24 @@ class CodeGenerator:
         Valid values for this definitions are 3, 5, 6, ... but not 15 for example.
         """
         self.l('{variable}_one_of_count = 0')
-        for definition_item in self._definition['oneOf']:
-            with self.l('try:'):
-                self.generate_func_code_block(definition_item, self._variable, self._variable_name)
-                self.l('{variable}_one_of_count += 1')
-            self.l('except JsonSchemaException: pass')
+        dispatch = self.get_branch_dispatch(self._definition['oneOf'])
+        if dispatch:
+            with self.l('for {variable}_branch in {}:', dispatch):
+                with self.l('if {}:', self.get_branch_call('{}_branch'.format(self._variable))):
+                    self.l('{variable}_one_of_count += 1')
+                    # Result is known once second branch is valid.
+                    with self.l('if {variable}_one_of_count > 1:'):
+                        self.l('break')
+            with self.l('if {variable}_one_of_count != 1:'):
+                self.exc('must be valid exactly by one of oneOf definition')
+            return
 
+        # Result is known once second branch is valid.
+        for branch in self.get_branch_calls(self._definition['oneOf']):
+            with self.l('if {variable}_one_of_count < 2 and {}:', branch):
+                self.l('{variable}_one_of_count += 1')
         with self.l('if {variable}_one_of_count != 1:'):
-            self.l('raise JsonSchemaException("{name} must be valid exactly by one of oneOf definition")')
+            self.exc('must be valid exactly by one of oneOf definition')
 
     def generate_not(self):
         """
@@ -273,59 +1029,237 @@ class CodeGenerator:
 
         Valid values for this definitions are 'hello', 42, ... but not None.
         """
-        with self.l('try:'):
-            self.generate_func_code_block(self._definition['not'], self._variable, self._variable_name)
-        self.l('except JsonSchemaException: pass')
-        self.l('else: raise JsonSchemaException("{name} must not be valid by not definition")')
+        branch, = self.get_branch_calls([self._definition['not']])
+        with self.l('if {}:', branch):
+            self.exc('must not be valid by not definition')
+
+    def get_branch_calls(self, definitions):
+        """
+        Returns list of expressions calling functions which return whether
+        current variable is valid by each of ``definitions``. Failed branch
+        only returns ``False``, so no exception is created and caught.
+        """
+        return [
+            self.get_branch_call(self.get_branch_function_name(definition, index))
+            for index, definition in enumerate(definitions)
+        ]
+
+    def get_branch_call(self, function):
+        """
+        Returns expression calling branch ``function`` with current variable.
+        """
+        if self._cooperative:
+            return '(yield from {}({}))'.format(function, self._variable)
+        return '{}({})'.format(function, self._variable)
+
+    def get_branch_dispatch(self, definitions):
+        """
+        Returns expression with tuple of functions of those ``definitions``
+        (branches of ``anyOf`` or ``oneOf``) which can be valid for current
+        variable, or ``None`` when all branches have to be tried one by one.
+
+        Branches are told apart by discriminator, which is required property
+        with only one allowed value, for example:
+
+        .. code-block:: python
+
+            {
+                'oneOf': [
+                    {'type': 'object', 'properties': {'kind': {'enum': ['circle']}, ...}, 'required': ['kind']},
+                    {'type': 'object', 'properties': {'kind': {'enum': ['square']}, ...}, 'required': ['kind']},
+                    ...
+                ],
+            }
+
+        or by type of value when branches have different ``type``. Branches
+        are then looked up in table created after all functions (see
+        :any:`generate_func_code`), so only matching branches are called.
+        """
+        if len(definitions) < self.DISPATCH_MIN_BRANCHES:
+            return None
+        resolved = [self.resolve_definition(definition) for definition in definitions]
+
+        key, values = self.find_discriminator(resolved)
+        if key is not None:
+            table = OrderedDict((value, []) for value in values if value is not None)
+            default = []
+            for index, value in enumerate(values):
+                for candidates in ([table[value]] if value is not None else list(table.values()) + [default]):
+                    candidates.append(index)
+            name = self._add_dispatch_table(definitions, [(repr(value), table[value]) for value in table], default)
+            self.l('{variable}_discriminator = {variable}.get({!r}) if isinstance({variable}, dict) else None', key)
+            return '{0}.get({variable}_discriminator, {0}_default) if isinstance({variable}_discriminator, str) else {0}_default'.format(
+                name,
+                variable=self._variable,
+            )
+
+        table = []
+        for python_type, json_types in self.PYTHON_TYPE_TO_JSON_TYPES:
+            candidates = [
+                index
+                for index, definition in enumerate(resolved)
+                if 'type' not in definition or json_types & set(enforce_list(definition['type']))
+            ]
+            table.append((python_type, candidates))
+        if all(len(candidates) == len(definitions) for _, candidates in table):
+            return None
+        # Instances of subclasses (like OrderedDict) try all branches.
+        name = self._add_dispatch_table(definitions, table, range(len(definitions)))
+        return '{0}.get(type({variable}), {0}_default)'.format(name, variable=self._variable)
+
+    def find_discriminator(self, definitions):
+        """
+        Returns property which tells apart most of ``definitions`` and list of
+        its values for each definition (``None`` when definition can't be told
+        apart by it). Returns ``(None, None)`` when there is no such property.
+        """
+        values_by_key = OrderedDict()
+        for index, definition in enumerate(definitions):
+            if enforce_list(definition.get('type')) != ['object']:
+                continue
+            properties = definition.get('properties', {})
+            for key in definition.get('required', []):
+                enum = self.resolve_definition(properties.get(key, {})).get('enum')
+                if isinstance(enum, list) and len(enum) == 1 and isinstance(enum[0], str):
+                    values_by_key.setdefault(key, [None] * len(definitions))[index] = enum[0]
+        best_key, best_values = None, None
+        for key, values in values_by_key.items():
+            count = sum(value is not None for value in values)
+            if count > 1 and (best_values is None or count > sum(value is not None for value in best_values)):
+                best_key, best_values = key, values
+        return best_key, best_values
+
+    def resolve_definition(self, definition):
+        """
+        Returns ``definition`` itself or definition referenced by it.
+        """
+        seen = set()
+        while isinstance(definition, dict) and '$ref' in definition and definition['$ref'] not in seen:
+            seen.add(definition['$ref'])
+            definition = self.resolve_ref(definition['$ref'])
+        return definition
+
+    def _add_dispatch_table(self, definitions, table, default):
+        """
+        Adds code of dispatch table with keys and indexes of ``definitions``
+        in ``table`` and tuple of ``default`` indexes for other keys.
+        """
+        functions = [self.get_branch_function_name(definition, index) for index, definition in enumerate(definitions)]
+
+        def functions_tuple(indexes):
+            return '({})'.format(''.join(functions[index] + ', ' for index in indexes).rstrip(' '))
+
+        name = '{}_dispatch_{}'.format(self._name, len(self._dispatch_tables) // 2)
+        self._dispatch_tables.append('{} = {{{}}}'.format(name, ', '.join(
+            '{}: {}'.format(key, functions_tuple(candidates))
+            for key, candidates in table
+        )))
+        self._dispatch_tables.append('{}_default = {}'.format(name, functions_tuple(default)))
+        return name
 
     def generate_min_length(self):
         self.create_variable_with_length()
         with self.l('if {variable}_len < {minLength}:'):
-            self.l('raise JsonSchemaException("{name} must be longer than or equal to {minLength} characters")')
+            self.exc('must be longer than or equal to {minLength} characters')
 
     def generate_max_length(self):
         self.create_variable_with_length()
         with self.l('if {variable}_len > {maxLength}:'):
-            self.l('raise JsonSchemaException("{name} must be shorter than or equal to {maxLength} characters")')
+            self.exc('must be shorter than or equal to {maxLength} characters')
+
+    def get_regexp_name(self, pattern):
+        """
+        Returns name of global variable with compiled ``pattern``. Every
+        pattern is there only once.
+        """
+        name = self._regexps_names.get(pattern)
+        if name is None:
+            name = '{}_re_{}'.format(self._name, len(self._regexps_names))
+            self._regexps_names[pattern] = name
+            self._compile_regexps[name] = intern_regexp(pattern)
+        return name
 
     def generate_pattern(self):
-        self._compile_regexps['{}_re'.format(self._variable)] = re.compile(self._definition['pattern'])
-        with self.l('if not {variable}_re.match({variable}):'):
-            self.l('raise JsonSchemaException("{name} must match pattern {pattern}")')
+        """
+        Simple patterns are checked by methods of ``str``, see :any:`lower_pattern`.
+
+        .. code-block:: python
+
+            {'pattern': '^[0-9]+$'}
+        """
+        condition = lower_pattern(self._definition['pattern'], self._variable)
+        if condition is None:
+            condition = '{}.match({})'.format(self.get_regexp_name(self._definition['pattern']), self._variable)
+        with self.l('if not ({}):', condition):
+            self.exc('must match pattern {pattern}')
 
     def generate_minimum(self):
+        if 'fuse_ranges' in self._optimize and 'maximum' in self._definition:
+            self.generate_range()
+            return
         if self._definition.get('exclusiveMinimum', False):
             with self.l('if {variable} <= {minimum}:'):
-                self.l('raise JsonSchemaException("{name} must be bigger than {minimum}")')
+                self.exc('must be bigger than {minimum}')
         else:
             with self.l('if {variable} < {minimum}:'):
-                self.l('raise JsonSchemaException("{name} must be bigger than or equal to {minimum}")')
+                self.exc('must be bigger than or equal to {minimum}')
 
     def generate_maximum(self):
+        if 'fuse_ranges' in self._optimize and 'minimum' in self._definition:
+            # Already checked together with minimum.
+            return
         if self._definition.get('exclusiveMaximum', False):
             with self.l('if {variable} >= {maximum}:'):
-                self.l('raise JsonSchemaException("{name} must be smaller than {maximum}")')
+                self.exc('must be smaller than {maximum}')
         else:
             with self.l('if {variable} > {maximum}:'):
-                self.l('raise JsonSchemaException("{name} must be smaller than or equal to {maximum}")')
+                self.exc('must be smaller than or equal to {maximum}')
+
+    def generate_range(self):
+        """
+        Checks ``minimum`` and ``maximum`` by one chained comparison. Which one
+        failed is found out only for invalid value.
+        """
+        exclusive_minimum = self._definition.get('exclusiveMinimum', False)
+        exclusive_maximum = self._definition.get('exclusiveMaximum', False)
+        with self.l(
+            'if not {minimum} {} {variable} {} {maximum}:',
+            '<' if exclusive_minimum else '<=',
+            '<' if exclusive_maximum else '<=',
+        ):
+            if exclusive_minimum:
+                with self.l('if {variable} <= {minimum}:'):
+                    self.exc('must be bigger than {minimum}', rule='minimum')
+            else:
+                with self.l('if {variable} < {minimum}:'):
+                    self.exc('must be bigger than or equal to {minimum}', rule='minimum')
+            with self.l('else:'):
+                if exclusive_maximum:
+                    self.exc('must be smaller than {maximum}', rule='maximum')
+                else:
+                    self.exc('must be smaller than or equal to {maximum}', rule='maximum')
 
     def generate_multiple_of(self):
         with self.l('if {variable} % {multipleOf} != 0:'):
-            self.l('raise JsonSchemaException("{name} must be multiple of {multipleOf}")')
+            self.exc('must be multiple of {multipleOf}')
 
     def generate_min_items(self):
         self.create_variable_with_length()
         with self.l('if {variable}_len < {minItems}:'):
-            self.l('raise JsonSchemaException("{name} must contain at least {minItems} items")')
+            self.exc('must contain at least {minItems} items')
 
     def generate_max_items(self):
         self.create_variable_with_length()
         with self.l('if {variable}_len > {maxItems}:'):
-            self.l('raise JsonSchemaException("{name} must contain less than or equal to {maxItems} items")')
+            self.exc('must contain less than or equal to {maxItems} items')
 
     def generate_unique_items(self):
         """
-        With Python 3.4 module ``timeit`` recommended this solutions:
+        Items are unique by JSON, so ``[1, True]`` is valid while ``[1, 1.0]``
+        is not. Lists and dictionaries are compared by value. It takes linear
+        time, see :any:`generate_unique_function`.
+
+        With Python 3.4 module ``timeit`` recommended ``set`` for hashable items:
 
         .. code-block:: python
 
@@ -338,9 +1272,12 @@ class CodeGenerator:
             >>> timeit.timeit("np.unique(x).size == len(x)", "x=range(100)+range(100); import numpy as np", number=100000)
             2.1439831256866455
         """
+        if not self._definition['uniqueItems']:
+            return
+        self._unique_function = True
         self.create_variable_with_length()
-        with self.l('if {variable}_len > len(set({variable})):'):
-            self.l('raise JsonSchemaException("{name} must contain unique items")')
+        with self.l('if {variable}_len > 1 and not {}_unique({variable}):', self._name):
+            self.exc('must contain unique items')
 
     def generate_items(self):
         self.create_variable_with_length()
@@ -351,66 +1288,313 @@ class CodeGenerator:
                     self.generate_func_code_block(
                         item_definition,
                         '{}_{}'.format(self._variable, x),
-                        '{}[{}]'.format(self._variable_name, x),
+                        self._variable_path + (str(x),),
+                        self._schema_path + ('items', str(x)),
                     )
                 if 'default' in item_definition:
                     self.l('else: {variable}.append({})', repr(item_definition['default']))
 
             if 'additionalItems' in self._definition:
                 if self._definition['additionalItems'] is False:
-                    self.l('if {variable}_len > {}: raise JsonSchemaException("{name} must contain only spcified items")', len(self._definition['items']))
+                    with self.l('if {variable}_len > {}:', len(self._definition['items'])):
+                        self.exc('must contain only spcified items', rule='additionalItems')
                 else:
-                    with self.l('for {variable}_x, {variable}_item in enumerate({variable}[{0}:], {0}):', len(self._definition['items'])):
+                    with self.loop('for {variable}_x, {variable}_item in enumerate({variable}[{0}:], {0}):', len(self._definition['items'])):
+                        self.generate_loop_step()
                         self.generate_func_code_block(
                             self._definition['additionalItems'],
                             '{}_item'.format(self._variable),
-                            '{}[{{{}_x}}]'.format(self._variable_name, self._variable),
+                            self._variable_path + ('{}_x'.format(self._variable),),
+                            self._schema_path + ('additionalItems',),
                         )
+        elif self.is_vectorizable(self._definition['items']):
+            self.generate_vector_items()
         else:
-            with self.l('for {variable}_x, {variable}_item in enumerate({variable}):'):
+            with self.loop('for {variable}_x, {variable}_item in enumerate({variable}):'):
+                self.generate_loop_step()
                 self.generate_func_code_block(
                     self._definition['items'],
                     '{}_item'.format(self._variable),
-                    '{}[{{{}_x}}]'.format(self._variable_name, self._variable),
+                    self._variable_path + ('{}_x'.format(self._variable),),
+                    self._schema_path + ('items',),
                 )
 
+    def is_vectorizable(self, definition):
+        """
+        Returns whether items of ``definition`` are checked by :any:`generate_vector_items`.
+        It's switched off by ``vectorize=False``, so code does not depend on
+        :any:`fastjsonschema.vector`.
+        """
+        return self._vectorize and is_vectorizable(definition)
+
+    @contextmanager
+    def loop(self, line, *args):
+        """
+        Creates loop over items which is left out when nothing is generated
+        in it, for example for items definition ``{}`` which can be created
+        by optimizer from ``{'anyOf': [{}, ...]}``.
+        """
+        code_length = len(self._code)
+        with self.l(line, *args):
+            yield
+        if len(self._code) == code_length + 1:
+            del self._code[code_length:]
+
+    def generate_vector_items(self):
+        """
+        Items of NumPy arrays, ``array.array`` and ``memoryview`` are checked
+        at once by :any:`vector_candidates` and only possibly invalid items are
+        checked by the same code as items of lists.
+        """
+        self._vector = True
+        items = self._definition['items']
+        candidates = 'vector_candidates({}, {})'.format(
+            self._variable,
+            ', '.join(repr(argument) for argument in get_vector_arguments(items)),
+        )
+        item_variable = '{}_item'.format(self._variable)
+        item_path = self._variable_path + ('{}_x'.format(self._variable),)
+        for condition, items_code in (
+            ('if isinstance({variable}, vector_types):', candidates),
+            ('else:', 'enumerate({})'.format(self._variable)),
+        ):
+            with self.l(condition):
+                with self.l('for {variable}_x, {variable}_item in {}:', items_code):
+                    self.generate_loop_step()
+                    self.generate_func_code_block(items, item_variable, item_path, self._schema_path + ('items',))
+
     def generate_min_properties(self):
         self.create_variable_with_length()
         with self.l('if {variable}_len < {minProperties}:'):
-            self.l('raise JsonSchemaException("{name} must contain at least {minProperties} properties")')
+            self.exc('must contain at least {minProperties} properties')
 
     def generate_max_properties(self):
         self.create_variable_with_length()
         with self.l('if {variable}_len > {maxProperties}:'):
-            self.l('raise JsonSchemaException("{name} must contain less than or equal to {maxProperties} properties")')
+            self.exc('must contain less than or equal to {maxProperties} properties')
 
     def generate_required(self):
         self.create_variable_with_length()
         with self.l('if not all(prop in {variable} for prop in {required}):'):
-            self.l('raise JsonSchemaException("{name} must contain {required} properties")')
+            self.exc('must contain {required} properties')
+
+    @contextmanager
+    def type_guard(self):
+        """
+        In errors mode validation continues after failed keyword, so keyword
+        of :any:`KEYWORD_TYPES` is checked only when it can be evaluated for
+        the value. Otherwise for example ``minLength`` would raise ``TypeError``
+        for number which is already reported as invalid by ``not``. Other modes
+        stop at first error, so code is the same as without guard.
+        """
+        json_types = self.KEYWORD_TYPES.get(self._keyword)
+        types = enforce_list(self._definition.get('type', []))
+        if self._mode != 'errors' or json_types is None or (types and all(
+            json_type in json_types or (json_type == 'integer' and 'number' in json_types)
+            for json_type in types
+        )):
+            yield
+            return
+        python_types = ', '.join(self.JSON_TYPE_TO_PYTHON_TYPE[json_type] for json_type in json_types)
+        if 'array' in json_types and self.is_vectorizable(self._definition.get('items')):
+            python_types += ', *vector_types'
+        variables = set(self._variables)
+        code_length = len(self._code)
+        with self.l('if isinstance({variable}, ({})):', python_types):
+            yield
+        if len(self._code) == code_length + 1:
+            # Keyword generated nothing, so there is nothing to guard.
+            del self._code[code_length:]
+        # Variables created in the block do not have to exist after it.
+        self._variables = variables
+
+    @contextmanager
+    def dict_guard(self):
+        """
+        Keywords for objects are ignored for other values. Checking of type
+        is not needed when definition allows only objects, because invalid
+        type stops validation (or skips other rules in errors mode).
+        """
+        if enforce_list(self._definition.get('type', [])) == ['object']:
+            yield
+            return
+        variables = set(self._variables)
+        with self.l('if isinstance({variable}, dict):'):
+            code_length = len(self._code)
+            yield
+            if len(self._code) == code_length:
+                self.l('pass')
+        # Variables created in the block do not have to exist after it.
+        self._variables = variables
 
     def generate_properties(self):
-        self.l('{variable}_keys = set({variable}.keys())')
-        for key, prop_definition in self._definition['properties'].items():
-            with self.l('if "{}" in {variable}_keys:', key):
-                self.l('{variable}_keys.remove("{}")', key)
-                self.l('{variable}_{0} = {variable}["{0}"]', key)
-                self.generate_func_code_block(
-                    prop_definition,
-                    '{}_{}'.format(self._variable, key),
-                    '{}.{}'.format(self._variable_name, key),
-                )
-            if 'default' in prop_definition:
-                self.l('else: {variable}["{}"] = {}', key, repr(prop_definition['default']))
+        """
+        Variables of properties are named by their order, not by their keys,
+        because key can contain anything.
 
-        if 'additionalProperties' in self._definition:
-            if self._definition['additionalProperties'] is False:
-                self.l('if {variable}_keys: raise JsonSchemaException("{name} must contain only spcified properties")')
-            else:
-                with self.l('for {variable}_key in {variable}_keys:'):
-                    self.l('{variable}_value = {variable}.get({variable}_key)')
+        .. code-block:: python
+
+            {
+                'properties': {
+                    'key': {'type': 'number'},
+                    'it\'s "key"': {'type': 'string'},
+                },
+            }
+        """
+        with self.dict_guard():
+            for index, (key, prop_definition) in enumerate(self._definition['properties'].items()):
+                prop_variable = '{}__{}'.format(self._variable, index)
+                with self.l('if {!r} in {variable}:', key):
+                    self.l('{} = {variable}[{!r}]', prop_variable, key)
                     self.generate_func_code_block(
-                        self._definition['additionalProperties'],
-                        '{}_value'.format(self._variable),
-                        '{}.{{{}_key}}'.format(self._variable_name, self._variable),
+                        prop_definition,
+                        prop_variable,
+                        self._variable_path + (repr(key),),
+                        self._schema_path + ('properties', key),
                     )
+                if 'default' in prop_definition:
+                    self.l('else: {variable}[{!r}] = {}', key, repr(prop_definition['default']))
+
+    def generate_pattern_properties(self):
+        """
+        Every key is matched against all patterns (by ``search``, so pattern
+        can match anywhere in the key) and its value has to be valid by
+        definitions of all matching patterns.
+
+        .. code-block:: python
+
+            {
+                'patternProperties': {
+                    '^metric_': {'type': 'number'},
+                    '_id$': {'type': 'string'},
+                },
+            }
+
+        Keys are matched by function returning bit mask of matching patterns,
+        see :any:`generate_pattern_function`.
+        """
+        pattern_properties = self._definition['patternProperties']
+        if not pattern_properties:
+            return
+        function_name = self.get_pattern_function_name()
+        with self.dict_guard():
+            with self.l('for {variable}_key, {variable}_value in {variable}.items():'):
+                self.generate_loop_step()
+                self.l('{variable}_mask = {}({variable}_key)', function_name)
+                with self.l('if {variable}_mask:'):
+                    for index, (pattern, prop_definition) in enumerate(pattern_properties.items()):
+                        variables = set(self._variables)
+                        with self.l('if {variable}_mask & {}:', 1 << index):
+                            code_length = len(self._code)
+                            self.generate_func_code_block(
+                                prop_definition,
+                                '{}_value'.format(self._variable),
+                                self._variable_path + ('{}_key'.format(self._variable),),
+                                self._schema_path + ('patternProperties', pattern),
+                            )
+                            if len(self._code) == code_length:
+                                self.l('pass')
+                        # Variables created in the block do not have to exist after it.
+                        self._variables = variables
+
+    def generate_additional_properties(self):
+        """
+        Additional properties are those which are not in ``properties`` nor
+        match any pattern of ``patternProperties``.
+
+        .. code-block:: python
+
+            {
+                'properties': {'a': {'type': 'number'}},
+                'additionalProperties': {'type': 'string'},
+            }
+        """
+        additional_properties = self._definition['additionalProperties']
+        if additional_properties is True or additional_properties == {}:
+            return
+        # Conditions when key is not additional.
+        known = []
+        properties = self._definition.get('properties', {})
+        if properties:
+            keys_name = self.get_constant_name(frozenset(properties), 'keys', key=('keys', id(properties)))
+            known.append('{{variable}}_key in {}'.format(keys_name))
+        if self._definition.get('patternProperties'):
+            known.append('{}({{variable}}_key)'.format(self.get_pattern_function_name()))
+
+        with self.dict_guard():
+            if additional_properties is False:
+                if len(known) == 1 and properties:
+                    condition = 'not {}.issuperset({{variable}})'.format(keys_name)
+                elif known:
+                    condition = 'any(not ({}) for {{variable}}_key in {{variable}})'.format(' or '.join(known))
+                else:
+                    condition = '{variable}'
+                with self.l('if {}:'.format(condition)):
+                    self.exc('must contain only spcified properties')
+                return
+            variables = set(self._variables)
+            with self.l('for {variable}_key, {variable}_value in {variable}.items():'):
+                self.generate_loop_step()
+                if known:
+                    self.l('if {}: continue'.format(' or '.join(known)))
+                code_length = len(self._code)
+                self.generate_func_code_block(
+                    additional_properties,
+                    '{}_value'.format(self._variable),
+                    self._variable_path + ('{}_key'.format(self._variable),),
+                    self._schema_path + ('additionalProperties',),
+                )
+                if len(self._code) == code_length:
+                    self.l('pass')
+            # Variables created in the loop belong to the last item only.
+            self._variables = variables
+
+    def get_pattern_function_name(self):
+        patterns = tuple(self._definition['patternProperties'])
+        name = self._pattern_functions.get(patterns)
+        if name is None:
+            name = '{}_pattern_mask_{}'.format(self._name, len(self._pattern_functions))
+            self._pattern_functions[patterns] = name
+        return name
+
+    def generate_pattern_function(self, name, patterns):
+        """
+        Creates function returning bit mask of ``patterns`` which match key.
+        Patterns which are only literal prefix (like ``^metric_``) are checked
+        by ``str.startswith``, others by their regular expression. Keys which
+        do not match any pattern are rejected by one search of all patterns
+        combined into one regular expression. Results are remembered for
+        :any:`PATTERN_MEMO_SIZE` keys, because objects usually have the same
+        keys again and again.
+        """
+        checks = []
+        for index, pattern in enumerate(patterns):
+            prefix = literal_prefix(pattern)
+            if prefix is not None:
+                checks.append(('key.startswith({!r})'.format(prefix), 1 << index))
+            else:
+                checks.append(('{}.search(key)'.format(self.get_regexp_name(pattern)), 1 << index))
+        combined = combine_patterns(patterns) if len(patterns) > 1 else None
+
+        self.l('')
+        self.l('')
+        self.l('{}_memo = {{}}', name)
+        self.l('')
+        self.l('')
+        with self.l('def {}(key):', name):
+            self.l('mask = {}_memo.get(key)', name)
+            with self.l('if mask is None:'):
+                self.l('mask = 0')
+                if combined:
+                    with self.l('if {}.search(key):', self.get_regexp_name(combined.pattern)):
+                        self.generate_pattern_checks(checks)
+                else:
+                    self.generate_pattern_checks(checks)
+                with self.l('if len({}_memo) < {}:', name, self.PATTERN_MEMO_SIZE):
+                    self.l('{}_memo[key] = mask', name)
+            self.l('return mask')
+
+    def generate_pattern_checks(self, checks):
+        for check, bit in checks:
+            with self.l('if {}:', check):
+                self.l('mask |= {}', bit)
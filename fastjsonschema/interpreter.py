@@ -0,0 +1,331 @@
+"""
+Generating and compiling code takes much more time than validation itself, so
+for definitions used only few times it doesn't pay off. :any:`Interpreter`
+validates data by walking the definition directly, with the same keywords
+and the same errors as generated code. Validator created by
+``compile(definition, tiered=True)`` starts with interpreter and switches to
+generated code once it's called often enough, see :any:`tiered_validator`.
+"""
+
+from collections import OrderedDict
+from copy import deepcopy
+import threading
+
+from .exceptions import JsonSchemaDefinitionException, JsonSchemaException
+from .generator import CodeGenerator, canonical, enforce_list, resolve_ref
+from .patterns import intern_regexp
+from .vector import get_vector_arguments, is_vectorizable, vector_candidates, vector_types
+
+
+# Number of calls after which tiered validator generates code.
+PROMOTE_AFTER = 100
+
+JSON_TYPE_TO_PYTHON_TYPES = {
+    'null': (type(None),),
+    'boolean': (bool,),
+    'number': (int, float),
+    'integer': (int,),
+    'string': (str,),
+    'array': (list,),
+    'object': (dict,),
+}
+
+_BOOL_KEYS = (object(), object())
+
+
+def unique_key(value):
+    """
+    Returns hashable form of ``value`` where booleans are not equal to numbers,
+    the same as generated ``{name}_unique_key``.
+    """
+    if value is True or value is False:
+        return _BOOL_KEYS[value]
+    if isinstance(value, list):
+        return tuple(map(unique_key, value))
+    if isinstance(value, dict):
+        return frozenset(zip(value, map(unique_key, value.values())))
+    return value
+
+
+def is_unique(value):
+    try:
+        if len(set(value)) == len(value):
+            return True
+    except TypeError:
+        pass
+    return len(set(map(unique_key, value))) == len(value)
+
+
+class Interpreter:
+    """
+    Validation function which interprets ``definition`` on every call instead
+    of generating code. It's much slower than generated code, but it's ready
+    immediately. Only ``mode`` ``exception`` and ``bool`` are supported.
+
+    .. code-block:: python
+
+        validate = Interpreter({'type': 'string'})
+        validate('hello')
+
+    Keywords are validated in order of :any:`CodeGenerator.KEYWORDS` by methods
+    ``validate_<name>``.
+    """
+
+    def __init__(self, definition, mode='exception'):
+        if mode not in ('exception', 'bool'):
+            raise JsonSchemaDefinitionException('Interpreter does not support mode {}'.format(mode))
+        self._root_definition = definition
+        self._mode = mode
+        self._keywords = OrderedDict(
+            (keyword, getattr(self, 'validate_' + name)) for keyword, name in CodeGenerator.KEYWORDS
+        )
+        # Values computed from definition are cached by id of its part.
+        self._refs = {}
+        self._funcs = {}
+        self._types = {}
+        self._enums = {}
+
+    def __call__(self, data):
+        if self._mode == 'bool':
+            return self.is_valid(data, self._root_definition, ('data',))
+        return self.validate(data, self._root_definition, ('data',))
+
+    def validate(self, value, definition, path):
+        """
+        Validates ``value`` on ``path`` by ``definition`` and returns it.
+        """
+        funcs = self._funcs.get(id(definition))
+        if funcs is None:
+            funcs = self._funcs[id(definition)] = self._get_funcs(definition)
+        for func in funcs:
+            func(value, definition, path)
+        return value
+
+    def _get_funcs(self, definition):
+        if '$ref' in definition:
+            # All other properties in a "$ref" object must be ignored.
+            uri = definition['$ref']
+            return [lambda value, definition, path: self.validate(value, self.resolve_ref(uri), path)]
+        return [func for keyword, func in self._keywords.items() if keyword in definition]
+
+    def is_valid(self, value, definition, path):
+        try:
+            self.validate(value, definition, path)
+        except JsonSchemaDefinitionException:
+            raise
+        except JsonSchemaException:
+            return False
+        return True
+
+    def resolve_ref(self, uri):
+        definition = self._refs.get(uri)
+        if definition is None:
+            definition = self._refs[uri] = resolve_ref(self._root_definition, uri)
+        return definition
+
+    def exc(self, value, path, definition, rule, msg, *args):
+        raise JsonSchemaException(None, value, path, definition, rule, msg.format(*args, **definition))
+
+    def validate_type(self, value, definition, path):
+        python_types, exclude_bool = self._types.get(id(definition)) or self._get_types(definition)
+        if not isinstance(value, python_types) or (exclude_bool and isinstance(value, bool)):
+            self.exc(value, path, definition, 'type', 'must be {}', ' or '.join(enforce_list(definition['type'])))
+
+    def _get_types(self, definition):
+        types = enforce_list(definition['type'])
+        python_types = ()
+        for json_type in types:
+            if json_type not in JSON_TYPE_TO_PYTHON_TYPES:
+                raise JsonSchemaDefinitionException('Unknown type {}'.format(json_type))
+            python_types += JSON_TYPE_TO_PYTHON_TYPES[json_type]
+        if 'array' in types and is_vectorizable(definition.get('items')):
+            python_types += vector_types
+        exclude_bool = ('number' in types or 'integer' in types) and 'boolean' not in types
+        self._types[id(definition)] = python_types, exclude_bool
+        return python_types, exclude_bool
+
+    def validate_enum(self, value, definition, path):
+        enum = definition['enum']
+        if len(enum) == 1:
+            valid = not value != enum[0]
+        elif any(isinstance(item, (list, dict)) for item in enum):
+            valid = canonical(value) in self._get_enum(enum, canonical)
+        else:
+            valid = not isinstance(value, (list, dict)) and value in self._get_enum(enum, None)
+        if not valid:
+            self.exc(value, path, definition, 'enum', 'must be one of {enum}')
+
+    def _get_enum(self, enum, func):
+        values = self._enums.get(id(enum))
+        if values is None:
+            values = self._enums[id(enum)] = frozenset(map(func, enum) if func else enum)
+        return values
+
+    def validate_all_of(self, value, definition, path):
+        for item in definition['allOf']:
+            self.validate(value, item, path)
+
+    def validate_any_of(self, value, definition, path):
+        if not any(self.is_valid(value, item, path) for item in definition['anyOf']):
+            self.exc(value, path, definition, 'anyOf', 'must be valid by one of anyOf definition')
+
+    def validate_one_of(self, value, definition, path):
+        count = 0
+        for item in definition['oneOf']:
+            if self.is_valid(value, item, path):
+                count += 1
+                if count > 1:
+                    break
+        if count != 1:
+            self.exc(value, path, definition, 'oneOf', 'must be valid exactly by one of oneOf definition')
+
+    def validate_not(self, value, definition, path):
+        if self.is_valid(value, definition['not'], path):
+            self.exc(value, path, definition, 'not', 'must not be valid by not definition')
+
+    def validate_min_length(self, value, definition, path):
+        if len(value) < definition['minLength']:
+            self.exc(value, path, definition, 'minLength', 'must be longer than or equal to {minLength} characters')
+
+    def validate_max_length(self, value, definition, path):
+        if len(value) > definition['maxLength']:
+            self.exc(value, path, definition, 'maxLength', 'must be shorter than or equal to {maxLength} characters')
+
+    def validate_pattern(self, value, definition, path):
+        if not intern_regexp(definition['pattern']).match(value):
+            self.exc(value, path, definition, 'pattern', 'must match pattern {pattern}')
+
+    def validate_minimum(self, value, definition, path):
+        if definition.get('exclusiveMinimum', False):
+            if value <= definition['minimum']:
+                self.exc(value, path, definition, 'minimum', 'must be bigger than {minimum}')
+        elif value < definition['minimum']:
+            self.exc(value, path, definition, 'minimum', 'must be bigger than or equal to {minimum}')
+
+    def validate_maximum(self, value, definition, path):
+        if definition.get('exclusiveMaximum', False):
+            if value >= definition['maximum']:
+                self.exc(value, path, definition, 'maximum', 'must be smaller than {maximum}')
+        elif value > definition['maximum']:
+            self.exc(value, path, definition, 'maximum', 'must be smaller than or equal to {maximum}')
+
+    def validate_multiple_of(self, value, definition, path):
+        if value % definition['multipleOf'] != 0:
+            self.exc(value, path, definition, 'multipleOf', 'must be multiple of {multipleOf}')
+
+    def validate_min_items(self, value, definition, path):
+        if len(value) < definition['minItems']:
+            self.exc(value, path, definition, 'minItems', 'must contain at least {minItems} items')
+
+    def validate_max_items(self, value, definition, path):
+        if len(value) > definition['maxItems']:
+            self.exc(value, path, definition, 'maxItems', 'must contain less than or equal to {maxItems} items')
+
+    def validate_unique_items(self, value, definition, path):
+        if definition['uniqueItems'] and len(value) > 1 and not is_unique(value):
+            self.exc(value, path, definition, 'uniqueItems', 'must contain unique items')
+
+    def validate_items(self, value, definition, path):
+        items = definition['items']
+        length = len(value)
+        if isinstance(items, list):
+            for index, item_definition in enumerate(items):
+                if length > index:
+                    self.validate(value[index], item_definition, path + (index,))
+                elif 'default' in item_definition:
+                    value.append(deepcopy(item_definition['default']))
+            if 'additionalItems' in definition:
+                if definition['additionalItems'] is False:
+                    if length > len(items):
+                        self.exc(value, path, definition, 'additionalItems', 'must contain only spcified items')
+                else:
+                    for index in range(len(items), length):
+                        self.validate(value[index], definition['additionalItems'], path + (index,))
+        else:
+            if isinstance(value, vector_types) and is_vectorizable(items):
+                candidates = vector_candidates(value, *get_vector_arguments(items))
+            else:
+                candidates = enumerate(value)
+            for index, item in candidates:
+                self.validate(item, items, path + (index,))
+
+    def validate_min_properties(self, value, definition, path):
+        if len(value) < definition['minProperties']:
+            self.exc(value, path, definition, 'minProperties', 'must contain at least {minProperties} properties')
+
+    def validate_max_properties(self, value, definition, path):
+        if len(value) > definition['maxProperties']:
+            self.exc(value, path, definition, 'maxProperties', 'must contain less than or equal to {maxProperties} properties')
+
+    def validate_required(self, value, definition, path):
+        if not all(prop in value for prop in definition['required']):
+            self.exc(value, path, definition, 'required', 'must contain {required} properties')
+
+    def validate_properties(self, value, definition, path):
+        if not isinstance(value, dict):
+            return
+        for key, prop_definition in definition['properties'].items():
+            if key in value:
+                self.validate(value[key], prop_definition, path + (key,))
+            elif 'default' in prop_definition:
+                value[key] = deepcopy(prop_definition['default'])
+
+    def validate_pattern_properties(self, value, definition, path):
+        if not isinstance(value, dict):
+            return
+        pattern_properties = definition['patternProperties']
+        for key, item in value.items():
+            for pattern, prop_definition in pattern_properties.items():
+                if intern_regexp(pattern).search(key):
+                    self.validate(item, prop_definition, path + (key,))
+
+    def validate_additional_properties(self, value, definition, path):
+        additional_properties = definition['additionalProperties']
+        if not isinstance(value, dict) or additional_properties is True or additional_properties == {}:
+            return
+        properties = definition.get('properties', {})
+        patterns = [intern_regexp(pattern) for pattern in definition.get('patternProperties', {})]
+        for key, item in value.items():
+            if key in properties or any(regexp.search(key) for regexp in patterns):
+                continue
+            if additional_properties is False:
+                self.exc(value, path, definition, 'additionalProperties', 'must contain only spcified properties')
+            self.validate(item, additional_properties, path + (key,))
+
+
+def tiered_validator(interpreter, factory, promote_after=PROMOTE_AFTER):
+    """
+    Returns validation function which uses ``interpreter`` for the first
+    ``promote_after`` calls. Then it's promoted: validation function is
+    compiled by ``factory`` (under lock, so only once) and used since then.
+    Attribute ``compiled`` says whether it's already promoted.
+
+    .. code-block:: python
+
+        validate = fastjsonschema.compile(definition, tiered=True)
+    """
+    lock = threading.Lock()
+    func = None
+    calls = 0
+
+    def promote():
+        nonlocal factory, func
+        with lock:
+            if func is None:
+                func = factory()
+                factory = None
+                validate.compiled = True
+
+    def validate(data):
+        nonlocal calls
+        if func is not None:
+            return func(data)
+        # Counter is not exact with more threads, it's not important.
+        calls += 1
+        if calls <= promote_after:
+            return interpreter(data)
+        promote()
+        return func(data)
+
+    validate.compiled = False
+    return validate
@@ -0,0 +1,49 @@
+"""
+Applications often compile a lot of definitions when they start (for example
+when modules are imported) but use only some of them. Validators created by
+``compile(definition, lazy=True)`` generate their code only when they are
+called for the first time, see :any:`lazy_validator`.
+"""
+
+import threading
+
+
+def lazy_validator(factory):
+    """
+    Returns validation function which is compiled by ``factory`` on the first
+    call. Use ``compile(definition, lazy=True)`` to create it.
+
+    .. code-block:: python
+
+        validate = fastjsonschema.compile(definition, lazy=True)  # Nothing is generated yet.
+        validate(data)  # Code is generated and executed now.
+        assert validate.compiled
+
+    When more threads call it at the same time, code is generated only once
+    and others wait for it. When it fails (for example when ``definition`` is
+    not valid), exception is raised and the next call tries it again.
+
+    It's closure, not object with ``__call__``, because calling of closure is
+    much faster.
+    """
+    lock = threading.Lock()
+    func = None
+
+    def compile_func():
+        nonlocal factory, func
+        with lock:
+            if func is None:
+                func = factory()
+                # Definition is not needed anymore.
+                factory = None
+                validate.compiled = True
+
+    def validate(data, **kwds):
+        if func is None:
+            compile_func()
+        if kwds:
+            return func(data, **kwds)
+        return func(data)
+
+    validate.compiled = False
+    return validate
@@ -0,0 +1,132 @@
+"""
+Validation of newline-delimited JSON files (one JSON document per line). File
+is memory-mapped and split into line-aligned chunks which are validated in
+worker processes.
+
+.. code-block:: bash
+
+    $ python -m fastjsonschema validate schema.json data.ndjson --jobs 8
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import json
+import mmap
+import os
+import time
+
+from .generator import CodeGenerator
+from .parallel import _init_worker, _validate_chunk
+
+
+# Lines of one range are parsed and validated in batches of this size, so
+# worker does not hold whole range (can be hundreds of MB) as Python objects.
+BATCH_LINES = 10000
+
+NdjsonReport = namedtuple('NdjsonReport', ('records', 'invalid', 'errors', 'size', 'seconds'))
+NdjsonReport.__doc__ = """
+Result of :any:`validate_ndjson`. Contains number of validated ``records``,
+number of ``invalid`` records, list of ``(line_number, message)`` tuples in
+``errors``, ``size`` of file in bytes and duration in ``seconds``.
+"""
+
+
+def validate_ndjson(definition, path, jobs=None, chunks_per_job=4, max_errors=None):
+    """
+    Validates every line of file ``path`` by ``definition`` in ``jobs`` processes
+    (all CPUs by default) and returns :any:`NdjsonReport`. Empty lines are
+    skipped, lines which are not valid JSON are reported as invalid. Line
+    numbers start with 1. Number of reported errors can be limited by
+    ``max_errors``.
+    """
+    start = time.perf_counter()
+    jobs = jobs or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    ranges = split_lines(path, size, jobs * chunks_per_job)
+
+    code_generator = CodeGenerator(definition, batch=True)
+    initargs = (code_generator.func_code, code_generator.serializable_state)
+    if jobs == 1 or len(ranges) <= 1:
+        _init_worker(*initargs)
+        results = [_validate_range(path, range_start, range_end, max_errors) for range_start, range_end in ranges]
+    else:
+        starts, ends = zip(*ranges)
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as executor:
+            results = list(executor.map(
+                _validate_range,
+                itertools.repeat(path),
+                starts,
+                ends,
+                itertools.repeat(max_errors),
+            ))
+
+    records = invalid = lines = 0
+    errors = []
+    for range_lines, range_records, range_invalid, range_errors in results:
+        for line_number, message in range_errors:
+            if max_errors is None or len(errors) < max_errors:
+                errors.append((lines + line_number, message))
+        lines += range_lines
+        records += range_records
+        invalid += range_invalid
+    return NdjsonReport(records, invalid, errors, size, time.perf_counter() - start)
+
+
+def split_lines(path, size, count):
+    """
+    Returns list of ``(start, end)`` byte offsets splitting file into at most
+    ``count`` parts of similar size. Every part ends at the end of line.
+    """
+    if not size:
+        return []
+    ranges = []
+    with open(path, 'rb') as ndjson_file, mmap.mmap(ndjson_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        for part in range(1, count + 1):
+            end = data.find(b'\n', max(start, size * part // count - 1))
+            end = size if end == -1 else end + 1
+            if end > start:
+                ranges.append((start, end))
+                start = end
+            if start >= size:
+                break
+    return ranges
+
+
+def _validate_range(path, start, end, max_errors, batch_lines=BATCH_LINES):
+    lines = records_count = invalid_count = 0
+    records = []
+    line_numbers = []
+    errors = []
+
+    def validate_batch():
+        nonlocal records_count, invalid_count
+        _, invalid, validation_errors = _validate_chunk(records, max_errors)
+        errors.extend((line_numbers[index], exc.message) for index, exc in validation_errors)
+        errors.sort()
+        if max_errors is not None:
+            del errors[max_errors:]
+        records_count += len(records)
+        invalid_count += len(invalid)
+        del records[:], line_numbers[:]
+
+    with open(path, 'rb') as ndjson_file, mmap.mmap(ndjson_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        data.seek(start)
+        while data.tell() < end:
+            line = data.readline()
+            lines += 1
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError as exc:
+                records_count += 1
+                invalid_count += 1
+                errors.append((lines, 'invalid JSON: {}'.format(exc)))
+            else:
+                line_numbers.append(lines)
+                if len(records) >= batch_lines:
+                    validate_batch()
+    validate_batch()
+    return lines, records_count, invalid_count, errors
@@ -0,0 +1,320 @@
+"""
+Optimizer transforms definition before code is generated, so generated code
+does less work. It's switched off by default. Pass ``optimize=True`` to use
+all passes or list of names of passes to use only some of them:
+
+.. code-block:: python
+
+    validate = fastjsonschema.compile(definition, optimize=True)
+    validate = fastjsonschema.compile(definition, optimize=['merge_all_of', 'fuse_ranges'])
+
+Passes:
+
+ * ``drop_implied_types`` - ``type`` in definitions of ``allOf`` is not checked
+   again when parent definition already checked it.
+ * ``merge_all_of`` - nested ``allOf`` are flattened and its definitions are
+   merged into parent when they do not use the same keywords and do not
+   contain any ``default``.
+ * ``remove_dead_branches`` - branches of ``anyOf`` and ``oneOf`` which can't
+   be valid because of ``type`` of parent definition are removed. ``anyOf``
+   with branch valid for anything is removed completely.
+ * ``share_subschemas`` - the same big definition used on more places is
+   generated only once as function (the same way as ``$ref``).
+ * ``fuse_ranges`` - ``minimum`` and ``maximum`` are checked by one chained
+   comparison. This pass is done by :any:`CodeGenerator` itself.
+
+Note that when value is invalid by more rules, message can be different with
+optimizations, because rules can be checked in different order.
+"""
+
+from collections import OrderedDict
+import json
+from urllib.parse import quote, unquote
+
+from .exceptions import JsonSchemaDefinitionException
+
+
+# Keywords with one definition, with list of definitions (or one) and with
+# dictionary of definitions.
+SUBSCHEMA_KEYWORDS = ('items', 'additionalItems', 'additionalProperties', 'not')
+SUBSCHEMA_LIST_KEYWORDS = ('items', 'allOf', 'anyOf', 'oneOf')
+SUBSCHEMA_DICT_KEYWORDS = ('properties', 'patternProperties', 'definitions')
+
+# Keywords which have to stay together in one definition.
+KEYWORD_GROUPS = {
+    'exclusiveMinimum': 'minimum',
+    'exclusiveMaximum': 'maximum',
+    'additionalItems': 'items',
+    'patternProperties': 'properties',
+    'additionalProperties': 'properties',
+}
+
+# Smaller definitions are faster inlined than called as function.
+SHARE_MIN_KEYWORDS = 5
+
+
+def get_types(definition):
+    types = definition['type']
+    if isinstance(types, list):
+        return types
+    return [types]
+
+
+def map_subschemas(definition, func, pointer, pinned):
+    """
+    Returns copy of ``definition`` with all its direct subschemas (for example
+    definitions of ``properties``) transformed by ``func``. It's called with
+    subschema, its JSON pointer as tuple and ``pinned``. Definition is copied
+    only when something is changed.
+    """
+    changes = {}
+    for key, value in definition.items():
+        key_pointer = pointer + (key,)
+        if key in SUBSCHEMA_LIST_KEYWORDS and isinstance(value, list):
+            new_value = [
+                func(item, key_pointer + (str(index),), pinned) if isinstance(item, dict) else item
+                for index, item in enumerate(value)
+            ]
+            changed = any(new_item is not item for new_item, item in zip(new_value, value))
+        elif key in SUBSCHEMA_DICT_KEYWORDS and isinstance(value, dict):
+            new_value = OrderedDict(
+                (name, func(item, key_pointer + (name,), pinned) if isinstance(item, dict) else item)
+                for name, item in value.items()
+            )
+            changed = any(new_value[name] is not item for name, item in value.items())
+        elif key in SUBSCHEMA_KEYWORDS and isinstance(value, dict):
+            new_value = func(value, key_pointer, pinned)
+            changed = new_value is not value
+        else:
+            continue
+        if changed:
+            changes[key] = new_value
+    if not changes:
+        return definition
+    return OrderedDict((key, changes.get(key, value)) for key, value in definition.items())
+
+
+def types_accept(types, other_types):
+    """
+    Returns whether every value of JSON ``types`` is also of ``other_types``.
+    """
+    return all(
+        json_type in other_types or (json_type == 'integer' and 'number' in other_types)
+        for json_type in types
+    )
+
+
+def types_overlap(types, other_types):
+    """
+    Returns whether there can be value of both JSON ``types`` and ``other_types``.
+    """
+    return any(
+        json_type in other_types
+        or (json_type == 'integer' and 'number' in other_types)
+        or (json_type == 'number' and 'integer' in other_types)
+        for json_type in types
+    )
+
+
+def drop_implied_types(definition, pointer=(), pinned=frozenset()):
+    definition = map_subschemas(definition, drop_implied_types, pointer, pinned)
+    if 'type' not in definition or '$ref' in definition or not isinstance(definition.get('allOf'), list):
+        return definition
+    if pointer + ('allOf',) in pinned:
+        return definition
+    types = get_types(definition)
+    all_of = [
+        OrderedDict((key, value) for key, value in item.items() if key != 'type')
+        if isinstance(item, dict) and '$ref' not in item and 'type' in item and types_accept(types, get_types(item))
+        else item
+        for item in definition['allOf']
+    ]
+    if all(new_item is item for new_item, item in zip(all_of, definition['allOf'])):
+        return definition
+    return OrderedDict(definition, allOf=all_of)
+
+
+def merge_all_of(definition, pointer=(), pinned=frozenset()):
+    definition = map_subschemas(definition, merge_all_of, pointer, pinned)
+    if '$ref' in definition or not isinstance(definition.get('allOf'), list):
+        return definition
+    if pointer + ('allOf',) in pinned:
+        return definition
+    # Defaults change data, so keywords checked before or after them can't
+    # be moved into parent which checks keywords in different order.
+    if _contains_default(definition['allOf']):
+        return definition
+    result = OrderedDict((key, value) for key, value in definition.items() if key != 'allOf')
+    rest = []
+    for item in _flatten_all_of(definition['allOf']):
+        if not isinstance(item, dict) or '$ref' in item:
+            rest.append(item)
+            continue
+        groups = OrderedDict()
+        for key, value in item.items():
+            groups.setdefault(KEYWORD_GROUPS.get(key, key), OrderedDict())[key] = value
+        item_rest = OrderedDict()
+        for group_name, group in groups.items():
+            # Keywords of one group change meaning of each other, so group
+            # can't be merged when parent has any keyword of it.
+            if any(KEYWORD_GROUPS.get(key, key) == group_name for key in result):
+                item_rest.update(group)
+            else:
+                result.update(group)
+        if item_rest:
+            rest.append(item_rest)
+    if rest:
+        result['allOf'] = rest
+    return result
+
+
+def _contains_default(value):
+    if isinstance(value, dict):
+        return 'default' in value or any(_contains_default(item) for item in value.values())
+    if isinstance(value, list):
+        return any(_contains_default(item) for item in value)
+    return False
+
+
+def _flatten_all_of(items):
+    for item in items:
+        if isinstance(item, dict) and '$ref' not in item and isinstance(item.get('allOf'), list):
+            rest = OrderedDict((key, value) for key, value in item.items() if key != 'allOf')
+            if rest:
+                yield rest
+            yield from _flatten_all_of(item['allOf'])
+        else:
+            yield item
+
+
+def remove_dead_branches(definition, pointer=(), pinned=frozenset()):
+    definition = map_subschemas(definition, remove_dead_branches, pointer, pinned)
+    if '$ref' in definition:
+        return definition
+    changes = {}
+    if 'type' in definition:
+        types = get_types(definition)
+        for key in ('anyOf', 'oneOf'):
+            if isinstance(definition.get(key), list) and pointer + (key,) not in pinned:
+                branches = [branch for branch in definition[key] if _can_be_valid(types, branch)]
+                if len(branches) != len(definition[key]):
+                    changes[key] = branches
+    any_of = changes.get('anyOf', definition.get('anyOf'))
+    if isinstance(any_of, list) and {} in any_of and pointer + ('anyOf',) not in pinned:
+        changes['anyOf'] = None
+    if not changes:
+        return definition
+    return OrderedDict(
+        (key, changes.get(key, value))
+        for key, value in definition.items()
+        if key not in changes or changes[key] is not None
+    )
+
+
+def _can_be_valid(types, branch):
+    if not isinstance(branch, dict) or '$ref' in branch or 'type' not in branch:
+        return True
+    return types_overlap(types, get_types(branch))
+
+
+def json_pointer(pointer):
+    """
+    Returns URI of JSON pointer given as tuple, for example ``#/properties/a~1b``
+    for ``('properties', 'a/b')``.
+    """
+    return '#' + ''.join('/' + quote(part.replace('~', '~0').replace('/', '~1'), safe='') for part in pointer)
+
+
+def share_subschemas(definition, pointer=(), pinned=frozenset()):
+    """
+    Replaces repeated definitions by ``$ref`` to the first one.
+    """
+    seen = {}
+
+    def share(subschema, pointer, pinned):
+        # Keyword default is used only from definition itself, not referenced one.
+        if (
+            subschema is not definition
+            and pointer not in pinned
+            and 'default' not in subschema
+            and _count_keywords(subschema) >= SHARE_MIN_KEYWORDS
+        ):
+            key = json.dumps(subschema, sort_keys=True, default=repr)
+            if key in seen:
+                return OrderedDict([('$ref', seen[key])])
+            seen[key] = json_pointer(pointer)
+        return map_subschemas(subschema, share, pointer, pinned)
+
+    return share(definition, pointer, pinned)
+
+
+def _count_keywords(definition):
+    count = len(definition)
+    for key, value in definition.items():
+        if key in SUBSCHEMA_LIST_KEYWORDS and isinstance(value, list):
+            count += sum(_count_keywords(item) for item in value if isinstance(item, dict))
+        elif key in SUBSCHEMA_DICT_KEYWORDS and isinstance(value, dict):
+            count += sum(_count_keywords(item) for item in value.values() if isinstance(item, dict))
+        elif key in SUBSCHEMA_KEYWORDS and isinstance(value, dict):
+            count += _count_keywords(value)
+    return count
+
+
+def get_pinned(definition):
+    """
+    Returns set of JSON pointers (as tuples) to parts of ``definition`` which
+    are referenced by ``$ref``, including all their parents. Passes must not
+    change structure there, otherwise references would point elsewhere.
+    """
+    pinned = set()
+    stack = [definition]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            uri = value.get('$ref')
+            if isinstance(uri, str) and uri.startswith('#'):
+                parts = tuple(part.replace('~1', '/').replace('~0', '~') for part in unquote(uri[1:]).split('/')[1:])
+                pinned.update(parts[:length] for length in range(1, len(parts) + 1))
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return pinned
+
+
+# Passes done on definition in this order. None is for passes done by generator.
+PASSES = OrderedDict((
+    ('drop_implied_types', drop_implied_types),
+    ('merge_all_of', merge_all_of),
+    ('remove_dead_branches', remove_dead_branches),
+    ('share_subschemas', share_subschemas),
+    ('fuse_ranges', None),
+))
+
+
+def get_passes(optimize):
+    """
+    Returns tuple of names of passes for ``optimize`` parameter (``True`` for
+    all, ``False`` for none or list of names) in order they are done.
+    """
+    if optimize is True:
+        return tuple(PASSES)
+    if not optimize:
+        return ()
+    unknown = set(optimize) - set(PASSES)
+    if unknown:
+        raise JsonSchemaDefinitionException('Unknown optimization {}'.format(', '.join(sorted(unknown))))
+    return tuple(name for name in PASSES if name in optimize)
+
+
+def optimize(definition, passes):
+    """
+    Returns ``definition`` transformed by ``passes``. Passed definition is not
+    changed.
+    """
+    if not isinstance(definition, dict):
+        return definition
+    pinned = get_pinned(definition)
+    for name in passes:
+        if PASSES[name]:
+            definition = PASSES[name](definition, (), pinned)
+    return definition
@@ -0,0 +1,105 @@
+"""
+Validation functions are created by ``exec`` so they can't be passed to other
+processes. :any:`ParallelValidator` generates code once, sends it together
+with serializable global state to worker processes and validates values there.
+"""
+
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import os
+
+from .generator import CodeGenerator
+
+
+_validate_many = None
+
+
+def _init_worker(func_code, serializable_state):
+    global _validate_many
+    global_state = CodeGenerator.restore_global_state(serializable_state)
+    exec(func_code, global_state)
+    _validate_many = global_state['func_many']
+
+
+def _validate_chunk(chunk, max_errors):
+    return _validate_many(chunk, max_errors)
+
+
+class ParallelValidator:
+    """
+    Validates many values in pool of worker processes. Values are sent to
+    workers in chunks of ``chunksize`` values and results are returned in the
+    same order as values were passed. Example:
+
+    .. code-block:: python
+
+        with fastjsonschema.ParallelValidator(definition, processes=4) as validator:
+            valid, invalid, errors = validator.validate_many(records)
+
+    Result is the same as of function created by :any:`compile_batch`. Note that
+    values are validated in other processes, so defaults are set only in the
+    returned valid values, not in passed ones.
+    """
+
+    def __init__(self, definition, processes=None, chunksize=1000):
+        code_generator = CodeGenerator(definition, batch=True)
+        self.processes = processes or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            initializer=_init_worker,
+            initargs=(code_generator.func_code, code_generator.serializable_state),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Shuts down worker processes.
+        """
+        self._executor.shutdown()
+
+    def validate_many(self, items, max_errors=None):
+        """
+        Validates all ``items`` and returns tuple of valid values, ``array`` of
+        indexes of invalid values and list of ``(index, exception)`` tuples
+        limited by ``max_errors``.
+        """
+        valid = []
+        invalid = array('L')
+        errors = []
+        for offset, (chunk_valid, chunk_invalid, chunk_errors) in self.iter_chunks(items, max_errors):
+            valid.extend(chunk_valid)
+            invalid.extend(offset + index for index in chunk_invalid)
+            for index, exc in chunk_errors:
+                if max_errors is None or len(errors) < max_errors:
+                    errors.append((offset + index, exc))
+        return valid, invalid, errors
+
+    def iter_chunks(self, items, max_errors=None):
+        """
+        Yields tuples ``(offset, (valid, invalid, errors))`` for every chunk in
+        order of ``items``. Indexes in the result are relative to the chunk.
+        Only limited number of chunks is sent to workers at once, so ``items``
+        can be also long iterator.
+        """
+        iterator = iter(items)
+        pending = deque()
+        offset = 0
+        while True:
+            while len(pending) < self.processes * 2:
+                chunk = list(itertools.islice(iterator, self.chunksize))
+                if not chunk:
+                    break
+                pending.append((offset, self._executor.submit(_validate_chunk, chunk, max_errors)))
+                offset += len(chunk)
+            if not pending:
+                return
+            chunk_offset, future = pending.popleft()
+            yield chunk_offset, future.result()
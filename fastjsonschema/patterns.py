@@ -0,0 +1,138 @@
+"""
+Regular expressions of keywords ``pattern`` and ``patternProperties``. Simple
+patterns are turned into calls of ``str`` methods which are faster than regular
+expression engine:
+
+.. code-block:: python
+
+    lower_pattern('^[0-9]+$', 'value')  # (value.isascii() and value.isdecimal()) or ...
+    lower_pattern('^prefix', 'value')  # value.startswith('prefix')
+
+Other patterns are compiled only once per process (see :any:`intern_regexp`),
+so validators using the same pattern share one compiled regular expression.
+"""
+
+import functools
+import re
+
+
+# Characters which have special meaning in regular expressions.
+LITERAL = r'(?:[^\\.^$*+?{}\[\]|()]|\\[^\w])*'
+
+# Character class -> condition that non-empty string contains only such characters.
+CHARACTER_CLASSES = {
+    r'\d': '{0}.isdecimal()',
+    '[0-9]': '{0}.isascii() and {0}.isdecimal()',
+    '[a-z]': '{0}.isascii() and {0}.isalpha() and {0}.islower()',
+    '[A-Z]': '{0}.isascii() and {0}.isalpha() and {0}.isupper()',
+    '[a-zA-Z]': '{0}.isascii() and {0}.isalpha()',
+    '[A-Za-z]': '{0}.isascii() and {0}.isalpha()',
+    '[a-zA-Z0-9]': '{0}.isascii() and {0}.isalnum()',
+    '[A-Za-z0-9]': '{0}.isascii() and {0}.isalnum()',
+    # Dot does not match new line, but it matches empty string.
+    '.': "'\\n' not in {0}",
+}
+
+REPEATED_CLASS = re.compile(r'(?P<cls>{})(?:(?P<plus>\+)|(?P<star>\*)|\{{(?P<min>\d+)(?P<comma>,)?(?P<max>\d*)\}})'.format(
+    '|'.join(re.escape(cls) for cls in CHARACTER_CLASSES),
+))
+
+# How many compiled regular expressions are remembered by intern_regexp.
+REGEXPS_SIZE = 1000
+
+
+@functools.lru_cache(maxsize=REGEXPS_SIZE)
+def intern_regexp(pattern):
+    """
+    Returns compiled regular expression of ``pattern``. Pattern is compiled
+    only once per process, so compiling of more validators with the same
+    patterns is faster and they share memory. Unlike cache of module ``re``
+    this one is not cleared when it's full, only the least recently used of
+    :any:`REGEXPS_SIZE` patterns are forgotten, so it does not grow without
+    bound when schemas come from users.
+    """
+    return re.compile(pattern)
+
+
+def literal_prefix(pattern):
+    """
+    Returns literal text which ``pattern`` matches at the start of string, for
+    example ``metric.`` for ``^metric\\.``, or ``None`` when pattern is not so
+    simple.
+    """
+    match = re.fullmatch(r'\^({})'.format(LITERAL), pattern)
+    if not match:
+        return None
+    return _unescape(match.group(1))
+
+
+def combine_patterns(patterns):
+    """
+    Returns one regular expression matching the same strings as any of
+    ``patterns`` or ``None`` when they can't be combined (when they refer to
+    their groups by number, which would change, or use global flags).
+    """
+    if any(re.search(r'\\[1-9]|\(\?[aiLmsux]+\)', pattern) for pattern in patterns):
+        return None
+    try:
+        return intern_regexp('|'.join('(?:{})'.format(pattern) for pattern in patterns))
+    except re.error:
+        return None
+
+
+def lower_pattern(pattern, variable):
+    """
+    Returns code of condition which is true when ``pattern`` matches string in
+    ``variable`` (the same way as ``re.match``) or ``None`` when pattern is
+    not simple enough. Supported are literals and one repeated character class
+    like ``[a-z]+`` or ``\\d{2,4}``, optionally anchored by ``^`` and ``$``.
+    Note that ``$`` matches also before new line at the end of string.
+    """
+    body = pattern[1:] if pattern.startswith('^') else pattern
+    anchored = body.endswith('$') and (len(body) - len(body[:-1].rstrip('\\')) - 1) % 2 == 0
+    if anchored:
+        body = body[:-1]
+
+    if re.fullmatch(LITERAL, body):
+        text = _unescape(body)
+        if anchored:
+            return '{} in {!r}'.format(variable, (text, text + '\n'))
+        return '{}.startswith({!r})'.format(variable, text) if text else None
+
+    match = REPEATED_CLASS.fullmatch(body)
+    if not match:
+        return None
+    condition = CHARACTER_CLASSES[match.group('cls')]
+    if match.group('plus'):
+        minimum, maximum = 1, None
+    elif match.group('star'):
+        minimum, maximum = 0, None
+    else:
+        minimum = int(match.group('min'))
+        maximum = int(match.group('max')) if match.group('max') else (None if match.group('comma') else minimum)
+        if maximum is not None and maximum < minimum:
+            return None
+
+    if not anchored:
+        # Only first characters matter, the rest of string can be anything.
+        if not minimum:
+            return None
+        return 'len({0}) >= {1} and {2}'.format(variable, minimum, condition.format('{}[:{}]'.format(variable, minimum)))
+
+    dot = match.group('cls') == '.'
+
+    def check(value):
+        parts = []
+        if minimum > 1 or maximum is not None or (dot and minimum):
+            parts.append('{} <= len({}){}'.format(minimum, value, '' if maximum is None else ' <= {}'.format(maximum)))
+        if minimum or dot:
+            parts.append(condition.format(value))
+        else:
+            parts.append('(not {} or {})'.format(value, condition.format(value)))
+        return ' and '.join(parts)
+
+    return "({}) or {}[-1:] == '\\n' and ({})".format(check(variable), variable, check('{}[:-1]'.format(variable)))
+
+
+def _unescape(text):
+    return re.sub(r'\\(.)', r'\1', text)
@@ -0,0 +1,95 @@
+"""
+Arrays of numbers or booleans can be passed also as ``numpy.ndarray``,
+``array.array`` or ``memoryview`` when items are defined only by ``type``
+(``number``, ``integer`` or ``boolean``), ``minimum``, ``maximum`` and
+``multipleOf``:
+
+.. code-block:: python
+
+    validate = fastjsonschema.compile({'type': 'array', 'items': {'type': 'number', 'minimum': 0, 'maximum': 1}})
+    validate(numpy.random.random(1000000))
+
+When NumPy is installed, all items are checked at once without copying the
+data and only invalid items are checked again by generated code (so errors
+are the same as for lists). Without NumPy items are checked one by one.
+"""
+
+from array import array
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+# Keywords which can be checked by vector_candidates.
+VECTOR_KEYWORDS = frozenset((
+    'type', 'minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum', 'multipleOf', 'title', 'description',
+))
+
+# JSON type -> kinds of NumPy dtype of that type.
+VECTOR_KINDS = {
+    'number': 'iuf',
+    'integer': 'iu',
+    'boolean': 'b',
+}
+
+vector_types = (array, memoryview) if numpy is None else (array, memoryview, numpy.ndarray)
+
+
+def is_vectorizable(definition):
+    """
+    Returns whether ``definition`` of items can be checked by :any:`vector_candidates`.
+    """
+    if not isinstance(definition, dict) or not definition.keys() <= VECTOR_KEYWORDS or 'type' not in definition:
+        return False
+    types = definition['type'] if isinstance(definition['type'], list) else [definition['type']]
+    return bool(types) and all(json_type in VECTOR_KINDS for json_type in types) and all(
+        isinstance(definition.get(key, 0), (int, float)) and not isinstance(definition.get(key), bool)
+        for key in ('minimum', 'maximum', 'multipleOf')
+    )
+
+
+def get_vector_arguments(definition):
+    """
+    Returns arguments of :any:`vector_candidates` (without values) for
+    vectorizable ``definition``.
+    """
+    types = definition['type'] if isinstance(definition['type'], list) else [definition['type']]
+    return (
+        ''.join(sorted(set(''.join(VECTOR_KINDS[json_type] for json_type in types)))),
+        definition.get('minimum'),
+        definition.get('maximum'),
+        bool(definition.get('exclusiveMinimum', False)),
+        bool(definition.get('exclusiveMaximum', False)),
+        definition.get('multipleOf'),
+    )
+
+
+def vector_candidates(values, kinds, minimum=None, maximum=None, exclusive_minimum=False, exclusive_maximum=False, multiple_of=None):
+    """
+    Returns iterable of ``(index, item)`` of ``values`` which can be invalid,
+    items are Python numbers. NumPy is used to skip all valid items of one
+    dimensional arrays with dtype of ``kinds``. Otherwise all items are
+    returned, so generated code checks them the same way as items of list.
+    """
+    if numpy is None:
+        return enumerate(values.tolist() if isinstance(values, memoryview) else values)
+    try:
+        # It's only a view for objects supporting buffer protocol.
+        values = numpy.asarray(values)
+    except (TypeError, ValueError):
+        return enumerate(values.tolist())
+    if values.ndim != 1 or values.dtype.kind not in kinds:
+        return enumerate(values.tolist())
+
+    # The same comparisons as generated code does, so NaN is handled the same way.
+    invalid = numpy.zeros(len(values), dtype=bool)
+    if minimum is not None:
+        invalid |= (values <= minimum) if exclusive_minimum else (values < minimum)
+    if maximum is not None:
+        invalid |= (values >= maximum) if exclusive_maximum else (values > maximum)
+    if multiple_of is not None:
+        invalid |= values % multiple_of != 0
+    indexes = numpy.flatnonzero(invalid)
+    return zip(indexes.tolist(), values[indexes].tolist())
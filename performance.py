@@ -1,8 +1,10 @@
 
+import re
 import timeit
 
 # apt-get install jsonschema json-spec validictory
 import fastjsonschema
+from fastjsonschema.patterns import lower_pattern
 import jsonschema
 import validictory
 from jsonspec.validators import load
@@ -72,7 +74,26 @@ VALUES_BAD = (
 
 fastjsonschema_validate = fastjsonschema.compile(JSON_SCHEMA)
 fast_compiled = lambda value, _: fastjsonschema_validate(value)
-fast_not_compiled = lambda value, json_schema: fastjsonschema.compile(json_schema)(value)
+fast_not_compiled = lambda value, json_schema: fastjsonschema.compile(json_schema, cache=False)(value)
+fast_cached = lambda value, json_schema: fastjsonschema.compile(json_schema)(value)
+
+fastjsonschema_is_valid = fastjsonschema.compile(JSON_SCHEMA, mode='bool')
+
+fastjsonschema_validate_many = fastjsonschema.compile_batch(JSON_SCHEMA)
+fast_batch = lambda values: fastjsonschema_validate_many(values)
+
+
+def fast_loop(values):
+    for value in values:
+        try:
+            fastjsonschema_validate(value)
+        except fastjsonschema.JsonSchemaException:
+            pass
+
+
+def fast_bool_loop(values):
+    for value in values:
+        fastjsonschema_is_valid(value)
 
 jsonspec = load(JSON_SCHEMA)
 
@@ -89,6 +110,7 @@ def t(func, valid_values=True):
         jsonspec,
         fast_compiled,
         fast_not_compiled,
+        fast_cached,
     )
     """
 
@@ -110,6 +132,100 @@ def t(func, valid_values=True):
     print('{:<20} {:<10} ==> {}'.format(module, 'valid' if valid_values else 'invalid', res))
 
 
+def t_batch(func, valid_values=True):
+    # Unlike t() all values are validated, also the invalid ones.
+    values = (VALUES_OK if valid_values else VALUES_BAD) * 100
+    res = timeit.timeit(lambda: globals()[func](values), number=NUMBER // 100)
+    print('{:<20} {:<10} ==> {}'.format(func, 'valid' if valid_values else 'invalid', res))
+
+
+def t_enum(size):
+    # Checks the last value of enum, so list would have to be scanned whole.
+    validate = fastjsonschema.compile({'type': 'string', 'enum': ['code{}'.format(x) for x in range(size)]})
+    value = 'code{}'.format(size - 1)
+    res = timeit.timeit(lambda: validate(value), number=NUMBER * 100)
+    print('{:<20} {:<10} ==> {}'.format('fast_enum', size, res))
+
+
+def t_unique_items(kind, size):
+    # Dictionaries are not hashable, so they are compared by canonical keys.
+    validate = fastjsonschema.compile({'type': 'array', 'uniqueItems': True})
+    if kind == 'objects':
+        value = [{'id': x, 'tags': ['a', x]} for x in range(size)]
+    else:
+        value = list(range(size))
+    res = timeit.timeit(lambda: validate(value), number=10)
+    print('{:<20} {:<10} ==> {}'.format('unique_' + kind, size, res))
+
+
+PATTERN_BENCHMARKS = (
+    ('^prefix', 'prefix-value'),
+    ('^abc$', 'abc'),
+    ('^[0-9]+$', '1234567890'),
+    ('^\\d+$', '1234567890'),
+    ('^[a-z]+$', 'abcdefghij'),
+    ('^[a-zA-Z0-9]+$', 'abcDEF1234'),
+    ('^[0-9]{4}$', '2024'),
+    ('^.{1,10}$', 'abcdefghij'),
+)
+
+
+def t_pattern(pattern, value):
+    # Simple patterns are checked by str methods instead of regular expression.
+    regexp = re.compile(pattern)
+    lowered = eval('lambda value: ' + lower_pattern(pattern, 'value'))
+    for name, func in (('re', regexp.match), ('str', lowered)):
+        res = timeit.timeit(lambda: func(value), number=NUMBER * 100)
+        print('{:<20} {:<10} ==> {}'.format(pattern, name, res))
+
+
+OPTIMIZER_BENCHMARKS = (
+    ('drop_implied_types', {'type': 'number', 'allOf': [{'type': 'number', 'minimum': 0}, {'type': 'number', 'maximum': 100}]}, 42),
+    ('merge_all_of', {'allOf': [{'type': 'string'}, {'allOf': [{'minLength': 1}, {'maxLength': 10}]}]}, 'abc'),
+    ('remove_dead_branches', {'type': 'integer', 'oneOf': [{'type': 'string'}, {'type': 'null'}, {'minimum': 0}]}, 42),
+    ('fuse_ranges', {'type': 'number', 'minimum': 0, 'maximum': 100}, 42),
+)
+
+POINT = {'type': 'object', 'properties': {'x': {'type': 'number'}, 'y': {'type': 'number'}}, 'required': ['x', 'y']}
+SHARED_SCHEMA = {'type': 'object', 'properties': {'p{}'.format(x): POINT for x in range(100)}}
+
+
+def t_optimize(name, definition, value):
+    for optimize in ([], [name]):
+        validate = fastjsonschema.compile(definition, optimize=optimize)
+        res = timeit.timeit(lambda: validate(value), number=NUMBER * 100)
+        print('{:<20} {:<10} ==> {}'.format(name, 'on' if optimize else 'off', res))
+
+
+def t_optimize_compile(name, definition):
+    # Sharing of subschemas makes code smaller, so it's faster to compile.
+    for optimize in ([], [name]):
+        res = timeit.timeit(lambda: fastjsonschema.compile(definition, cache=False, optimize=optimize), number=NUMBER // 100)
+        print('{:<20} {:<10} ==> {}'.format(name, 'on' if optimize else 'off', res))
+
+
+def t_compile_size(kind, size):
+    # Time of compilation should grow linearly with size of definition.
+    if kind == 'wide':
+        definition = {'type': 'object', 'properties': {'p{}'.format(x): {'type': 'string'} for x in range(size)}}
+    else:
+        definition = {'type': 'string'}
+        for _ in range(size):
+            definition = {'type': 'object', 'properties': {'a': definition}}
+    res = timeit.timeit(lambda: fastjsonschema.compile(definition, cache=False), number=1)
+    print('{:<20} {:<10} ==> {}'.format('compile_' + kind, size, res))
+
+
+def t_tiered(calls):
+    # Cost of compiling and calling validator given number of times.
+    for tiered in (False, True):
+        res = timeit.timeit(lambda: [
+            validate(value) for validate in [fastjsonschema.compile(JSON_SCHEMA, cache=False, tiered=tiered)]
+            for _ in range(calls) for value in VALUES_OK
+        ], number=10)
+        print('{:<20} {:<10} ==> {}'.format('tiered' if tiered else 'eager', calls, res))
+
+
 print('Number: {}'.format(NUMBER))
 
 t('fast_compiled')
@@ -118,6 +234,40 @@ t('fast_compiled', valid_values=False)
 t('fast_not_compiled')
 t('fast_not_compiled', valid_values=False)
 
+t('fast_cached')
+t('fast_cached', valid_values=False)
+
+t_batch('fast_loop')
+t_batch('fast_loop', valid_values=False)
+
+t_batch('fast_batch')
+t_batch('fast_batch', valid_values=False)
+
+t_batch('fast_bool_loop')
+t_batch('fast_bool_loop', valid_values=False)
+
+t_enum(10)
+t_enum(1000)
+t_enum(100000)
+
+for pattern, value in PATTERN_BENCHMARKS:
+    t_pattern(pattern, value)
+
+t_unique_items('numbers', 100000)
+t_unique_items('objects', 100000)
+
+for name, definition, value in OPTIMIZER_BENCHMARKS:
+    t_optimize(name, definition, value)
+t_optimize_compile('share_subschemas', SHARED_SCHEMA)
+
+for calls in (1, 10, 100, 1000):
+    t_tiered(calls)
+
+for size in (1000, 2000, 5000, 10000):
+    t_compile_size('wide', size)
+for size in (100, 200, 500, 1000):
+    t_compile_size('deep', size)
+
 t('jsonschema.validate')
 t('jsonschema.validate', valid_values=False)
 
@@ -5,11 +5,14 @@ try:
 except ImportError:
     from distutils.core import setup
 
+from fastjsonschema.version import VERSION
+
 
 setup(
     name='fastjsonschema',
-    version='1.1',
+    version=VERSION,
     packages=['fastjsonschema'],
+    python_requires='>=3.7',
 
     url='https://github.com/seznam/python-fastjsonschema',
     author='Michal Horejsek',
@@ -1,4 +1,5 @@
 
+from copy import deepcopy
 import os
 import sys
 
@@ -12,6 +13,7 @@ import pytest
 
 from fastjsonschema import JsonSchemaException, compile
 from fastjsonschema.generator import CodeGenerator
+from fastjsonschema.interpreter import Interpreter
 
 
 @pytest.fixture
@@ -22,11 +24,23 @@ def asserter():
         print(code_generator.func_code)
         pprint(code_generator.global_state)
 
-        validator = compile(definition)
-        if isinstance(expected, JsonSchemaException):
-            with pytest.raises(JsonSchemaException) as exc:
-                validator(value)
-            assert exc.value.message == expected.message
-        else:
-            assert validator(value) == expected
+        is_valid = compile(definition, mode='bool')
+        assert is_valid(deepcopy(value)) is not isinstance(expected, JsonSchemaException)
+
+        is_valid_optimized = compile(definition, mode='bool', optimize=True)
+        assert is_valid_optimized(deepcopy(value)) is not isinstance(expected, JsonSchemaException)
+
+        validate_all = compile(definition, mode='errors')
+        errors = validate_all(deepcopy(value), max_errors=1)
+        assert [e.message for e in errors] == ([expected.message] if isinstance(expected, JsonSchemaException) else [])
+
+        assert Interpreter(definition, mode='bool')(deepcopy(value)) is not isinstance(expected, JsonSchemaException)
+
+        for validator in (Interpreter(definition), compile(definition), compile(definition, profile=True)):
+            if isinstance(expected, JsonSchemaException):
+                with pytest.raises(JsonSchemaException) as exc:
+                    validator(deepcopy(value))
+                assert exc.value.message == expected.message
+            else:
+                assert validator(deepcopy(value)) == expected
     return f
@@ -52,6 +52,16 @@ def test_min_items(asserter, value, expected):
     ([1], [1]),
     ([1, 1], JsonSchemaException('data must contain unique items')),
     ([1, 2, 3], [1, 2, 3]),
+    ([1, 1.0], JsonSchemaException('data must contain unique items')),
+    ([1, True], [1, True]),
+    ([0, False, None], [0, False, None]),
+    ([True, True], JsonSchemaException('data must contain unique items')),
+    ([{'a': 1}, {'a': True}], [{'a': 1}, {'a': True}]),
+    ([{'a': 1, 'b': [1]}, {'b': [1], 'a': 1}], JsonSchemaException('data must contain unique items')),
+    ([[1, 2], [2, 1]], [[1, 2], [2, 1]]),
+    ([[1, [True]], [1, [1]]], [[1, [True]], [1, [1]]]),
+    ([[1, [True]], [1, [True]]], JsonSchemaException('data must contain unique items')),
+    (['bool', 1, ['bool', True]], ['bool', 1, ['bool', True]]),
 ])
 def test_unique_items(asserter, value, expected):
     asserter({
@@ -60,6 +70,10 @@ def test_unique_items(asserter, value, expected):
     }, value, expected)
 
 
+def test_unique_items_false(asserter):
+    asserter({'uniqueItems': False}, [1, 1], [1, 1])
+
+
 @pytest.mark.parametrize('value, expected', [
     ([], []),
     ([1], [1]),
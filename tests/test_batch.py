@@ -0,0 +1,56 @@
+from array import array
+
+import pytest
+
+from fastjsonschema import JsonSchemaException, compile_batch
+
+
+def test_batch():
+    validate_many = compile_batch({'type': 'string'})
+    valid, invalid, errors = validate_many(['a', 1, 'b', None])
+    assert valid == ['a', 'b']
+    assert invalid == array('L', [1, 3])
+    assert [(index, exc.message) for index, exc in errors] == [
+        (1, 'data must be string'),
+        (3, 'data must be string'),
+    ]
+
+
+@pytest.mark.parametrize('max_errors, expected', [
+    (0, []),
+    (1, [0]),
+    (2, [0, 1]),
+])
+def test_batch_max_errors(max_errors, expected):
+    validate_many = compile_batch({'type': 'string'})
+    valid, invalid, errors = validate_many([1, 2, 3], max_errors=max_errors)
+    assert list(invalid) == [0, 1, 2]
+    assert [index for index, exc in errors] == expected
+
+
+def test_batch_defaults():
+    validate_many = compile_batch({
+        'type': 'object',
+        'properties': {'a': {'type': 'number', 'default': 42}},
+    })
+    valid, invalid, errors = validate_many(({}, {'a': 'x'}, {'a': 1}))
+    assert valid == [{'a': 42}, {'a': 1}]
+    assert list(invalid) == [1]
+    assert isinstance(errors[0][1], JsonSchemaException)
+    assert errors[0][1].message == 'data.a must be number'
+
+
+def test_batch_with_ref():
+    validate_many = compile_batch({
+        'definitions': {'positive': {'minimum': 0}},
+        'type': 'array',
+        'items': {'$ref': '#/definitions/positive'},
+    })
+    valid, invalid, errors = validate_many([[1, 2], [1, -2]])
+    assert valid == [[1, 2]]
+    assert errors[0][1].message == 'data[1] must be bigger than or equal to 0'
+
+
+def test_batch_empty_definition():
+    validate_many = compile_batch({})
+    assert validate_many([1, 'a']) == ([1, 'a'], array('L'), [])
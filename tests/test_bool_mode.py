@@ -0,0 +1,52 @@
+import pytest
+
+from fastjsonschema import JsonSchemaDefinitionException, compile
+from fastjsonschema.generator import CodeGenerator
+
+
+definition = {
+    'definitions': {
+        'small': {'type': 'number', 'maximum': 10},
+    },
+    'type': 'object',
+    'properties': {
+        'a': {'$ref': '#/definitions/small'},
+        'b': {'anyOf': [{'type': 'string'}, {'$ref': '#/definitions/small'}]},
+        'c': {'oneOf': [{'multipleOf': 3}, {'multipleOf': 5}]},
+        'd': {'not': {'type': 'null'}},
+    },
+}
+
+
+def test_bool_mode_code():
+    code = CodeGenerator(definition, mode='bool').func_code
+    assert 'JsonSchemaException' not in code
+    assert 'try:' not in code
+
+
+@pytest.mark.parametrize('value, expected', [
+    ({}, True),
+    ({'a': 10, 'b': 'x', 'c': 9, 'd': 1}, True),
+    ({'b': 5}, True),
+    ({'a': 11}, False),
+    ({'b': 11}, False),
+    ({'b': None}, False),
+    ({'c': 15}, False),
+    ({'c': 7}, False),
+    ({'d': None}, False),
+    ([], False),
+])
+def test_bool_mode(value, expected):
+    assert compile(definition, mode='bool')(value) is expected
+
+
+def test_bool_mode_sets_defaults():
+    is_valid = compile({'properties': {'a': {'default': 1}}}, mode='bool')
+    data = {}
+    assert is_valid(data) is True
+    assert data == {'a': 1}
+
+
+def test_unknown_mode():
+    with pytest.raises(JsonSchemaDefinitionException):
+        compile({}, mode='unknown')
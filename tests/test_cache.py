@@ -0,0 +1,158 @@
+from collections import OrderedDict
+import threading
+import time
+
+import pytest
+
+from fastjsonschema import DiskCache, JsonSchemaException, ValidatorCache, compile, fingerprint
+
+
+def test_fingerprint_does_not_depend_on_keys_order():
+    assert fingerprint({'type': 'string', 'maxLength': 5}) == fingerprint({'maxLength': 5, 'type': 'string'})
+
+
+@pytest.mark.parametrize('definition, other', [
+    ({'type': 'string'}, {'type': 'number'}),
+    ({'enum': [1]}, {'enum': [True]}),
+    ({'enum': [1]}, {'enum': [1.0]}),
+])
+def test_fingerprint_differs(definition, other):
+    assert fingerprint(definition) != fingerprint(other)
+
+
+def test_compile_uses_cache():
+    cache = ValidatorCache()
+    validate = compile({'type': 'string'}, cache=cache)
+    assert compile({'type': 'string'}, cache=cache) is validate
+    assert compile({'type': 'number'}, cache=cache) is not validate
+    assert cache.info() == (1, 2, 128, 2)
+
+
+def test_compile_without_cache():
+    assert compile({'type': 'string'}, cache=False) is not compile({'type': 'string'}, cache=False)
+
+
+def test_eviction():
+    cache = ValidatorCache(maxsize=2)
+    validate_a = compile({'maxLength': 1}, cache=cache)
+    compile({'maxLength': 2}, cache=cache)
+    compile({'maxLength': 1}, cache=cache)
+    compile({'maxLength': 3}, cache=cache)
+    assert cache.info().currsize == 2
+    assert compile({'maxLength': 1}, cache=cache) is validate_a
+    assert cache.info().misses == 3
+
+
+def test_clear():
+    cache = ValidatorCache()
+    compile({'type': 'string'}, cache=cache)
+    cache.clear()
+    assert cache.info() == (0, 0, 128, 0)
+
+
+def test_single_flight():
+    cache = ValidatorCache()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('key', factory))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(set(map(id, results))) == 1
+    assert cache.info().misses == 1
+
+
+def test_failed_factory_is_not_cached():
+    cache = ValidatorCache()
+
+    def factory():
+        raise RuntimeError('failed')
+
+    with pytest.raises(RuntimeError):
+        cache.get('key', factory)
+    assert cache.get('key', object) is not None
+    assert cache.info().currsize == 1
+
+
+def test_disk_cache(tmpdir):
+    definition = {'type': 'string', 'pattern': '^a'}
+    validate = compile(definition, cache=False, cache_dir=str(tmpdir))
+    assert len(tmpdir.listdir()) == 1
+    assert validate('abc') == 'abc'
+
+    validate = compile(definition, cache=False, cache_dir=str(tmpdir))
+    assert validate('abc') == 'abc'
+    with pytest.raises(JsonSchemaException):
+        validate('xyz')
+
+
+def test_disk_cache_loads_stored_code(tmpdir, monkeypatch):
+    definition = {'type': 'string', 'pattern': '^a'}
+    compile(definition, cache=False, cache_dir=str(tmpdir))
+
+    monkeypatch.setattr('fastjsonschema.CodeGenerator.__init__', None)
+    validate = compile(definition, cache=False, cache_dir=str(tmpdir))
+    assert validate('abc') == 'abc'
+
+
+@pytest.mark.parametrize('optimize', [False, True])
+def test_disk_cache_ordered_dict(tmpdir, monkeypatch, optimize):
+    definition = OrderedDict([
+        ('type', 'object'),
+        ('properties', OrderedDict([('a', OrderedDict([('enum', [[1], OrderedDict([('b', 2)])])]))])),
+        ('allOf', [OrderedDict([('required', ['a'])])]),
+    ])
+    compile(definition, cache=False, cache_dir=str(tmpdir), optimize=optimize)
+    assert len(tmpdir.listdir()) == 1
+
+    monkeypatch.setattr('fastjsonschema.CodeGenerator.__init__', None)
+    validate = compile(definition, cache=False, cache_dir=str(tmpdir), optimize=optimize)
+    assert validate({'a': {'b': 2}}) == {'a': {'b': 2}}
+    with pytest.raises(JsonSchemaException) as exc:
+        validate({'a': 1})
+    assert exc.value.definition == {'enum': [[1], {'b': 2}]}
+
+
+def test_disk_cache_deep_definition(tmpdir, monkeypatch):
+    definition = {'type': 'string'}
+    value = 'x'
+    for _ in range(300):
+        definition = {'type': 'object', 'properties': {'a': definition}}
+        value = {'a': value}
+    compile(definition, cache=False, cache_dir=str(tmpdir))
+    assert len(tmpdir.listdir()) == 1
+
+    monkeypatch.setattr('fastjsonschema.CodeGenerator.__init__', None)
+    validate = compile(definition, cache=False, cache_dir=str(tmpdir))
+    assert validate(value) == value
+    value['a'] = 1
+    with pytest.raises(JsonSchemaException) as exc:
+        validate(value)
+    assert exc.value.message == 'data.a must be object'
+
+
+def test_disk_cache_ignores_broken_entry(tmpdir):
+    definition = {'type': 'string'}
+    disk_cache = DiskCache(str(tmpdir))
+    with open(disk_cache.path(definition, mode='exception'), 'wb') as cache_file:
+        cache_file.write(b'broken')
+
+    assert disk_cache.load(definition, mode='exception') is None
+    validate = compile(definition, cache=False, cache_dir=str(tmpdir))
+    assert validate('abc') == 'abc'
+    assert disk_cache.load(definition, mode='exception') is not None
+
+
+def test_disk_cache_clear(tmpdir):
+    compile({'type': 'string'}, cache=False, cache_dir=str(tmpdir))
+    DiskCache(str(tmpdir)).clear()
+    assert tmpdir.listdir() == []
@@ -0,0 +1,128 @@
+from array import array
+
+import pytest
+
+from fastjsonschema import compile_columns
+
+
+DEFINITION = {
+    'type': 'object',
+    'properties': {
+        'name': {'type': 'string', 'minLength': 1},
+        'age': {'type': 'integer', 'minimum': 0},
+        'tags': {'type': 'array', 'items': {'$ref': '#/definitions/tag'}},
+    },
+    'required': ['name'],
+    'definitions': {
+        'tag': {'type': 'string', 'maxLength': 3},
+    },
+}
+
+
+def messages(errors):
+    return [(index, exc.message) for index, exc in errors]
+
+
+def test_valid():
+    invalid, errors = compile_columns(DEFINITION)({
+        'name': ['a', 'b'],
+        'age': [1, 2],
+        'tags': [['x'], []],
+    })
+    assert list(invalid) == []
+    assert errors == []
+
+
+def test_invalid():
+    invalid, errors = compile_columns(DEFINITION)({
+        'name': ['a', '', 'c', 'd'],
+        'age': [1, 2, -1, 'x'],
+        'tags': [['long tag'], [], [], ['x']],
+    })
+    assert list(invalid) == [0, 1, 2, 3]
+    assert messages(errors) == [
+        (0, 'data.tags[0] must be shorter than or equal to 3 characters'),
+        (1, 'data.name must be longer than or equal to 1 characters'),
+        (2, 'data.age must be bigger than or equal to 0'),
+        (3, 'data.age must be integer'),
+    ]
+    assert errors[0][1].path == ('data', 'tags', 0)
+    assert errors[0][1].rule == 'maxLength'
+
+
+def test_max_errors():
+    invalid, errors = compile_columns(DEFINITION)({'name': ['', '', 'a'], 'age': [-1, 1, -1]}, max_errors=2)
+    assert list(invalid) == [0, 1, 2]
+    assert messages(errors) == [
+        (0, 'data.name must be longer than or equal to 1 characters'),
+        (0, 'data.age must be bigger than or equal to 0'),
+    ]
+
+
+def test_missing_required_column():
+    invalid, errors = compile_columns(DEFINITION)({'age': [1, 2]})
+    assert list(invalid) == [0, 1]
+    assert messages(errors) == [
+        (0, "data must contain ['name'] properties"),
+        (1, "data must contain ['name'] properties"),
+    ]
+
+
+@pytest.mark.parametrize('additional, expected', [
+    (False, [(0, 'data must contain only spcified properties'), (1, 'data must contain only spcified properties')]),
+    ({'type': 'number'}, [(1, 'data.other must be number')]),
+])
+def test_additional_properties(additional, expected):
+    definition = {'properties': {'a': {}}, 'additionalProperties': additional}
+    invalid, errors = compile_columns(definition)({'a': [1, 2], 'other': [1, 'x']})
+    assert messages(errors) == expected
+
+
+def test_other_keywords_checked_on_records():
+    definition = {'properties': {'a': {'type': 'number'}}, 'maxProperties': 1}
+    invalid, errors = compile_columns(definition)({'a': [1, 'x'], 'b': [1, 2]})
+    assert list(invalid) == [0, 1]
+    assert messages(errors) == [
+        (0, 'data must contain less than or equal to 1 properties'),
+        (1, 'data.a must be number'),
+        (1, 'data must contain less than or equal to 1 properties'),
+    ]
+
+
+def test_not_object():
+    invalid, errors = compile_columns({'type': 'array'})({'a': [1]})
+    assert messages(errors) == [(0, 'data must be array')]
+
+
+def test_array_columns():
+    validate_columns = compile_columns({'properties': {'a': {'type': 'number', 'maximum': 1}, 'b': {'enum': [1, 2]}}})
+    invalid, errors = validate_columns({'a': array('d', [0, 2, 1]), 'b': array('l', [1, 2, 3])})
+    assert messages(errors) == [(1, 'data.a must be smaller than or equal to 1'), (2, 'data.b must be one of [1, 2]')]
+
+
+def test_different_lengths():
+    with pytest.raises(ValueError):
+        compile_columns(DEFINITION)({'name': ['a'], 'age': [1, 2]})
+
+
+def test_numpy_structured_array():
+    numpy = pytest.importorskip('numpy')
+    columns = numpy.array([('a', 1), ('', -1)], dtype=[('name', 'U10'), ('age', 'i8')])
+    invalid, errors = compile_columns(DEFINITION)(columns)
+    assert list(invalid) == [1]
+    assert messages(errors) == [
+        (1, 'data.name must be longer than or equal to 1 characters'),
+        (1, 'data.age must be bigger than or equal to 0'),
+    ]
+
+
+def test_pattern_properties():
+    definition = {
+        'properties': {'id': {'type': 'integer'}},
+        'patternProperties': {'^metric_': {'type': 'number'}},
+        'additionalProperties': False,
+    }
+    invalid, errors = compile_columns(definition)({'id': [1, 2], 'metric_a': [1, 'x']})
+    assert messages(errors) == [(1, 'data.metric_a must be number')]
+    invalid, errors = compile_columns(definition)({'id': [1], 'other': [1]})
+    assert messages(errors) == [(0, 'data must contain only spcified properties')]
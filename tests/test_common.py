@@ -2,6 +2,7 @@
 import pytest
 
 from fastjsonschema import JsonSchemaException
+from fastjsonschema.generator import CodeGenerator
 
 
 exc = JsonSchemaException('data must be one of [1, 2, \'a\']')
@@ -16,6 +17,46 @@ def test_enum(asserter, value, expected):
     asserter({'enum': [1, 2, 'a']}, value, expected)
 
 
+exc = JsonSchemaException('data must be one of [1, [1, 2], {\'a\': [None]}]')
+@pytest.mark.parametrize('value, expected', [
+    (1, 1),
+    ([1, 2], [1, 2]),
+    ([2, 1], exc),
+    ({'a': [None]}, {'a': [None]}),
+    ({'a': []}, exc),
+    ('a', exc),
+])
+def test_enum_unhashable(asserter, value, expected):
+    asserter({'enum': [1, [1, 2], {'a': [None]}]}, value, expected)
+
+
+exc = JsonSchemaException('data must be one of [\'a\']')
+@pytest.mark.parametrize('value, expected', [
+    ('a', 'a'),
+    ('b', exc),
+    (['a'], exc),
+    ({}, exc),
+])
+def test_enum_single_value(asserter, value, expected):
+    asserter({'enum': ['a']}, value, expected)
+
+
+big_enum = ['code{}'.format(x) for x in range(1000)]
+@pytest.mark.parametrize('value, expected', [
+    ('code999', 'code999'),
+    ('code1000', JsonSchemaException('data must be one of {}'.format(big_enum))),
+    (['code1'], JsonSchemaException('data must be string')),
+])
+def test_enum_big(asserter, value, expected):
+    asserter({'type': 'string', 'enum': big_enum}, value, expected)
+
+
+def test_enum_is_frozenset():
+    code_generator = CodeGenerator({'enum': ['a', 'b', 'c']})
+    assert code_generator.global_state['func_enum_0'] == frozenset(['a', 'b', 'c'])
+    assert 'if isinstance(data, (list, dict)) or data not in func_enum_0:' in code_generator.func_code
+
+
 exc = JsonSchemaException('data must be string or number')
 @pytest.mark.parametrize('value, expected', [
     (0, 0),
@@ -98,3 +139,13 @@ def test_one_of_factorized(asserter, value, expected):
 ])
 def test_not(asserter, value, expected):
     asserter({'not': {'type': 'number'}}, value, expected)
+
+
+def test_combinators_do_not_catch_exceptions():
+    code = CodeGenerator({
+        'anyOf': [{'type': 'string'}, {'type': 'number'}],
+        'oneOf': [{'maxLength': 3}, {'minimum': 5}],
+        'not': {'type': 'null'},
+    }).func_code
+    assert 'except JsonSchemaException' not in code
+    assert 'data_one_of_count < 2 and func_branch_' in code
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from fastjsonschema import (
+    JsonSchemaDefinitionException, JsonSchemaException, ValidatorCache, compile, compile_directory, compile_many,
+)
+
+
+DEFINITIONS = {
+    'name': {'type': 'string', 'pattern': '^[A-Z]'},
+    'age': {'type': 'integer', 'minimum': 0},
+    'person': {'type': 'object', 'properties': {'name': {'$ref': '#/definitions/name'}}, 'definitions': {
+        'name': {'type': 'string'},
+    }},
+}
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_compile_many(processes):
+    report = compile_many(DEFINITIONS, processes=processes, cache=False)
+    assert sorted(report.validators) == sorted(report.seconds) == sorted(DEFINITIONS)
+    assert all(seconds > 0 for seconds in report.seconds.values())
+    assert report.validators['name']('Alice') == 'Alice'
+    assert report.validators['person']({'name': 'Bob'}) == {'name': 'Bob'}
+    with pytest.raises(JsonSchemaException) as exc:
+        report.validators['age'](-1)
+    assert exc.value.message == 'data must be bigger than or equal to 0'
+
+
+def test_compile_many_mode():
+    report = compile_many(DEFINITIONS, processes=2, cache=False, mode='bool', optimize=True)
+    assert report.validators['name']('alice') is False
+
+
+def test_compile_many_uses_cache():
+    cache = ValidatorCache()
+    validate_age = compile(DEFINITIONS['age'], cache=cache)
+    report = compile_many(DEFINITIONS, processes=2, cache=cache)
+    assert report.validators['age'] is validate_age
+    assert report.seconds['age'] == 0
+    assert compile(DEFINITIONS['name'], cache=cache) is report.validators['name']
+
+
+def test_compile_many_disk_cache(tmpdir):
+    compile_many(DEFINITIONS, processes=2, cache=False, cache_dir=str(tmpdir))
+    assert len(tmpdir.listdir()) == 3
+    report = compile_many(DEFINITIONS, processes=2, cache=False, cache_dir=str(tmpdir))
+    assert report.validators['name']('Alice') == 'Alice'
+
+
+def test_compile_many_invalid_definition():
+    with pytest.raises(JsonSchemaDefinitionException):
+        compile_many({'a': {'type': 'string'}, 'b': {'$ref': '#/definitions/missing'}}, processes=2, cache=False)
+
+
+def test_compile_directory(tmpdir):
+    for name, definition in DEFINITIONS.items():
+        tmpdir.join(name + '.json').write(json.dumps(definition))
+    tmpdir.join('notes.txt').write('not a schema')
+
+    report = compile_directory(str(tmpdir), processes=2, cache=False)
+    assert sorted(report.validators) == sorted(DEFINITIONS)
+    assert report.validators['age'](42) == 42
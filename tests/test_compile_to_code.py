@@ -0,0 +1,104 @@
+import importlib.util
+import json
+
+import pytest
+
+from fastjsonschema import JsonSchemaException, compile_to_code
+from fastjsonschema.__main__ import main
+from fastjsonschema.generator import constants_code
+
+
+def load_module(path):
+    spec = importlib.util.spec_from_file_location('validators', str(path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_compile_to_code(tmpdir):
+    code = compile_to_code({
+        'validate_name': {'type': 'string', 'pattern': '^[A-Z]'},
+        'validate_person': {
+            'type': 'object',
+            'properties': {
+                'name': {'type': 'string', 'pattern': '^[a-z]'},
+                'age': {'type': 'number', 'default': 42},
+            },
+        },
+    })
+    path = tmpdir.join('validators.py')
+    path.write(code)
+    validators = load_module(path)
+
+    assert validators.validate_name('Alice') == 'Alice'
+    assert validators.validate_person({'name': 'alice'}) == {'name': 'alice', 'age': 42}
+    with pytest.raises(JsonSchemaException) as exc:
+        validators.validate_name('alice')
+    assert exc.value.message == 'data must match pattern ^[A-Z]'
+    with pytest.raises(JsonSchemaException) as exc:
+        validators.validate_person({'name': 'Alice'})
+    assert exc.value.message == 'data.name must match pattern ^[a-z]'
+
+
+def test_compile_to_code_numbers_array(tmpdir):
+    code = compile_to_code({'validate_numbers': {'type': 'array', 'items': {'type': 'number', 'minimum': 0}}})
+    imports = [line for line in code.splitlines() if line.startswith(('import ', 'from '))]
+    assert imports == ['import re', 'from fastjsonschema.exceptions import JsonSchemaException']
+    path = tmpdir.join('validators.py')
+    path.write(code)
+    validators = load_module(path)
+
+    assert validators.validate_numbers([1, 2.5]) == [1, 2.5]
+    with pytest.raises(JsonSchemaException) as exc:
+        validators.validate_numbers([1, -1])
+    assert exc.value.message == 'data[1] must be bigger than or equal to 0'
+
+
+def test_compile_to_code_deep_definition(tmpdir):
+    definition = {'type': 'string'}
+    value = 'x'
+    for _ in range(300):
+        definition = {'type': 'object', 'properties': {'a': definition}}
+        value = {'a': value}
+    code = compile_to_code({'validate_deep': definition})
+    # Every part of definition is in the code only once.
+    assert code.count("'type': 'string'") == 1
+    path = tmpdir.join('validators.py')
+    path.write(code)
+    validators = load_module(path)
+
+    assert validators.validate_deep(value) == value
+    value_in = value
+    for _ in range(299):
+        value_in = value_in['a']
+    value_in['a'] = 1
+    with pytest.raises(JsonSchemaException) as exc:
+        validators.validate_deep(value)
+    assert exc.value.definition == {'type': 'string'}
+    assert exc.value.path == ('data',) + ('a',) * 300
+
+
+def test_constants_code_keeps_shared_objects():
+    shared = {'type': 'number'}
+    constants = {'a': {'properties': {'x': shared, 'y': shared}, 'items': [shared]}, 'b': shared}
+    namespace = {}
+    exec('\n'.join(constants_code(constants)), namespace)
+    assert namespace['a'] == constants['a']
+    assert namespace['b'] is namespace['a']['properties']['x'] is namespace['a']['properties']['y'] is namespace['a']['items'][0]
+
+
+def test_compile_to_code_invalid_name():
+    with pytest.raises(ValueError):
+        compile_to_code({'validate-name': {'type': 'string'}})
+
+
+def test_command_compile(tmpdir):
+    schema = tmpdir.join('user-name.json')
+    schema.write(json.dumps({'type': 'string', 'maxLength': 3}))
+    output = tmpdir.join('validators.py')
+    main(['compile', str(schema), '-o', str(output)])
+    validators = load_module(output)
+
+    assert validators.validate_user_name('abc') == 'abc'
+    with pytest.raises(JsonSchemaException):
+        validators.validate_user_name('abcd')
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from fastjsonschema import JsonSchemaException, compile_async
+from fastjsonschema.generator import CodeGenerator
+
+
+definition = {
+    'definitions': {
+        'item': {'type': 'object', 'properties': {'a': {'type': 'number', 'default': 1}}},
+    },
+    'type': 'array',
+    'items': {'$ref': '#/definitions/item'},
+}
+
+
+def test_cooperative_code_is_generator():
+    code = CodeGenerator(definition, cooperative=True).func_code
+    assert 'yield from func_definitions_item(' in code
+    assert 'yield\n' in code
+
+
+def test_cooperative_without_loops():
+    validator = compile_async({'type': 'string'})
+    assert validator('abc') == 'abc'
+
+
+def test_cooperative_sync_call():
+    validator = compile_async(definition)
+    assert validator([{}, {'a': 2}]) == [{'a': 1}, {'a': 2}]
+    with pytest.raises(JsonSchemaException) as exc:
+        validator([{}, {'a': 'x'}])
+    assert exc.value.message == 'data[1].a must be number'
+
+
+def test_validate_async():
+    validator = compile_async(definition, yield_every=10)
+    data = [{}] * 100
+
+    async def count_switches():
+        switches = 0
+        task = asyncio.ensure_future(validator.validate_async(data))
+        while not task.done():
+            switches += 1
+            await asyncio.sleep(0)
+        return switches, task.result()
+
+    switches, result = asyncio.run(count_switches())
+    assert result == [{'a': 1}] * 100
+    assert switches >= 10
+
+
+def test_validate_async_invalid():
+    validator = compile_async(definition, yield_every=10)
+    with pytest.raises(JsonSchemaException) as exc:
+        asyncio.run(validator.validate_async([{}] * 50 + [{'a': 'x'}]))
+    assert exc.value.message == 'data[50].a must be number'
+
+
+def test_cooperative_combinators():
+    validator = compile_async({'oneOf': [
+        {'type': 'array', 'items': {'type': 'number'}},
+        {'type': 'array', 'items': {'type': 'string'}},
+    ]})
+    assert validator([1, 2]) == [1, 2]
+    assert validator(['a']) == ['a']
+    with pytest.raises(JsonSchemaException) as exc:
+        validator([])
+    assert exc.value.message == 'data must be valid exactly by one of oneOf definition'
+    with pytest.raises(JsonSchemaException):
+        validator([1, 'a'])
+
+
+@pytest.mark.parametrize('keyword, value, valid', [
+    ('anyOf', 'a', True),
+    ('anyOf', None, True),
+    ('anyOf', 5, False),
+    ('oneOf', 'a', True),
+    ('oneOf', 5, False),
+])
+def test_cooperative_ref_in_branch(keyword, value, valid):
+    validator = compile_async({
+        'definitions': {'s': {'type': 'string'}},
+        keyword: [{'$ref': '#/definitions/s'}, {'type': 'null'}],
+    })
+    if valid:
+        assert validator(value) == value
+    else:
+        with pytest.raises(JsonSchemaException):
+            validator(value)
+
+
+def test_cooperative_ref_in_not():
+    validator = compile_async({'definitions': {'s': {'type': 'string'}}, 'not': {'$ref': '#/definitions/s'}})
+    assert validator(5) == 5
+    with pytest.raises(JsonSchemaException):
+        validator('a')
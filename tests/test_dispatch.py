@@ -0,0 +1,97 @@
+from collections import OrderedDict
+
+import pytest
+
+from fastjsonschema import JsonSchemaException, compile
+from fastjsonschema.generator import CodeGenerator
+
+
+def variant(kind, **properties):
+    return {
+        'type': 'object',
+        'properties': dict(properties, kind={'enum': [kind]}),
+        'required': ['kind'],
+    }
+
+
+discriminated = {
+    'oneOf': [
+        variant('circle', radius={'type': 'number'}),
+        variant('square', size={'type': 'number'}),
+        {'$ref': '#/definitions/line'},
+        {'type': 'string'},
+    ],
+    'definitions': {
+        'line': variant('line', length={'type': 'number', 'minimum': 0}),
+    },
+}
+
+
+exc = JsonSchemaException('data must be valid exactly by one of oneOf definition')
+@pytest.mark.parametrize('value, expected', [
+    ({'kind': 'circle', 'radius': 1}, {'kind': 'circle', 'radius': 1}),
+    ({'kind': 'circle', 'radius': 'a'}, exc),
+    ({'kind': 'square', 'size': 2}, {'kind': 'square', 'size': 2}),
+    ({'kind': 'line', 'length': 3}, {'kind': 'line', 'length': 3}),
+    ({'kind': 'line', 'length': -3}, exc),
+    ({'kind': 'triangle'}, exc),
+    ({'kind': ['circle']}, exc),
+    ({'radius': 1}, exc),
+    ('abc', 'abc'),
+    (42, exc),
+])
+def test_discriminator(asserter, value, expected):
+    asserter(discriminated, value, expected)
+
+
+def test_discriminator_code():
+    code = CodeGenerator(discriminated).func_code
+    assert "data_discriminator = data.get('kind') if isinstance(data, dict) else None" in code
+    assert "func_dispatch_0 = {'circle': (func_branch_0_bool, func_branch_3_bool,), " in code
+    assert 'func_dispatch_0_default = (func_branch_3_bool,)' in code
+
+
+typed = {
+    'anyOf': [
+        {'type': 'string', 'maxLength': 3},
+        {'type': 'integer'},
+        {'type': ['null', 'boolean']},
+        {'type': 'array', 'maxItems': 1},
+        {'type': 'object', 'minProperties': 1},
+    ],
+}
+
+
+exc = JsonSchemaException('data must be valid by one of anyOf definition')
+@pytest.mark.parametrize('value, expected', [
+    ('abc', 'abc'),
+    ('abcd', exc),
+    (1, 1),
+    (1.5, exc),
+    (None, None),
+    (True, True),
+    ([1], [1]),
+    ([1, 2], exc),
+    ({'a': 1}, {'a': 1}),
+    ({}, exc),
+])
+def test_type_dispatch(asserter, value, expected):
+    asserter(typed, value, expected)
+
+
+def test_type_dispatch_with_subclass():
+    validate = compile(typed)
+    assert validate(OrderedDict(a=1)) == OrderedDict(a=1)
+    with pytest.raises(JsonSchemaException):
+        validate(OrderedDict())
+
+
+def test_type_dispatch_code():
+    code = CodeGenerator(typed).func_code
+    assert 'for data_branch in func_dispatch_0.get(type(data), func_dispatch_0_default):' in code
+    assert 'str: (func_branch_0_bool,)' in code
+
+
+def test_no_dispatch_for_few_branches():
+    code = CodeGenerator({'anyOf': [{'type': 'string'}, {'type': 'number'}]}).func_code
+    assert 'dispatch' not in code
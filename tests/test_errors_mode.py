@@ -0,0 +1,105 @@
+import pytest
+
+from fastjsonschema import compile
+
+
+definition = {
+    'definitions': {
+        'name': {'type': 'string', 'minLength': 2, 'pattern': '^[A-Z]'},
+    },
+    'type': 'object',
+    'required': ['name'],
+    'properties': {
+        'name': {'$ref': '#/definitions/name'},
+        'age': {'type': 'integer', 'minimum': 0, 'maximum': 150},
+        'tags': {'type': 'array', 'items': {'type': 'string', 'maxLength': 3}},
+    },
+    'additionalProperties': False,
+}
+
+
+def messages(errors):
+    return [e.message for e in errors]
+
+
+def test_errors_valid():
+    assert compile(definition, mode='errors')({'name': 'Al'}) == []
+
+
+def test_errors_all():
+    validate = compile(definition, mode='errors')
+    assert messages(validate({'name': 'a', 'age': -1, 'tags': [1, 'abcd', 'ab'], 'x': 1})) == [
+        'data.name must be longer than or equal to 2 characters',
+        'data.name must match pattern ^[A-Z]',
+        'data.age must be bigger than or equal to 0',
+        'data.tags[0] must be string',
+        'data.tags[1] must be shorter than or equal to 3 characters',
+        'data must contain only spcified properties',
+    ]
+
+
+def test_errors_wrong_type_skips_other_rules():
+    validate = compile(definition, mode='errors')
+    assert messages(validate({'name': 42, 'age': 'x'})) == [
+        'data.name must be string',
+        'data.age must be integer',
+    ]
+    assert messages(validate([])) == ['data must be object']
+
+
+@pytest.mark.parametrize('max_errors, expected', [
+    (0, []),
+    (1, ['data.tags[0] must be string']),
+    (2, ['data.tags[0] must be string', 'data.tags[1] must be string']),
+])
+def test_errors_max_errors(max_errors, expected):
+    validate = compile(definition, mode='errors')
+    assert messages(validate({'name': 'Al', 'tags': [1, 2, 3]}, max_errors=max_errors)) == expected
+
+
+def test_errors_max_errors_per_path():
+    validate = compile(definition, mode='errors')
+    assert messages(validate({'name': 'a', 'age': -1}, max_errors_per_path=1)) == [
+        'data.name must be longer than or equal to 2 characters',
+        'data.age must be bigger than or equal to 0',
+    ]
+
+
+def test_errors_combinators():
+    validate = compile({'items': {'anyOf': [{'type': 'string'}, {'type': 'null'}]}}, mode='errors')
+    assert messages(validate(['a', 1, None, 2])) == [
+        'data[1] must be valid by one of anyOf definition',
+        'data[3] must be valid by one of anyOf definition',
+    ]
+
+
+def test_errors_type_in_all_of():
+    validate = compile({'allOf': [{'type': 'string', 'minLength': 1}, {'maxLength': 2}]}, mode='errors')
+    assert messages(validate('abc')) == ['data must be shorter than or equal to 2 characters']
+    assert messages(validate([1, 2, 3])) == ['data must be string', 'data must be shorter than or equal to 2 characters']
+
+
+@pytest.mark.parametrize('definition, value, expected', [
+    ({'not': {'type': 'number'}, 'minLength': 1}, 5, ['data must not be valid by not definition']),
+    ({'not': {'type': 'string'}, 'minimum': 1, 'pattern': 'b'}, 'b', ['data must not be valid by not definition']),
+    ({'anyOf': [{'type': 'string'}], 'minItems': 1, 'items': {'type': 'string'}}, 1, ['data must be valid by one of anyOf definition']),
+    ({'not': {'type': 'null'}, 'required': ['a'], 'maxProperties': 0}, None, ['data must not be valid by not definition']),
+    ({'minLength': 2}, 'a', ['data must be longer than or equal to 2 characters']),
+    ({'maxItems': 0}, 'a', ['data must contain less than or equal to 0 items']),
+    ({'minLength': 3}, [1, 2], ['data must be longer than or equal to 3 characters']),
+    ({'not': {'type': 'array'}, 'maxProperties': 1}, [1, 2], [
+        'data must not be valid by not definition',
+        'data must contain less than or equal to 1 properties',
+    ]),
+])
+def test_errors_keyword_of_other_type(definition, value, expected):
+    validate = compile(definition, mode='errors')
+    assert messages(validate(value)) == expected
+    # Errors mode finds the same values invalid as other modes.
+    assert compile(definition, mode='bool')(value) is not expected
+
+
+def test_errors_keyword_not_evaluable():
+    # Other modes raise TypeError for len(None).
+    validate = compile({'type': ['string', 'null'], 'minLength': 1}, mode='errors')
+    assert messages(validate(None)) == []
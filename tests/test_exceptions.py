@@ -0,0 +1,61 @@
+import pickle
+
+import pytest
+
+from fastjsonschema import JsonSchemaException, compile
+
+
+definition = {
+    'type': 'object',
+    'properties': {
+        'a': {'type': 'array', 'items': {'type': 'number', 'maximum': 10}},
+        'b': {'$ref': '#/definitions/b'},
+    },
+    'additionalProperties': {'type': 'string'},
+    'definitions': {
+        'b': {'type': 'array', 'items': [{'type': 'string'}, {'type': 'null'}]},
+    },
+}
+
+
+@pytest.mark.parametrize('value, path, rule, invalid_value, message', [
+    ([], ('data',), 'type', [], 'data must be object'),
+    ({'a': [1, 20]}, ('data', 'a', 1), 'maximum', 20, 'data.a[1] must be smaller than or equal to 10'),
+    ({'b': ['x', 1]}, ('data', 'b', 1), 'type', 1, 'data.b[1] must be null'),
+    ({'c': 3}, ('data', 'c'), 'type', 3, 'data.c must be string'),
+])
+def test_structured_exception(value, path, rule, invalid_value, message):
+    validate = compile(definition)
+    with pytest.raises(JsonSchemaException) as exc:
+        validate(value)
+    assert exc.value.path == path
+    assert exc.value.rule == rule
+    assert exc.value.value == invalid_value
+    assert exc.value.message == message
+    assert str(exc.value) == message
+
+
+def test_definition_of_failed_rule():
+    validate = compile(definition)
+    with pytest.raises(JsonSchemaException) as exc:
+        validate({'a': [1, 20]})
+    assert exc.value.definition is definition['properties']['a']['items']
+
+
+def test_message_is_created_lazily():
+    exc = JsonSchemaException(None, 42, ('data', 'a'), {}, 'type', 'must be string')
+    assert exc._message is None
+    assert exc.message == 'data.a must be string'
+
+
+def test_exception_with_message():
+    exc = JsonSchemaException('data must be string')
+    assert exc.message == 'data must be string'
+    assert exc.path is None
+
+
+def test_pickle():
+    exc = pickle.loads(pickle.dumps(JsonSchemaException(None, 42, ('data', 0), {'type': 'string'}, 'type', 'must be string')))
+    assert exc.message == 'data[0] must be string'
+    assert exc.path == ('data', 0)
+    assert exc.definition == {'type': 'string'}
@@ -0,0 +1,101 @@
+import pytest
+
+from fastjsonschema import JsonSchemaDefinitionException, JsonSchemaException, ValidatorCache, compile
+from fastjsonschema.interpreter import Interpreter, tiered_validator
+
+
+DEFINITION = {
+    'definitions': {
+        'name': {'type': 'string', 'minLength': 1},
+    },
+    'type': 'object',
+    'properties': {
+        'name': {'$ref': '#/definitions/name'},
+        'tags': {'type': 'array', 'items': {'type': 'string'}, 'uniqueItems': True},
+    },
+    'patternProperties': {'^x-': {'type': 'number'}},
+    'additionalProperties': False,
+}
+
+
+@pytest.mark.parametrize('value', [
+    {'name': 'a', 'tags': ['b', 'c'], 'x-a': 1},
+    {'name': ''},
+    {'tags': ['b', 'b']},
+    {'tags': [1]},
+    {'x-a': 'a'},
+    {'y': 1},
+    [],
+])
+def test_interpreter_exception_like_generated(value):
+    exceptions = []
+    for validator in (Interpreter(DEFINITION), compile(DEFINITION)):
+        try:
+            validator(value)
+        except JsonSchemaException as exc:
+            exceptions.append((exc.message, exc.value, exc.path, exc.definition, exc.rule))
+        else:
+            exceptions.append(None)
+    assert exceptions[0] == exceptions[1]
+
+
+def test_interpreter_unsupported_mode():
+    with pytest.raises(JsonSchemaDefinitionException):
+        Interpreter({}, mode='errors')
+
+
+@pytest.mark.parametrize('definition', [
+    {'$ref': '#/definitions/missing'},
+    {'type': 'unknown'},
+    {'anyOf': [{'$ref': '#/definitions/missing'}]},
+])
+def test_interpreter_invalid_definition(definition):
+    with pytest.raises(JsonSchemaDefinitionException):
+        Interpreter(definition, mode='bool')(1)
+
+
+def test_tiered():
+    validate = compile({'type': 'string'}, cache=False, tiered=2)
+    for _ in range(2):
+        assert validate('a') == 'a'
+        assert not validate.compiled
+    assert validate('a') == 'a'
+    assert validate.compiled
+    with pytest.raises(JsonSchemaException):
+        validate(1)
+
+
+def test_tiered_does_not_generate_code(monkeypatch):
+    monkeypatch.setattr('fastjsonschema.CodeGenerator.__init__', None)
+    validate = compile({'type': 'string'}, cache=False, tiered=True)
+    for _ in range(100):
+        validate('a')
+
+
+def test_tiered_bool_mode():
+    is_valid = compile({'type': 'string'}, cache=False, mode='bool', tiered=1)
+    assert [is_valid('a'), is_valid(1), is_valid(1)] == [True, False, False]
+    assert is_valid.compiled
+
+
+def test_tiered_errors_mode():
+    with pytest.raises(JsonSchemaDefinitionException):
+        compile({'type': 'string'}, cache=False, mode='errors', tiered=True)
+
+
+def test_tiered_cached():
+    cache = ValidatorCache()
+    validate = compile({'type': 'string'}, cache=cache)
+    assert compile({'type': 'string'}, cache=cache, tiered=True) is validate
+
+
+def test_tiered_compiles_once():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return lambda data: data
+
+    validate = tiered_validator(lambda data: None, factory, 1)
+    assert [validate(1) for _ in range(3)] == [None, 1, 1]
+    assert len(calls) == 1
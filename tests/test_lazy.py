@@ -0,0 +1,54 @@
+import threading
+import time
+
+import pytest
+
+from fastjsonschema import JsonSchemaDefinitionException, JsonSchemaException, compile
+from fastjsonschema.lazy import lazy_validator
+
+
+def test_lazy():
+    validate = compile({'type': 'string'}, cache=False, lazy=True)
+    assert not validate.compiled
+    assert validate('a') == 'a'
+    assert validate.compiled
+    with pytest.raises(JsonSchemaException):
+        validate(1)
+
+
+def test_lazy_does_not_generate_code(monkeypatch):
+    monkeypatch.setattr('fastjsonschema.CodeGenerator.__init__', None)
+    compile({'type': 'string'}, cache=False, lazy=True)
+
+
+def test_lazy_mode():
+    validate = compile({'items': {'type': 'string'}}, cache=False, mode='errors', lazy=True)
+    assert [e.message for e in validate([1, 2], max_errors=1)] == ['data[0] must be string']
+
+
+def test_lazy_invalid_definition():
+    validate = compile({'$ref': '#/definitions/missing'}, cache=False, lazy=True)
+    for _ in range(2):
+        with pytest.raises(JsonSchemaDefinitionException):
+            validate(1)
+    assert not validate.compiled
+
+
+def test_lazy_compiles_once():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.05)
+        return lambda data: data
+
+    validate = lazy_validator(factory)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(validate(1))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [1] * 10
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from fastjsonschema import validate_ndjson
+from fastjsonschema.__main__ import main
+from fastjsonschema.generator import CodeGenerator
+from fastjsonschema.ndjson import _validate_range, split_lines
+from fastjsonschema.parallel import _init_worker
+
+
+DEFINITION = {'type': 'object', 'properties': {'a': {'type': 'number'}}}
+
+
+@pytest.fixture
+def data_path(tmpdir):
+    lines = [json.dumps({'a': index}) for index in range(100)]
+    lines[10] = json.dumps({'a': 'x'})
+    lines[50] = '{broken'
+    lines[70] = ''
+    lines[99] = json.dumps([])
+    path = tmpdir.join('data.ndjson')
+    path.write('\n'.join(lines))
+    return str(path)
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_validate_ndjson(data_path, jobs):
+    report = validate_ndjson(DEFINITION, data_path, jobs=jobs)
+    assert report.records == 99
+    assert report.invalid == 3
+    assert [line_number for line_number, message in report.errors] == [11, 51, 100]
+    assert report.errors[0][1] == 'data.a must be number'
+    assert report.errors[1][1].startswith('invalid JSON')
+    assert report.errors[2][1] == 'data must be object'
+
+
+def test_validate_ndjson_max_errors(data_path):
+    report = validate_ndjson(DEFINITION, data_path, jobs=2, max_errors=1)
+    assert report.invalid == 3
+    assert report.errors == [(11, 'data.a must be number')]
+
+
+@pytest.mark.parametrize('max_errors', [None, 2])
+def test_validate_range_in_batches(data_path, max_errors):
+    code_generator = CodeGenerator(DEFINITION, batch=True)
+    _init_worker(code_generator.func_code, code_generator.serializable_state)
+    size = len(open(data_path, 'rb').read())
+    expected = _validate_range(data_path, 0, size, max_errors)
+    assert expected[:3] == (100, 99, 3)
+    assert _validate_range(data_path, 0, size, max_errors, batch_lines=7) == expected
+
+
+def test_validate_ndjson_empty_file(tmpdir):
+    path = tmpdir.join('empty.ndjson')
+    path.write('')
+    assert validate_ndjson(DEFINITION, str(path)).records == 0
+
+
+@pytest.mark.parametrize('content, count, expected', [
+    (b'a\nb\nc\nd\n', 2, [(0, 4), (4, 8)]),
+    (b'a\nb\nc\nd', 2, [(0, 4), (4, 7)]),
+    (b'aaaaaaaa\nb\n', 4, [(0, 9), (9, 11)]),
+    (b'a\n', 4, [(0, 2)]),
+])
+def test_split_lines(tmpdir, content, count, expected):
+    path = tmpdir.join('data.ndjson')
+    path.write_binary(content)
+    assert split_lines(str(path), len(content), count) == expected
+
+
+def test_command_validate(tmpdir, data_path, capsys):
+    schema = tmpdir.join('schema.json')
+    schema.write(json.dumps(DEFINITION))
+    assert main(['validate', str(schema), data_path, '--jobs', '2']) == 1
+    out, err = capsys.readouterr()
+    assert out.splitlines()[0] == '{}:11: data.a must be number'.format(data_path)
+    assert err.startswith('99 records, 3 invalid in ')
@@ -1,7 +1,7 @@
 
 import pytest
 
-from fastjsonschema import JsonSchemaException
+from fastjsonschema import JsonSchemaException, compile
 
 
 exc = JsonSchemaException('data must be object')
@@ -110,7 +110,66 @@ def test_properties_without_additional_properties(asserter, value, expected):
     }, value, expected)
 
 
-@pytest.mark.xfail
+@pytest.mark.parametrize('value, expected', [
+    ({'it\'s "key"': 1, 'a-b': 'x'}, {'it\'s "key"': 1, 'a-b': 'x', 'len': 'abc'}),
+    ({'it\'s "key"': 'x'}, JsonSchemaException('data.it\'s "key" must be number')),
+    ({'a-b': 1}, JsonSchemaException('data.a-b must be string')),
+    ({'len': 1}, JsonSchemaException('data.len must be string')),
+    ({'a-b': 'x', 'len': 'y', 'c': 1}, JsonSchemaException('data must contain less than or equal to 2 properties')),
+])
+def test_properties_with_any_keys(asserter, value, expected):
+    asserter({
+        'type': 'object',
+        'maxProperties': 2,
+        'properties': {
+            'it\'s "key"': {'type': 'number'},
+            'a-b': {'type': 'string'},
+            'len': {'type': 'string', 'default': 'abc'},
+        },
+    }, value, expected)
+
+
+def test_deeply_nested_properties():
+    definition = {'type': 'number'}
+    value = 42
+    for _ in range(200):
+        definition = {'type': 'object', 'properties': {'a': definition}}
+        value = {'a': value}
+    validate = compile(definition)
+    assert validate(value) == value
+
+    value_in = value
+    for _ in range(199):
+        value_in = value_in['a']
+    value_in['a'] = 'x'
+    with pytest.raises(JsonSchemaException) as exc:
+        validate(value)
+    assert exc.value.path == ('data',) + ('a',) * 200
+
+
+@pytest.mark.parametrize('keyword', ['items', 'additionalProperties', 'patternProperties'])
+@pytest.mark.parametrize('mode', ['exception', 'errors'])
+def test_deeply_nested_loops(keyword, mode):
+    # Every level is a loop and Python allows only 20 nested blocks.
+    definition = {'type': 'number'}
+    value = 'x'
+    for _ in range(50):
+        if keyword == 'items':
+            definition = {'type': 'array', 'items': definition}
+            value = [value]
+        else:
+            definition = {'type': 'object', keyword: {'a': definition} if keyword == 'patternProperties' else definition}
+            value = {'a': value}
+    validate = compile(definition, mode=mode)
+    path = ('data',) + ((0,) if keyword == 'items' else ('a',)) * 50
+    if mode == 'errors':
+        assert [exc.path for exc in validate(value)] == [path]
+    else:
+        with pytest.raises(JsonSchemaException) as exc:
+            validate(value)
+        assert exc.value.path == path
+
+
 @pytest.mark.parametrize('value, expected', [
     ({}, {}),
     ({'a': 1}, {'a': 1}),
@@ -127,3 +186,92 @@ def test_pattern_properties(asserter, value, expected):
         },
         'additionalProperties': False,
     }, value, expected)
+
+
+exc = JsonSchemaException('data must contain only spcified properties')
+@pytest.mark.parametrize('value, expected', [
+    ({'id': 1, 'metric_cpu': 0.5, 'tag.host': 'a'}, {'id': 1, 'metric_cpu': 0.5, 'tag.host': 'a'}),
+    ({'metric_cpu': 'x'}, JsonSchemaException('data.metric_cpu must be number')),
+    ({'tag.host': 1}, JsonSchemaException('data.tag.host must be string')),
+    ({'tagXhost': 'a'}, exc),
+    ({'x_metric_cpu': 1}, exc),
+    ({'count_x': -1}, JsonSchemaException('data.count_x must be bigger than or equal to 0')),
+    ({'metric_x': -1}, JsonSchemaException('data.metric_x must be bigger than or equal to 0')),
+    ({'metric_x': 'a'}, JsonSchemaException('data.metric_x must be number')),
+    ({'id': 'x'}, JsonSchemaException('data.id must be integer')),
+    ('abc', 'abc'),
+    ([], []),
+])
+def test_pattern_properties_with_properties(asserter, value, expected):
+    asserter({
+        'properties': {
+            'id': {'type': 'integer'},
+        },
+        'patternProperties': {
+            '^metric_': {'type': 'number'},
+            '^tag\\.': {'type': 'string'},
+            '_x$': {'type': 'number', 'minimum': 0},
+        },
+        'additionalProperties': False,
+    }, value, expected)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ({'a': 1, 'x1': 2, 'b': None}, {'a': 1, 'x1': 2, 'b': None}),
+    ({'b': 1}, JsonSchemaException('data.b must be null')),
+    ({'x1': 'a'}, JsonSchemaException('data.x1 must be number')),
+])
+def test_pattern_properties_additional_definition(asserter, value, expected):
+    asserter({
+        'type': 'object',
+        'properties': {'a': {}},
+        'patternProperties': {'^x\\d+$': {'type': 'number'}},
+        'additionalProperties': {'type': 'null'},
+    }, value, expected)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ({'a': 1}, {'a': 1}),
+    (['a'], ['a']),
+    ('a', 'a'),
+])
+def test_object_keywords_ignore_other_types(asserter, value, expected):
+    asserter({'properties': {'a': {'type': 'number'}}, 'additionalProperties': False}, value, expected)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ({'a': 'x', 'b': 'ab'}, {'a': 'x', 'b': 'ab'}),
+    ({'a': 'x', 'b': 'abcdef'}, JsonSchemaException('data.b must be shorter than or equal to 2 characters')),
+    ({'b': 'abcdef'}, JsonSchemaException('data.b must be shorter than or equal to 2 characters')),
+    ({'a': ''}, JsonSchemaException('data.a must be longer than or equal to 1 characters')),
+])
+def test_pattern_properties_with_lengths_and_additional_properties(asserter, value, expected):
+    asserter({
+        'type': 'object',
+        'patternProperties': {'^a': {'type': 'string', 'minLength': 1}},
+        'additionalProperties': {'type': 'string', 'maxLength': 2},
+    }, value, expected)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ({'a': 'x', 'b': 'ab'}, {'a': 'x', 'b': 'ab'}),
+    ({'b': 'abcdef'}, JsonSchemaException('data.b must be shorter than or equal to 2 characters')),
+    ({'ab': ''}, JsonSchemaException('data.ab must be longer than or equal to 1 characters')),
+    ({'ab': 'abc'}, JsonSchemaException('data.ab must be shorter than or equal to 2 characters')),
+])
+def test_pattern_properties_with_lengths(asserter, value, expected):
+    asserter({
+        'type': 'object',
+        'patternProperties': {
+            '^a': {'type': 'string', 'minLength': 1},
+            'b': {'type': 'string', 'maxLength': 2},
+        },
+    }, value, expected)
+
+
+def test_pattern_properties_backreference():
+    validate = compile({'patternProperties': {r'^(.)\1$': {'type': 'number'}, 'b': {'type': 'string'}}})
+    assert validate({'aa': 1, 'ab': 'x'}) == {'aa': 1, 'ab': 'x'}
+    with pytest.raises(JsonSchemaException) as exc:
+        validate({'bb': 1})
+    assert exc.value.message == 'data.bb must be string'
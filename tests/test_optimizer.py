@@ -0,0 +1,178 @@
+import pytest
+
+from fastjsonschema import JsonSchemaDefinitionException, JsonSchemaException, compile
+from fastjsonschema.generator import CodeGenerator
+from fastjsonschema.optimizer import (
+    drop_implied_types,
+    get_passes,
+    merge_all_of,
+    optimize,
+    remove_dead_branches,
+    share_subschemas,
+)
+
+
+def test_get_passes():
+    assert get_passes(False) == ()
+    assert get_passes(True) == ('drop_implied_types', 'merge_all_of', 'remove_dead_branches', 'share_subschemas', 'fuse_ranges')
+    assert get_passes(['fuse_ranges', 'merge_all_of']) == ('merge_all_of', 'fuse_ranges')
+
+
+def test_unknown_pass():
+    with pytest.raises(JsonSchemaDefinitionException):
+        get_passes(['unknown'])
+
+
+def test_drop_implied_types():
+    definition = {'type': 'integer', 'allOf': [{'type': 'number', 'minimum': 1}, {'type': 'string'}]}
+    assert drop_implied_types(definition) == {'type': 'integer', 'allOf': [{'minimum': 1}, {'type': 'string'}]}
+
+
+def test_merge_all_of():
+    definition = {
+        'type': 'number',
+        'allOf': [
+            {'minimum': 1},
+            {'allOf': [{'maximum': 10}, {'minimum': 2}]},
+            {'$ref': '#/definitions/x'},
+        ],
+    }
+    assert merge_all_of(definition) == {
+        'type': 'number',
+        'minimum': 1,
+        'maximum': 10,
+        'allOf': [{'minimum': 2}, {'$ref': '#/definitions/x'}],
+    }
+
+
+def test_merge_all_of_keeps_groups_together():
+    definition = {'minimum': 1, 'allOf': [{'exclusiveMinimum': True}, {'properties': {}, 'additionalProperties': False}]}
+    assert merge_all_of(definition) == {
+        'minimum': 1,
+        'properties': {},
+        'additionalProperties': False,
+        'allOf': [{'exclusiveMinimum': True}],
+    }
+
+
+def test_referenced_parts_are_not_changed():
+    definition = {
+        'type': 'number',
+        'allOf': [{'type': 'number'}, {'minimum': 1}],
+        'anyOf': [{'type': 'string'}, {'$ref': '#/allOf/1'}],
+    }
+    assert optimize(definition, get_passes(True)) == {
+        'type': 'number',
+        'allOf': [{'type': 'number'}, {'minimum': 1}],
+        'anyOf': [{'$ref': '#/allOf/1'}],
+    }
+
+
+def test_merge_all_of_keeps_defaults():
+    definition = {'allOf': [{'default': 1}]}
+    assert merge_all_of(definition) == definition
+
+
+@pytest.mark.parametrize('definition', [
+    {'required': ['a'], 'allOf': [{'properties': {'a': {'default': 1}}}]},
+    {'allOf': [{'properties': {'a': {'default': 1}}}, {'required': ['a']}]},
+    {'allOf': [{'properties': {'a': {'default': 1}}}, {'minProperties': 1}]},
+])
+def test_merge_all_of_keeps_nested_defaults(definition):
+    assert merge_all_of(definition) == definition
+    assert compile(definition, optimize=True)({}) == {'a': 1}
+
+
+def test_remove_dead_branches():
+    definition = {
+        'type': 'integer',
+        'oneOf': [{'type': 'string'}, {'type': 'number', 'minimum': 1}, {'maximum': 5}],
+        'anyOf': [{'type': 'null'}, {}],
+    }
+    assert remove_dead_branches(definition) == {
+        'type': 'integer',
+        'oneOf': [{'type': 'number', 'minimum': 1}, {'maximum': 5}],
+    }
+
+
+def test_share_subschemas():
+    item = {'type': 'object', 'properties': {'a': {'type': 'string'}, 'b': {'type': 'number'}}, 'required': ['a']}
+    definition = {'properties': {'x/y': item, 'z': {'items': item}}}
+    assert share_subschemas(definition) == {'properties': {'x/y': item, 'z': {'items': {'$ref': '#/properties/x~1y'}}}}
+
+
+def test_share_small_subschemas_is_not_worth():
+    definition = {'properties': {'a': {'type': 'string'}, 'b': {'type': 'string'}}}
+    assert share_subschemas(definition) is definition
+
+
+def test_optimize_does_not_change_definition():
+    definition = {'type': 'number', 'allOf': [{'type': 'number'}, {'minimum': 1}]}
+    assert optimize(definition, get_passes(True)) == {'type': 'number', 'minimum': 1}
+    assert definition == {'type': 'number', 'allOf': [{'type': 'number'}, {'minimum': 1}]}
+
+
+def test_fuse_ranges_code():
+    code = CodeGenerator({'minimum': 1, 'maximum': 10, 'exclusiveMaximum': True}, optimize=['fuse_ranges']).func_code
+    assert 'if not 1 <= data < 10:' in code
+    assert 'data > 10' not in code
+
+
+@pytest.mark.parametrize('value, rule, message', [
+    (0, 'minimum', 'data must be bigger than or equal to 1'),
+    (11, 'maximum', 'data must be smaller than or equal to 10'),
+])
+def test_fuse_ranges(value, rule, message):
+    validate = compile({'minimum': 1, 'maximum': 10}, optimize=['fuse_ranges'])
+    assert validate(10) == 10
+    with pytest.raises(JsonSchemaException) as exc:
+        validate(value)
+    assert exc.value.rule == rule
+    assert exc.value.message == message
+
+
+@pytest.mark.parametrize('value, expected', [
+    ({'a': {'x': 1, 'y': 2, 'z': 3}, 'b': [{'x': 4, 'y': 5, 'z': 6}]}, True),
+    ({'a': {'x': 1, 'y': 'a', 'z': 3}}, False),
+    ({'b': [{'x': 4, 'y': 5, 'z': 'a'}]}, False),
+])
+def test_shared_subschemas_are_valid(value, expected):
+    point = {'type': 'object', 'properties': {'x': {'type': 'number'}, 'y': {'type': 'number'}, 'z': {'type': 'number'}}}
+    definition = {'properties': {'a': point, 'b': {'items': point}}}
+    assert compile(definition, mode='bool', optimize=['share_subschemas'])(value) is expected
+
+
+@pytest.mark.parametrize('definition, value, expected', [
+    ({'additionalProperties': False, 'allOf': [{'properties': {'a': {}}}]}, {'a': 1}, False),
+    ({'properties': {'a': {}}, 'allOf': [{'additionalProperties': False}]}, {'a': 1}, False),
+    ({'patternProperties': {'^a': {}}, 'allOf': [{'additionalProperties': False}]}, {'a': 1}, False),
+    ({'additionalItems': False, 'allOf': [{'items': [{}]}]}, [1, 2], True),
+    ({'exclusiveMinimum': True, 'allOf': [{'minimum': 5}]}, 5, True),
+    ({'exclusiveMaximum': True, 'allOf': [{'maximum': 5}]}, 5, True),
+])
+def test_merge_all_of_keeps_dependent_keywords_apart(definition, value, expected):
+    assert compile(definition, mode='bool')(value) is expected
+    assert compile(definition, mode='bool', optimize=True)(value) is expected
+
+
+def test_merge_all_of_conflicting_group():
+    definition = {'exclusiveMinimum': True, 'allOf': [{'minimum': 5, 'type': 'number'}]}
+    assert merge_all_of(definition) == {'exclusiveMinimum': True, 'type': 'number', 'allOf': [{'minimum': 5}]}
+
+
+def test_share_subschemas_keeps_defaults():
+    prop = {'type': 'integer', 'minimum': 0, 'maximum': 10, 'multipleOf': 1, 'default': 3}
+    definition = {'properties': {'a': prop, 'b': dict(prop)}}
+    assert share_subschemas(definition) is definition
+    assert compile(definition, optimize=True)({}) == {'a': 3, 'b': 3}
+
+
+@pytest.mark.parametrize('definition', [
+    {'type': 'array', 'items': {'anyOf': [{}, {'type': 'string'}]}},
+    {'type': 'array', 'items': [{}], 'additionalItems': {'anyOf': [{}, {'type': 'string'}]}},
+    {'type': 'array', 'items': {}},
+])
+@pytest.mark.parametrize('mode', ['exception', 'bool', 'errors'])
+def test_empty_items_definition(definition, mode):
+    validate = compile(definition, mode=mode, optimize=True)
+    assert validate([1, 'a']) == {'exception': [1, 'a'], 'bool': True, 'errors': []}[mode]
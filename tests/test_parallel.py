@@ -0,0 +1,40 @@
+import pytest
+
+from fastjsonschema import ParallelValidator
+
+
+@pytest.fixture(scope='module')
+def validator():
+    definition = {
+        'type': 'object',
+        'properties': {
+            'a': {'type': 'number', 'default': 42},
+            'b': {'type': 'string', 'pattern': '^x'},
+        },
+    }
+    with ParallelValidator(definition, processes=2, chunksize=3) as validator:
+        yield validator
+
+
+def test_parallel(validator):
+    items = [{'b': 'x'}] * 10 + [{'a': 'a'}] + [{'b': 'y'}] + [{'a': 1}] * 10
+    valid, invalid, errors = validator.validate_many(items)
+    assert valid == [{'a': 42, 'b': 'x'}] * 10 + [{'a': 1}] * 10
+    assert list(invalid) == [10, 11]
+    assert [(index, exc.message) for index, exc in errors] == [
+        (10, 'data.a must be number'),
+        (11, 'data.b must match pattern ^x'),
+    ]
+
+
+def test_parallel_max_errors(validator):
+    valid, invalid, errors = validator.validate_many(iter([{'a': 'a'}] * 10), max_errors=4)
+    assert valid == []
+    assert list(invalid) == list(range(10))
+    assert [index for index, exc in errors] == [0, 1, 2, 3]
+
+
+def test_parallel_iter_chunks(validator):
+    chunks = list(validator.iter_chunks([{}] * 7))
+    assert [offset for offset, result in chunks] == [0, 3, 6]
+    assert [len(result[0]) for offset, result in chunks] == [3, 3, 1]
@@ -0,0 +1,62 @@
+import re
+
+import pytest
+
+from fastjsonschema import compile
+from fastjsonschema.patterns import REGEXPS_SIZE, intern_regexp, literal_prefix, lower_pattern
+
+
+VALUES = [
+    '', '\n', 'a', 'a\n', '\na', 'abc', 'abc\n', 'abc\n\n', 'ABC', 'aBc', 'abc1', 'ab', 'abcd', 'abcdef',
+    '0', '123', '123\n', '12a', '١٢٣', '²', '1.5', ' 12', 'prefix', 'prefix-x', 'pre', 'a.b', 'a\nb', 'é',
+]
+
+
+@pytest.mark.parametrize('pattern', [
+    '^abc$', 'abc$', '^abc', 'abc', '^a\\.b$', '^$', 'a\\$',
+    '^[0-9]+$', '^\\d+$', '^\\d*$', '^[a-z]+$', '^[A-Z]+$', '^[a-zA-Z]*$', '^[A-Za-z0-9]+$',
+    '^[0-9]{3}$', '^[a-z]{2,4}$', '^[a-z]{2,}$', '^.{2,4}$', '^.*$', '^.+$', '^.{0,3}$',
+    '^[0-9]+', '[a-z]{2}', '^.{2}',
+])
+def test_lower_pattern(pattern):
+    condition = lower_pattern(pattern, 'value')
+    assert condition is not None
+    for value in VALUES:
+        assert bool(eval(condition)) is bool(re.match(pattern, value)), value
+
+
+@pytest.mark.parametrize('pattern', [
+    '^a|b$', '^[0-9]+\\.[0-9]+$', '^\\w+$', '^(ab)+$', '^a\\n$', '^[a-z]{3,2}$', '', '^', '[a-z]*',
+])
+def test_lower_pattern_not_simple(pattern):
+    assert lower_pattern(pattern, 'value') is None
+
+
+def test_intern_regexp():
+    assert intern_regexp('^a+b') is intern_regexp('^a+b')
+
+
+def test_intern_regexp_is_bounded():
+    for index in range(REGEXPS_SIZE + 10):
+        intern_regexp('^x{}$'.format(index))
+    assert intern_regexp.cache_info().currsize == REGEXPS_SIZE
+
+
+def test_same_pattern_compiled_once():
+    definition = {'properties': {'a': {'pattern': '^(x|y)'}, 'b': {'pattern': '^(x|y)'}}}
+    validate = compile(definition, cache=False)
+    regexps = [value for name, value in validate.__globals__.items() if name.startswith('func_re_')]
+    assert regexps == [intern_regexp('^(x|y)')]
+
+
+@pytest.mark.parametrize('pattern, expected', [
+    ('^metric_', 'metric_'),
+    ('^tag\\.', 'tag.'),
+    ('^', ''),
+    ('^a.b', None),
+    ('^a\\d', None),
+    ('a', None),
+    ('^a$', None),
+])
+def test_literal_prefix(pattern, expected):
+    assert literal_prefix(pattern) == expected
@@ -0,0 +1,73 @@
+import pytest
+
+from fastjsonschema import JsonSchemaDefinitionException, JsonSchemaException, compile
+from fastjsonschema.generator import CodeGenerator
+
+
+DEFINITION = {
+    'definitions': {
+        'name': {'type': 'string', 'pattern': '^[a-z]+$'},
+    },
+    'type': 'array',
+    'items': {
+        'type': 'object',
+        'properties': {
+            'name': {'$ref': '#/definitions/name'},
+            'size': {'oneOf': [{'type': 'integer'}, {'type': 'number', 'minimum': 10}]},
+        },
+        'required': ['name'],
+    },
+}
+
+
+def test_profile_off_generates_the_same_code():
+    code_generator = CodeGenerator(DEFINITION)
+    assert 'profile' not in code_generator.func_code
+    assert code_generator.func_code == CodeGenerator(DEFINITION, profile=False).func_code
+
+
+@pytest.mark.parametrize('mode', ['exception', 'bool', 'errors'])
+def test_profile_stats(mode):
+    validate = compile(DEFINITION, cache=False, mode=mode, profile=True)
+    validate([{'name': 'a', 'size': 1}, {'name': 'b', 'size': 20.5}])
+    try:
+        validate([{'name': 'A'}])
+    except JsonSchemaException:
+        pass
+
+    stats = {(rule.path, rule.rule): (rule.calls, rule.failures) for rule in validate.stats()}
+    assert stats[('#', 'items')][0] == 2
+    assert stats[('#/items', 'required')] == (3, 0)
+    assert stats[('#/definitions/name', 'pattern')] == (3, 1)
+    assert stats[('#/items/properties/size/oneOf/0', 'type')] == (2, 1)
+    assert stats[('#/items/properties/size/oneOf/1', 'minimum')] == (2, 1)
+
+
+def test_profile_stats_sort():
+    validate = compile(DEFINITION, cache=False, profile=True)
+    with pytest.raises(JsonSchemaException):
+        validate([{'name': '1'}])
+    assert validate.stats(sort='failures')[0][:4] == ('#/definitions/name', 'pattern', 1, 1)
+    seconds = [rule.seconds for rule in validate.stats()]
+    assert seconds == sorted(seconds, reverse=True)
+    with pytest.raises(ValueError):
+        validate.stats(sort='unknown')
+
+
+def test_profile_stats_reset():
+    validate = compile({'type': 'string'}, cache=False, profile=True)
+    validate('a')
+    assert [rule.calls for rule in validate.stats(reset=True)] == [1]
+    assert validate.stats() == []
+
+
+def test_profile_with_cache_dir(tmp_path):
+    for _ in range(2):
+        validate = compile({'type': 'string'}, cache=False, cache_dir=str(tmp_path), profile=True)
+        validate('a')
+        assert [rule.calls for rule in validate.stats()] == [1]
+
+
+def test_profile_lazy():
+    with pytest.raises(JsonSchemaDefinitionException):
+        compile({'type': 'string'}, lazy=True, profile=True)
@@ -0,0 +1,71 @@
+import pytest
+
+from fastjsonschema import JsonSchemaDefinitionException, JsonSchemaException, compile
+from fastjsonschema.generator import CodeGenerator
+
+
+definition = {
+    'definitions': {
+        'positive': {'type': 'number', 'minimum': 0, 'exclusiveMinimum': True},
+    },
+    'type': 'object',
+    'properties': {
+        'a': {'$ref': '#/definitions/positive'},
+        'b': {'$ref': '#/definitions/positive'},
+        'c': {'type': 'array', 'items': {'$ref': '#/definitions/positive'}},
+    },
+}
+@pytest.mark.parametrize('value, expected', [
+    ({}, {}),
+    ({'a': 1, 'b': 2, 'c': [3]}, {'a': 1, 'b': 2, 'c': [3]}),
+    ({'a': 0}, JsonSchemaException('data.a must be bigger than 0')),
+    ({'b': 'x'}, JsonSchemaException('data.b must be number')),
+    ({'c': [1, -1]}, JsonSchemaException('data.c[1] must be bigger than 0')),
+])
+def test_ref(asserter, value, expected):
+    asserter(definition, value, expected)
+
+
+def test_ref_generated_once():
+    code = CodeGenerator(definition).func_code
+    assert code.count('must be bigger than') == 1
+    assert code.count('def func_definitions_positive(') == 1
+
+
+tree = {
+    'type': 'object',
+    'required': ['value'],
+    'properties': {
+        'value': {'type': 'number'},
+        'children': {'type': 'array', 'items': {'$ref': '#'}},
+    },
+}
+@pytest.mark.parametrize('value, expected', [
+    ({'value': 1}, {'value': 1}),
+    ({'value': 1, 'children': [{'value': 2, 'children': [{'value': 3}]}]}, {'value': 1, 'children': [{'value': 2, 'children': [{'value': 3}]}]}),
+    ({'value': 1, 'children': [{'value': 2, 'children': [{}]}]}, JsonSchemaException('data.children[0].children[0] must contain [\'value\'] properties')),
+    ({'value': 1, 'children': [{'value': 'x'}]}, JsonSchemaException('data.children[0].value must be number')),
+])
+def test_recursive_ref(asserter, value, expected):
+    asserter(tree, value, expected)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ({'a': 'x'}, {'a': 'x', 'b': 42}),
+])
+def test_ref_with_default(asserter, value, expected):
+    asserter({
+        'definitions': {
+            'item': {'type': 'object', 'properties': {'b': {'default': 42}}},
+        },
+        '$ref': '#/definitions/item',
+    }, value, expected)
+
+
+@pytest.mark.parametrize('definition', [
+    {'$ref': 'http://example.com/schema.json'},
+    {'$ref': '#/definitions/missing'},
+])
+def test_unsupported_ref(definition):
+    with pytest.raises(JsonSchemaDefinitionException):
+        compile(definition)
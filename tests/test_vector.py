@@ -0,0 +1,99 @@
+from array import array
+
+import pytest
+
+from fastjsonschema import JsonSchemaException, compile, compile_to_code
+from fastjsonschema.vector import is_vectorizable, vector_candidates
+
+
+DEFINITION = {'type': 'array', 'items': {'type': 'number', 'minimum': 0, 'maximum': 1}}
+
+
+@pytest.mark.parametrize('value, expected', [
+    (array('d'), array('d')),
+    (array('d', [0, 0.5, 1]), array('d', [0, 0.5, 1])),
+    (array('d', [0, 1.5, -1]), JsonSchemaException('data[1] must be smaller than or equal to 1')),
+    (array('i', [0, 1, -1]), JsonSchemaException('data[2] must be bigger than or equal to 0')),
+    (array('u', 'ab'), JsonSchemaException('data[0] must be number')),
+])
+def test_array_array(asserter, value, expected):
+    asserter(DEFINITION, value, expected)
+
+
+@pytest.mark.parametrize('value, expected', [
+    (array('l', [2, 4, 6]), array('l', [2, 4, 6])),
+    (array('l', [2, 3, 5]), JsonSchemaException('data[1] must be multiple of 2')),
+    (array('d', [2.0]), JsonSchemaException('data[0] must be integer')),
+])
+def test_array_array_integer(asserter, value, expected):
+    asserter({'type': 'array', 'items': {'type': 'integer', 'multipleOf': 2}}, value, expected)
+
+
+def test_memoryview():
+    validate = compile(DEFINITION)
+    value = memoryview(array('d', [0, 0.5]))
+    assert validate(value) is value
+    with pytest.raises(JsonSchemaException) as exc:
+        validate(memoryview(array('d', [0, 2])))
+    assert exc.value.message == 'data[1] must be smaller than or equal to 1'
+    errors = compile(DEFINITION, mode='errors')(memoryview(array('d', [2, -1])))
+    assert [e.message for e in errors] == [
+        'data[0] must be smaller than or equal to 1',
+        'data[1] must be bigger than or equal to 0',
+    ]
+
+
+def test_array_array_not_accepted_for_other_items():
+    with pytest.raises(JsonSchemaException) as exc:
+        compile({'type': 'array', 'items': {'type': 'number', 'enum': [1]}})(array('d', [1]))
+    assert exc.value.message == 'data must be array'
+
+
+@pytest.mark.parametrize('definition, expected', [
+    ({'type': 'number', 'minimum': 0, 'maximum': 1, 'multipleOf': 0.5}, True),
+    ({'type': ['integer', 'boolean']}, True),
+    ({'type': 'string'}, False),
+    ({'minimum': 0}, False),
+    ({'type': 'number', 'enum': [1]}, False),
+    ({'type': 'number', 'minimum': True}, False),
+    ([{'type': 'number'}], False),
+])
+def test_is_vectorizable(definition, expected):
+    assert is_vectorizable(definition) is expected
+
+
+def test_compile_to_code_does_not_vectorize():
+    # Generated module depends only on JsonSchemaException, so it checks lists only.
+    code = compile_to_code({'validate': DEFINITION})
+    assert 'vector' not in code
+    namespace = {}
+    exec(code, namespace)
+    assert namespace['validate']([0.5]) == [0.5]
+    with pytest.raises(JsonSchemaException):
+        namespace['validate'](array('d', [0.5]))
+
+
+def test_numpy():
+    numpy = pytest.importorskip('numpy')
+    validate = compile(DEFINITION)
+    value = numpy.linspace(0, 1, 1000)
+    assert validate(value) is value
+    value[500] = 2
+    with pytest.raises(JsonSchemaException) as exc:
+        validate(value)
+    assert exc.value.message == 'data[500] must be smaller than or equal to 1'
+    assert exc.value.value == 2 and type(exc.value.value) is float
+
+    with pytest.raises(JsonSchemaException) as exc:
+        validate(numpy.array([True, False]))
+    assert exc.value.message == 'data[0] must be number'
+    with pytest.raises(JsonSchemaException) as exc:
+        validate(numpy.zeros((2, 2)))
+    assert exc.value.message == 'data[0] must be number'
+
+
+def test_numpy_candidates():
+    numpy = pytest.importorskip('numpy')
+    values = numpy.array([0.5, numpy.nan, -1, 3])
+    assert list(vector_candidates(values, 'f', 0, 1)) == [(2, -1.0), (3, 3.0)]
+    assert list(vector_candidates(memoryview(array('l', [1, 2, 3])), 'iu', multiple_of=2)) == [(0, 1), (2, 3)]